@@ -0,0 +1,149 @@
+"""
+Write-behind ingest for activity tracking events.
+
+/api/activity/track validates an event, puts it on a bounded in-memory queue and
+answers 202 immediately. A background task drains the queue and writes events to
+Postgres in multi-row INSERTs, either when a batch fills up or every
+ACTIVITY_FLUSH_INTERVAL seconds. Whatever is still queued is flushed on shutdown.
+When the queue is full the event is dropped (counted in stats()) rather than written on the
+request path, so overload never turns back into one database round trip per click.
+
+Events are held in process memory until flushed, so a hard crash can lose at most
+one flush interval of page views; that trade-off is acceptable for analytics.
+"""
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+from activity_service import create_activities_batch
+from config import Config
+from models import UserActivityCreate
+
+logger = logging.getLogger(__name__)
+
+
+class ActivityIngest:
+    """Bounded queue of activity events flushed to Postgres in batches by a background task"""
+
+    def __init__(self, max_size: int, batch_size: int, flush_interval: float):
+        self.max_size = max_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._pending: List[Tuple[UserActivityCreate, datetime]] = []
+        self.accepted = 0
+        # Events turned away because the queue was full or the ingest wasn't running
+        self.dropped = 0
+        self.flushed = 0
+        self.failed = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self):
+        """Start the background flush task (call from the running event loop)"""
+        if self.running:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_size)
+        self._task = asyncio.create_task(self._flush_loop())
+        logger.info(f"Activity ingest started (queue {self.max_size}, batch {self.batch_size}, every {self.flush_interval}s)")
+
+    async def stop(self):
+        """Stop the flush task and write out everything still queued"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        pending, self._pending = self._pending, []
+        await self._flush(pending)
+        while not self._queue.empty():
+            await self._flush(self._drain(self.batch_size))
+        logger.info(f"Activity ingest stopped ({self.flushed} flushed, {self.failed} failed)")
+
+    def enqueue(self, activity: UserActivityCreate) -> bool:
+        """
+        Queue an event for the next flush; False (and the event is dropped) if the ingest is
+        not running or the queue is full
+        """
+        if not self.running:
+            self.dropped += 1
+            return False
+        try:
+            self._queue.put_nowait((activity, datetime.utcnow()))
+        except asyncio.QueueFull:
+            self.dropped += 1
+            return False
+        self.accepted += 1
+        return True
+
+    def stats(self) -> dict:
+        return {
+            "running": self.running,
+            "queued": self._queue.qsize() if self._queue else 0,
+            "max_size": self.max_size,
+            "accepted": self.accepted,
+            "dropped": self.dropped,
+            "flushed": self.flushed,
+            "failed": self.failed,
+        }
+
+    def _drain(self, limit: int) -> List[Tuple[UserActivityCreate, datetime]]:
+        items = []
+        while len(items) < limit:
+            try:
+                items.append(self._queue.get_nowait())
+            except asyncio.QueueEmpty:
+                break
+        return items
+
+    async def _flush_loop(self):
+        batch = []
+        try:
+            while True:
+                # Block until there is something to write, then give the batch a chance to fill
+                batch = [await self._queue.get()]
+                deadline = time.monotonic() + self.flush_interval
+                while len(batch) < self.batch_size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._queue.get(), timeout=remaining))
+                    except asyncio.TimeoutError:
+                        break
+                # Once handed to _flush the batch is owned by the writer thread, even if we're cancelled
+                to_flush, batch = batch, []
+                await self._flush(to_flush)
+        except asyncio.CancelledError:
+            # Events already taken off the queue are written by stop()
+            self._pending = batch
+            raise
+
+    async def _flush(self, batch: List[Tuple[UserActivityCreate, datetime]]):
+        if not batch:
+            return
+        activities = [activity for activity, _ in batch]
+        timestamps = [received_at for _, received_at in batch]
+        try:
+            inserted = await asyncio.to_thread(create_activities_batch, activities, timestamps)
+            self.flushed += inserted
+            logger.debug(f"Flushed {inserted} activity event(s)")
+        except Exception as e:
+            # Don't requeue: a partially applied batch would be duplicated, and analytics can tolerate the gap
+            self.failed += len(batch)
+            logger.error(f"Dropped {len(batch)} activity event(s) after failed flush: {e}")
+
+
+activity_ingest = ActivityIngest(
+    max_size=Config.ACTIVITY_QUEUE_MAX_SIZE,
+    batch_size=Config.ACTIVITY_FLUSH_BATCH_SIZE,
+    flush_interval=Config.ACTIVITY_FLUSH_INTERVAL,
+)
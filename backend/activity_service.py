@@ -5,12 +5,80 @@ Uses PostgreSQL (Neon) instead of Neo4j
 from typing import Optional, List, Dict
 from datetime import datetime, timedelta
 import logging
+import time
 from neon_database import neon_db
 from models import UserActivityCreate, UserActivityResponse
 import json
 
 logger = logging.getLogger(__name__)
 
+# Rollup tables (see migrate_activity_rollups.py) are maintained in the same statement as
+# every insert into user_activities, so dashboard statistics never scan the raw event table.
+# Until the migration has run, inserts and statistics fall back to user_activities alone.
+# Concurrent inserts (batch endpoint, ingest flusher, direct fallback, every process) upsert the
+# same hot rollup rows, so rows are written in key order: they queue on the row locks in one
+# consistent order instead of deadlocking.
+ROLLUP_CHECK_INTERVAL = 60
+_rollup_state = {"available": None, "checked_at": 0.0}
+# Typed user reference columns (see migrate_activity_user_refs.py), same re-check interval
+_user_ref_state = {"available": None, "checked_at": 0.0}
+
+ROLLUP_CTES = """
+, rollup AS (
+    INSERT INTO activity_rollup_hourly AS r (bucket, activity_type, section_title, events, duration_seconds)
+    SELECT date_trunc('hour', timestamp), activity_type, COALESCE(section_title, ''),
+           COUNT(*), COALESCE(SUM(duration_seconds), 0)
+    FROM inserted
+    GROUP BY 1, 2, 3
+    ORDER BY 1, 2, 3
+    ON CONFLICT (bucket, activity_type, section_title)
+    DO UPDATE SET events = r.events + EXCLUDED.events,
+                  duration_seconds = r.duration_seconds + EXCLUDED.duration_seconds
+)
+, actors AS (
+    INSERT INTO activity_daily_actors (day, actor_kind, actor_id)
+    SELECT timestamp::date, 'user', user_id FROM inserted WHERE user_id IS NOT NULL
+    UNION
+    SELECT timestamp::date, 'session', session_id FROM inserted
+    ORDER BY 1, 2, 3
+    ON CONFLICT DO NOTHING
+)
+"""
+
+def _schema_check(state: dict, query: str, description: str) -> bool:
+    """Run a cached `... AS available` schema check (re-checked every ROLLUP_CHECK_INTERVAL seconds)"""
+    now = time.monotonic()
+    if state["available"] is None or now - state["checked_at"] > ROLLUP_CHECK_INTERVAL:
+        try:
+            result = neon_db.execute_query(query)
+            state["available"] = bool(result and result[0].get('available'))
+        except Exception as e:
+            logger.warning(f"Could not check for {description}: {e}")
+            state["available"] = False
+        state["checked_at"] = now
+    return state["available"]
+
+def rollups_available() -> bool:
+    """Whether the activity rollup tables exist"""
+    return _schema_check(_rollup_state, """
+    SELECT to_regclass('activity_rollup_hourly') IS NOT NULL
+       AND to_regclass('activity_daily_actors') IS NOT NULL AS available
+    """, "activity rollup tables")
+
+def user_refs_available() -> bool:
+    """Whether user_activities has the typed user_ref_id / user_kind columns"""
+    return _schema_check(_user_ref_state, """
+    SELECT COUNT(*) = 2 AS available
+    FROM information_schema.columns
+    WHERE table_name = 'user_activities' AND column_name IN ('user_ref_id', 'user_kind')
+    """, "activity user reference columns")
+
+def _with_rollups(insert_query: str, select_clause: str) -> str:
+    """Wrap an `INSERT ... RETURNING` into user_activities so the same statement updates the rollups"""
+    if not rollups_available():
+        return insert_query
+    return f"WITH inserted AS ({insert_query}){ROLLUP_CTES}{select_clause}"
+
 def create_activity(activity_data: UserActivityCreate) -> Optional[UserActivityResponse]:
     """
     Create a new activity record in PostgreSQL database
@@ -23,13 +91,13 @@ def create_activity(activity_data: UserActivityCreate) -> Optional[UserActivityR
     """
     try:
         # Insert activity into PostgreSQL
-        query = """
+        query = _with_rollups("""
         INSERT INTO user_activities (user_id, session_id, activity_type, page_url, 
                                      section_id, section_title, duration_seconds, metadata, timestamp)
         VALUES (%s, %s, %s, %s, %s, %s, %s, %s, CURRENT_TIMESTAMP)
         RETURNING id, user_id, session_id, activity_type, page_url, section_id, 
                   section_title, duration_seconds, metadata, timestamp
-        """
+        """, "SELECT * FROM inserted")
         
         # Convert metadata dict to JSON string if present
         metadata_json = None
@@ -83,6 +151,52 @@ def create_activity(activity_data: UserActivityCreate) -> Optional[UserActivityR
         # Re-raise exception so caller can handle it
         raise
 
+def create_activities_batch(activities: List[UserActivityCreate], timestamps: Optional[List[datetime]] = None) -> int:
+    """
+    Insert many activity records with a single multi-row INSERT
+    
+    Args:
+        activities: Activity data to record
+        timestamps: Per-event timestamps (defaults to now), e.g. when the event was received
+    
+    Returns:
+        Number of rows inserted
+    """
+    if not activities:
+        return 0
+    try:
+        query = _with_rollups("""
+        INSERT INTO user_activities (user_id, session_id, activity_type, page_url, 
+                                     section_id, section_title, duration_seconds, metadata, timestamp)
+        VALUES %s
+        RETURNING user_id, session_id, activity_type, section_title, duration_seconds, timestamp
+        """, "SELECT COUNT(*) AS inserted FROM inserted")
+        
+        now = datetime.utcnow()
+        rows = []
+        for index, activity_data in enumerate(activities):
+            rows.append((
+                activity_data.user_id,
+                activity_data.session_id,
+                activity_data.activity_type,
+                activity_data.page_url,
+                activity_data.section_id,
+                activity_data.section_title,
+                activity_data.duration_seconds,
+                json.dumps(activity_data.metadata) if activity_data.metadata else None,
+                timestamps[index] if timestamps else now
+            ))
+        
+        # One statement for the whole batch (execute_values would otherwise split it into pages)
+        neon_db.execute_values(query, rows, page_size=len(rows))
+        return len(rows)
+    except Exception as e:
+        error_msg = str(e)
+        logger.error(f"Error creating {len(activities)} activities: {error_msg}")
+        if "relation" in error_msg.lower() and "does not exist" in error_msg.lower():
+            logger.error("PostgreSQL 'user_activities' table does not exist. Please run migration script.")
+        raise
+
 def get_activities(
     user_id: Optional[str] = None,
     session_id: Optional[str] = None,
@@ -90,7 +204,8 @@ def get_activities(
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
     limit: int = 100,
-    skip: int = 0
+    skip: int = 0,
+    after: Optional[tuple] = None
 ) -> List[UserActivityResponse]:
     """
     Get activities with optional filters
@@ -102,7 +217,8 @@ def get_activities(
         start_date: Filter by start date
         end_date: Filter by end date
         limit: Maximum number of results
-        skip: Number of results to skip
+        skip: Number of results to skip (ignored when `after` is given)
+        after: (timestamp, id) of the last row of the previous page, see pagination.py
     
     Returns:
         List of UserActivityResponse objects
@@ -132,8 +248,24 @@ def get_activities(
             where_clauses.append("ua.timestamp <= %s")
             params.append(end_date)
         
+        if after:
+            # Keyset pagination: rows strictly after the previous page's last row
+            where_clauses.append("(ua.timestamp, ua.id) < (%s, %s)")
+            params.extend(after[:2])
+            skip = 0
+        
         where_clause = " AND ".join(where_clauses) if where_clauses else "1=1"
         
+        if user_refs_available():
+            # Primary key lookups on the integer reference, only in the table user_kind points at
+            user_joins = """
+        LEFT JOIN users u ON ua.user_kind = 'user' AND u.id = ua.user_ref_id
+        LEFT JOIN admin_users au ON ua.user_kind = 'admin' AND au.id = ua.user_ref_id"""
+        else:
+            user_joins = """
+        LEFT JOIN users u ON ua.user_id = CAST(u.id AS VARCHAR)
+        LEFT JOIN admin_users au ON ua.user_id = CAST(au.id AS VARCHAR)"""
+        
         query = f"""
         SELECT ua.id, ua.user_id, ua.session_id, ua.activity_type, ua.page_url,
                ua.section_id, ua.section_title, ua.duration_seconds, ua.metadata,
@@ -141,10 +273,9 @@ def get_activities(
                COALESCE(u.email, au.email) as user_email, 
                COALESCE(u.full_name, au.full_name) as user_name
         FROM user_activities ua
-        LEFT JOIN users u ON ua.user_id = CAST(u.id AS VARCHAR)
-        LEFT JOIN admin_users au ON ua.user_id = CAST(au.id AS VARCHAR)
+        {user_joins}
         WHERE {where_clause}
-        ORDER BY ua.timestamp DESC
+        ORDER BY ua.timestamp DESC, ua.id DESC
         LIMIT %s OFFSET %s
         """
         
@@ -182,6 +313,59 @@ def get_activities(
         logger.error(f"Error getting activities: {e}")
         return []
 
+ROLLUP_STATISTICS_QUERY = """
+WITH hourly AS (
+    SELECT bucket, activity_type, section_title, events, duration_seconds
+    FROM activity_rollup_hourly
+    WHERE bucket >= date_trunc('hour', %(start)s::timestamp)
+),
+actors AS (
+    SELECT actor_kind, COUNT(DISTINCT actor_id) AS actor_count
+    FROM activity_daily_actors
+    WHERE day >= %(start)s::date
+    GROUP BY actor_kind
+)
+SELECT
+    (SELECT COALESCE(SUM(events), 0) FROM hourly) AS total,
+    (SELECT COALESCE(MAX(actor_count), 0) FROM actors WHERE actor_kind = 'user') AS unique_users,
+    (SELECT COALESCE(MAX(actor_count), 0) FROM actors WHERE actor_kind = 'session') AS unique_sessions,
+    (SELECT COALESCE(SUM(duration_seconds), 0) FROM hourly) AS total_duration,
+    (SELECT COALESCE(json_agg(t ORDER BY t.count DESC), '[]'::json) FROM (
+        SELECT activity_type AS type, SUM(events) AS count
+        FROM hourly
+        GROUP BY activity_type
+    ) t) AS by_type,
+    (SELECT COALESCE(json_agg(t ORDER BY t.views DESC), '[]'::json) FROM (
+        SELECT section_title AS section, SUM(events) AS views
+        FROM hourly
+        WHERE section_title <> '' AND activity_type IN ('section_view', 'page_view')
+        GROUP BY section_title
+        ORDER BY views DESC
+        LIMIT 10
+    ) t) AS top_sections,
+    (SELECT COALESCE(json_agg(t ORDER BY t.day), '[]'::json) FROM (
+        SELECT bucket::date AS day, SUM(events) AS count
+        FROM hourly
+        GROUP BY bucket::date
+    ) t) AS by_day
+"""
+
+def _get_activity_statistics_from_rollups(days: int) -> Dict:
+    """Dashboard statistics from the rollup tables in one query (hour/day granularity)"""
+    start_date = datetime.utcnow() - timedelta(days=days)
+    result = neon_db.execute_query(ROLLUP_STATISTICS_QUERY, {"start": start_date})
+    row = result[0] if result else {}
+    return {
+        "total_activities": int(row.get('total') or 0),
+        "unique_users": int(row.get('unique_users') or 0),
+        "unique_sessions": int(row.get('unique_sessions') or 0),
+        "total_duration_seconds": int(row.get('total_duration') or 0),
+        "activities_by_type": [{"type": r.get('type'), "count": int(r.get('count') or 0)} for r in row.get('by_type') or []],
+        "top_sections": [{"section": r.get('section'), "views": int(r.get('views') or 0)} for r in row.get('top_sections') or []],
+        "activities_by_day": [{"date": str(r.get('day')), "count": int(r.get('count') or 0)} for r in row.get('by_day') or []],
+        "period_days": days
+    }
+
 def get_activity_statistics(days: int = 7) -> Dict:
     """
     Get activity statistics for the dashboard
@@ -192,6 +376,12 @@ def get_activity_statistics(days: int = 7) -> Dict:
     Returns:
         Dictionary with statistics
     """
+    if rollups_available():
+        try:
+            return _get_activity_statistics_from_rollups(days)
+        except Exception as e:
+            logger.warning(f"Rollup statistics failed, computing from raw events: {e}")
+
     try:
         start_date = datetime.utcnow() - timedelta(days=days)
         
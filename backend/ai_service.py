@@ -4,6 +4,7 @@ import requests
 from typing import Optional, Dict, Any
 from config import Config
 from database import db
+from graph_schema import MEMBER_LABEL
 
 def get_database_schema() -> Dict[str, Any]:
     schema = {
@@ -16,7 +17,7 @@ def get_database_schema() -> Dict[str, Any]:
     try:
         labels_query = "CALL db.labels()"
         labels_result = db.execute_query(labels_query)
-        schema["node_labels"] = [record.get("label", "") for record in labels_result if record.get("label")]
+        schema["node_labels"] = [record.get("label", "") for record in labels_result if record.get("label") and record.get("label") != MEMBER_LABEL]
 
         rel_types_query = "CALL db.relationshipTypes()"
         rel_types_result = db.execute_query(rel_types_query)
@@ -21,6 +21,9 @@ security = HTTPBearer()
 SECRET_KEY = Config.JWT_SECRET_KEY if hasattr(Config, 'JWT_SECRET_KEY') else "your-secret-key-change-this-in-production"
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30 * 24 * 60  # 30 days
+# Scoped tokens for URLs (EventSource can't send headers): only good for opening one stream
+STREAM_TOKEN_SCOPE = "submission_events"
+STREAM_TOKEN_EXPIRE_SECONDS = 60
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash"""
@@ -56,6 +59,20 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     encoded_jwt = jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
     return encoded_jwt
 
+def create_stream_token(user_id: str, submission_id: str) -> str:
+    """Short-lived token that only authorizes streaming one submission's progress events"""
+    return create_access_token(
+        {"sub": str(user_id), "submission_id": str(submission_id), "scope": STREAM_TOKEN_SCOPE},
+        expires_delta=timedelta(seconds=STREAM_TOKEN_EXPIRE_SECONDS),
+    )
+
+def decode_stream_token(token: str, submission_id: str) -> Optional[dict]:
+    """Payload of a stream token issued for `submission_id`, or None"""
+    payload = decode_access_token(token)
+    if not payload or payload.get("scope") != STREAM_TOKEN_SCOPE or payload.get("submission_id") != str(submission_id):
+        return None
+    return payload
+
 def decode_access_token(token: str) -> Optional[dict]:
     """Decode and verify a JWT token"""
     try:
@@ -77,7 +94,8 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
         token = credentials.credentials
         payload = decode_access_token(token)
         
-        if payload is None:
+        if payload is None or payload.get("scope"):
+            # Scoped tokens (see create_stream_token) are not login tokens
             raise credentials_exception
         
         user_id: str = payload.get("sub")
@@ -0,0 +1,146 @@
+"""
+Benchmark the section subgraph query with PROFILE.
+
+Compares the legacy query (toString() membership filters and a second, undirected
+MATCH (a)-[rel]-(b) over the whole graph) with the current query from queries.py
+(indexed gr_key lookup, relationships expanded from the collected nodes only).
+
+Reports total db hits, rows and server time for each run, plus the node/link counts
+returned so the two results can be checked against each other. The legacy query
+returns every relationship twice (once per direction), the current one once.
+
+Usage:
+    python benchmark_section_query.py                      # "Full Graph" section
+    python benchmark_section_query.py --section "Full Graph" --runs 3
+
+Run `python migrate_graph_schema.py` first so the gr_key properties and indexes exist.
+"""
+import argparse
+import sys
+from database import db
+from config import Config
+from queries import get_graph_data_by_section_query
+import logging
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+LEGACY_SECTION_GRAPH_QUERY = """
+MATCH (section:section)
+WHERE section.`Section Name` = $section_title
+   OR section.`graph name` = $section_title
+WITH section, toString(section.`graph name`) AS section_graph_name
+
+MATCH (node)
+WHERE toString(node.gr_id) = section_graph_name
+  AND NONE(l IN labels(node) WHERE toLower(l) IN ['story','chapter','section'])
+WITH section_graph_name, COLLECT(DISTINCT node) AS all_nodes
+
+MATCH (a)-[rel]-(b)
+WHERE toString(a.gr_id) = section_graph_name
+  AND toString(b.gr_id) = section_graph_name
+  AND NONE(l IN labels(a) WHERE toLower(l) IN ['story','chapter','section'])
+  AND NONE(l IN labels(b) WHERE toLower(l) IN ['story','chapter','section'])
+WITH all_nodes,
+     COLLECT(DISTINCT {
+       rel: rel,
+       from: a,
+       to: b,
+       type: type(rel)
+     }) AS all_rels
+
+RETURN {
+  nodes: [n IN all_nodes | n {
+    .*,
+    elementId: elementId(n),
+    labels: labels(n),
+    node_type: head(labels(n))
+  }],
+  links: [rd IN all_rels | {
+    gid: coalesce(toString(rd.rel.gid), elementId(rd.rel)),
+    elementId: elementId(rd.rel),
+    type: rd.type,
+    from_gid: coalesce(toString(rd.from.gid), elementId(rd.from)),
+    to_gid: coalesce(toString(rd.to.gid), elementId(rd.to)),
+    properties: properties(rd.rel)
+  }]
+} AS graphData
+"""
+
+def total_db_hits(profile) -> int:
+    """Sum dbHits over a PROFILE plan tree"""
+    if not profile:
+        return 0
+    hits = profile.get("dbHits", 0) or 0
+    for child in profile.get("children", []) or []:
+        hits += total_db_hits(child)
+    return hits
+
+def profile_query(label: str, query: str, params: dict) -> dict:
+    """Run a query under PROFILE and collect db hits, timings and result sizes"""
+    with db.get_session() as session:
+        result = session.run(f"PROFILE {query}", params)
+        records = [record.data() for record in result]
+        summary = result.consume()
+
+    graph_data = records[0].get("graphData", {}) if records else {}
+    stats = {
+        "label": label,
+        "db_hits": total_db_hits(summary.profile),
+        "rows": summary.profile.get("rows", 0) if summary.profile else 0,
+        "available_after_ms": summary.result_available_after or 0,
+        "consumed_after_ms": summary.result_consumed_after or 0,
+        "nodes": len(graph_data.get("nodes", [])),
+        "links": len(graph_data.get("links", [])),
+    }
+    return stats
+
+def benchmark(section_title: str, runs: int = 1):
+    """PROFILE the legacy and current section subgraph queries"""
+
+    try:
+        Config.validate()
+    except ValueError as e:
+        logger.error(str(e))
+        sys.exit(1)
+
+    try:
+        current_query, current_params = get_graph_data_by_section_query(section_title=section_title)
+        legacy_params = {"section_title": section_title}
+
+        results = {"legacy": [], "current": []}
+        for _ in range(runs):
+            results["legacy"].append(profile_query("legacy", LEGACY_SECTION_GRAPH_QUERY, legacy_params))
+            results["current"].append(profile_query("current", current_query, current_params))
+
+        logger.info("\n" + "=" * 60)
+        logger.info(f"Section subgraph PROFILE: {section_title!r} ({runs} run(s))")
+        logger.info("=" * 60)
+        for label, runs_stats in results.items():
+            last = runs_stats[-1]
+            best_ms = min(s["available_after_ms"] + s["consumed_after_ms"] for s in runs_stats)
+            logger.info(
+                f"{label:>8}: {last['db_hits']:>12,} db hits | {last['nodes']} nodes, "
+                f"{last['links']} links | best {best_ms} ms"
+            )
+
+        legacy_hits = results["legacy"][-1]["db_hits"]
+        current_hits = results["current"][-1]["db_hits"]
+        if current_hits:
+            logger.info(f"db hits reduced {legacy_hits / current_hits:.1f}x")
+        logger.info("=" * 60)
+
+    except Exception as e:
+        logger.error(f"Error benchmarking section query: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="PROFILE the section subgraph query before/after")
+    parser.add_argument("--section", default="Full Graph", help="Section `graph name` or `Section Name`")
+    parser.add_argument("--runs", type=int, default=1, help="Number of runs per query (warm cache)")
+    args = parser.parse_args()
+    benchmark(args.section, runs=args.runs)
@@ -0,0 +1,62 @@
+"""
+Request body size limits enforced before the body is parsed.
+
+Starlette spools multipart uploads to a temporary file while parsing the form, before the
+endpoint runs, so a size check in the endpoint only happens after an oversized body has
+been received and written out. This ASGI middleware rejects such requests up front:
+
+- a Content-Length above the limit is answered with 413 without reading the body
+- bodies without (or with a lying) Content-Length are counted while they are received,
+  and parsing is aborted with 413 as soon as the limit is passed
+"""
+from typing import Iterable
+
+from fastapi import HTTPException
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class BodySizeLimitMiddleware:
+    """Cap the request body of POST requests to `paths` at `max_bytes`"""
+
+    def __init__(self, app: ASGIApp, max_bytes: int, paths: Iterable[str]):
+        self.app = app
+        self.max_bytes = max_bytes
+        self.paths = set(paths)
+
+    def _too_large(self) -> str:
+        return f"Request body exceeds the maximum of {self.max_bytes // (1024 * 1024)} MB"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["method"] != "POST" or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+
+        content_length = dict(scope["headers"]).get(b"content-length")
+        if content_length is not None:
+            try:
+                declared = int(content_length)
+            except ValueError:
+                await JSONResponse({"detail": "Invalid Content-Length header"}, status_code=400)(scope, receive, send)
+                return
+            if declared > self.max_bytes:
+                logger.warning(f"Rejected {declared} byte request to {scope['path']} (limit {self.max_bytes})")
+                await JSONResponse({"detail": self._too_large()}, status_code=413)(scope, receive, send)
+                return
+
+        received = 0
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    # Raised inside form parsing; FastAPI passes HTTPException through as a 413
+                    raise HTTPException(status_code=413, detail=self._too_large())
+            return message
+
+        await self.app(scope, limited_receive, send)
@@ -21,9 +21,68 @@ class Config:
     NEO4J_URI = os.getenv("NEO4J_URI", "bolt://localhost:7687")
     NEO4J_USER = os.getenv("NEO4J_USER", "neo4j")
     NEO4J_PASSWORD = os.getenv("NEO4J_PASSWORD", "")
+    # Seconds between background connectivity probes (the query path only checks a health flag)
+    NEO4J_LIVENESS_INTERVAL = int(os.getenv("NEO4J_LIVENESS_INTERVAL", "30"))
+    # Byte budget for the in-process section graph cache (0 disables it)
+    GRAPH_CACHE_MAX_BYTES = int(os.getenv("GRAPH_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+    # Materialize missing membership keys the graph reads depend on (see graph_schema.py) in a
+    # background task after startup; when disabled, startup only reports nodes that still need
+    # migrate_graph_schema.py
+    GRAPH_NORMALIZE_ON_STARTUP = os.getenv("GRAPH_NORMALIZE_ON_STARTUP", "true").lower() == "true"
 
     # Neon PostgreSQL Configuration
     NEON_DATABASE_URL = os.getenv("NEON_DATABASE_URL", "")
+    # Connection pool bounds; callers wait up to NEON_POOL_TIMEOUT seconds for a free connection
+    NEON_POOL_MIN_SIZE = int(os.getenv("NEON_POOL_MIN_SIZE", "1"))
+    NEON_POOL_MAX_SIZE = int(os.getenv("NEON_POOL_MAX_SIZE", "10"))
+    NEON_POOL_TIMEOUT = float(os.getenv("NEON_POOL_TIMEOUT", "10"))
+    # Pooled connections idle longer than this (seconds) are pinged before reuse
+    NEON_POOL_PING_AFTER = float(os.getenv("NEON_POOL_PING_AFTER", "30"))
+
+    # Write-behind activity ingest: queued events are flushed in batches of up to
+    # ACTIVITY_FLUSH_BATCH_SIZE or every ACTIVITY_FLUSH_INTERVAL seconds
+    ACTIVITY_QUEUE_MAX_SIZE = int(os.getenv("ACTIVITY_QUEUE_MAX_SIZE", "10000"))
+    ACTIVITY_FLUSH_BATCH_SIZE = int(os.getenv("ACTIVITY_FLUSH_BATCH_SIZE", "500"))
+    ACTIVITY_FLUSH_INTERVAL = float(os.getenv("ACTIVITY_FLUSH_INTERVAL", "2"))
+    # Largest event array accepted by /api/activity/track/batch
+    ACTIVITY_BATCH_MAX_EVENTS = int(os.getenv("ACTIVITY_BATCH_MAX_EVENTS", "500"))
+    # Months of raw user_activities partitions kept by migrate_activity_partitions.py (0 = keep all)
+    ACTIVITY_RETENTION_MONTHS = int(os.getenv("ACTIVITY_RETENTION_MONTHS", "0"))
+
+    # Per-client token buckets (requests per minute, burst) and concurrent request caps
+    # for expensive endpoint classes; see request_limits.py
+    AI_RATE_LIMIT_PER_MINUTE = float(os.getenv("AI_RATE_LIMIT_PER_MINUTE", "10"))
+    AI_RATE_LIMIT_BURST = int(os.getenv("AI_RATE_LIMIT_BURST", "5"))
+    AI_MAX_CONCURRENT = int(os.getenv("AI_MAX_CONCURRENT", "4"))
+    CYPHER_RATE_LIMIT_PER_MINUTE = float(os.getenv("CYPHER_RATE_LIMIT_PER_MINUTE", "30"))
+    CYPHER_RATE_LIMIT_BURST = int(os.getenv("CYPHER_RATE_LIMIT_BURST", "10"))
+    CYPHER_MAX_CONCURRENT = int(os.getenv("CYPHER_MAX_CONCURRENT", "4"))
+    GRAPH_RATE_LIMIT_PER_MINUTE = float(os.getenv("GRAPH_RATE_LIMIT_PER_MINUTE", "300"))
+    GRAPH_RATE_LIMIT_BURST = int(os.getenv("GRAPH_RATE_LIMIT_BURST", "60"))
+    GRAPH_MAX_CONCURRENT = int(os.getenv("GRAPH_MAX_CONCURRENT", "32"))
+    # Seconds a request waits for a free slot before getting a 503
+    REQUEST_QUEUE_TIMEOUT = float(os.getenv("REQUEST_QUEUE_TIMEOUT", "5"))
+    # Identify clients by the first X-Forwarded-For address (only behind a trusted proxy)
+    TRUST_FORWARDED_FOR = os.getenv("TRUST_FORWARDED_FOR", "false").lower() == "true"
+
+    # Submission processing: worker threads, PDF parsing processes, and the age (seconds)
+    # after which a 'processing' submission is considered abandoned and re-queued on startup
+    SUBMISSION_WORKERS = int(os.getenv("SUBMISSION_WORKERS", "4"))
+    SUBMISSION_PDF_PROCESSES = int(os.getenv("SUBMISSION_PDF_PROCESSES", "2"))
+    SUBMISSION_STALE_AFTER = float(os.getenv("SUBMISSION_STALE_AFTER", "900"))
+    # Largest accepted PDF upload (bytes)
+    SUBMISSION_MAX_UPLOAD_BYTES = int(os.getenv("SUBMISSION_MAX_UPLOAD_BYTES", str(25 * 1024 * 1024)))
+    # Long submissions are analyzed in overlapping chunks (characters); concurrent GROK calls
+    # for chunks are capped across all submissions
+    SUBMISSION_CHUNK_CHARS = int(os.getenv("SUBMISSION_CHUNK_CHARS", "10000"))
+    SUBMISSION_CHUNK_OVERLAP = int(os.getenv("SUBMISSION_CHUNK_OVERLAP", "1000"))
+    SUBMISSION_LLM_CONCURRENCY = int(os.getenv("SUBMISSION_LLM_CONCURRENCY", "4"))
+    # Days a completed result is reused for identical submissions (also the age at which
+    # cached extracted text is pruned)
+    SUBMISSION_RESULT_TTL_DAYS = int(os.getenv("SUBMISSION_RESULT_TTL_DAYS", "30"))
+    # URL submissions: request timeout (seconds) and the most of a page that is downloaded (bytes)
+    URL_FETCH_TIMEOUT = float(os.getenv("URL_FETCH_TIMEOUT", "30"))
+    URL_FETCH_MAX_BYTES = int(os.getenv("URL_FETCH_MAX_BYTES", str(5 * 1024 * 1024)))
 
     BACKEND_HOST = os.getenv("BACKEND_HOST", "0.0.0.0")
     BACKEND_PORT = int(os.getenv("BACKEND_PORT", "8000"))
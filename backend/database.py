@@ -1,6 +1,8 @@
-from neo4j import GraphDatabase
+from neo4j import GraphDatabase, AsyncGraphDatabase
 from neo4j.exceptions import ServiceUnavailable, TransientError, SessionExpired
 from config import Config
+import asyncio
+import threading
 import time
 import logging
 
@@ -11,6 +13,12 @@ class Neo4jDatabase:
     def __init__(self):
         self.driver = None
         self._initialized = False
+        # Connection health is tracked by a background probe and by query failures,
+        # so the query path only has to check this flag.
+        self._healthy = False
+        self._connect_lock = threading.Lock()
+        self._monitor_thread = None
+        self._monitor_stop = threading.Event()
 
     def _connect(self):
         """Establish a new connection to Neo4j database"""
@@ -55,6 +63,7 @@ class Neo4jDatabase:
 
     def close(self):
         """Close the database connection"""
+        self._stop_liveness_monitor()
         if self.driver:
             try:
                 self.driver.close()
@@ -64,6 +73,7 @@ class Neo4jDatabase:
             finally:
                 self.driver = None
                 self._initialized = False
+                self._healthy = False
 
     def _check_connection(self):
         """Check if the driver is still alive and can connect"""
@@ -76,15 +86,58 @@ class Neo4jDatabase:
             logger.warning(f"Connection check failed: {str(e)}, will reconnect")
         return False
 
+    def _mark_unhealthy(self, reason):
+        """Flag the driver for reconnection on the next query"""
+        if self._healthy:
+            logger.warning(f"Marking Neo4j connection unhealthy: {reason}")
+        self._healthy = False
+
+    def _liveness_loop(self):
+        """Periodically probe the driver in the background and record its health"""
+        while not self._monitor_stop.wait(Config.NEO4J_LIVENESS_INTERVAL):
+            if not self.driver or not self._initialized:
+                continue
+            if self._check_connection():
+                if not self._healthy:
+                    logger.info("Neo4j connection healthy again")
+                self._healthy = True
+            else:
+                self._mark_unhealthy("background liveness probe failed")
+
+    def _start_liveness_monitor(self):
+        """Start the background liveness probe if it is not already running"""
+        if self._monitor_thread and self._monitor_thread.is_alive():
+            return
+        self._monitor_stop.clear()
+        self._monitor_thread = threading.Thread(
+            target=self._liveness_loop,
+            name="neo4j-liveness-monitor",
+            daemon=True
+        )
+        self._monitor_thread.start()
+
+    def _stop_liveness_monitor(self):
+        """Stop the background liveness probe"""
+        self._monitor_stop.set()
+        if self._monitor_thread and self._monitor_thread is not threading.current_thread():
+            self._monitor_thread.join(timeout=5)
+        self._monitor_thread = None
+
     def _ensure_connected(self):
         """Ensure database is connected before executing queries"""
-        # Check if we need to connect or reconnect
-        if not self._initialized or not self._check_connection():
+        # Hot path: only a flag check, no network round trip
+        if self._initialized and self._healthy:
+            return
+        with self._connect_lock:
+            if self._initialized and self._healthy:
+                return
             try:
                 self._connect()
                 self._initialized = True
+                self._healthy = True
             except Exception as e:
                 raise Exception(f"Database connection failed: {str(e)}")
+        self._start_liveness_monitor()
     
     def get_session(self):
         """Get a new database session"""
@@ -106,15 +159,20 @@ class Neo4jDatabase:
                 with self.get_session() as session:
                     result = session.run(query, parameters or {})
                     return [record.data() for record in result]
-            except (ServiceUnavailable, TransientError, SessionExpired) as e:
+            except (ServiceUnavailable, SessionExpired) as e:
                 # These are connection-related errors, try to reconnect
                 last_error = e
                 logger.warning(f"Connection error on attempt {attempt + 1}/{max_retries}: {str(e)}")
+                self._mark_unhealthy(str(e))
                 if attempt < max_retries - 1:
-                    # Mark as not initialized to force reconnect
-                    self._initialized = False
                     time.sleep(1 * (attempt + 1))  # Exponential backoff
                     continue
+            except TransientError as e:
+                last_error = e
+                logger.warning(f"Transient error on attempt {attempt + 1}/{max_retries}: {str(e)}")
+                if attempt < max_retries - 1:
+                    time.sleep(1 * (attempt + 1))
+                    continue
             except Exception as e:
                 last_error = e
                 if attempt < max_retries - 1:
@@ -140,15 +198,20 @@ class Neo4jDatabase:
                 with self.get_session() as session:
                     result = session.run(query, parameters or {})
                     return [record.data() for record in result]
-            except (ServiceUnavailable, TransientError, SessionExpired) as e:
+            except (ServiceUnavailable, SessionExpired) as e:
                 # These are connection-related errors, try to reconnect
                 last_error = e
                 logger.warning(f"Connection error on write attempt {attempt + 1}/{max_retries}: {str(e)}")
+                self._mark_unhealthy(str(e))
                 if attempt < max_retries - 1:
-                    # Mark as not initialized to force reconnect
-                    self._initialized = False
                     time.sleep(1 * (attempt + 1))  # Exponential backoff
                     continue
+            except TransientError as e:
+                last_error = e
+                logger.warning(f"Transient error on write attempt {attempt + 1}/{max_retries}: {str(e)}")
+                if attempt < max_retries - 1:
+                    time.sleep(1 * (attempt + 1))
+                    continue
             except Exception as e:
                 last_error = e
                 if attempt < max_retries - 1:
@@ -162,3 +225,174 @@ class Neo4jDatabase:
         raise Exception(error_msg)
 
 db = Neo4jDatabase()
+
+
+class AsyncNeo4jDatabase:
+    """
+    Async counterpart of Neo4jDatabase built on the AsyncGraphDatabase driver.
+    Used by the FastAPI read routes so a slow query does not block the event loop.
+    """
+
+    def __init__(self):
+        self.driver = None
+        self._initialized = False
+        self._healthy = False
+        self._connect_lock = None
+        self._monitor_task = None
+
+    async def _connect(self):
+        """Establish a new async connection to Neo4j database"""
+        try:
+            # Close existing driver if any
+            if self.driver:
+                try:
+                    await self.driver.close()
+                except:
+                    pass
+                self.driver = None
+                self._initialized = False
+
+            logger.info(f"Connecting async driver to Neo4j at {Config.NEO4J_URI}")
+            self.driver = AsyncGraphDatabase.driver(
+                Config.NEO4J_URI,
+                auth=(Config.NEO4J_USER, Config.NEO4J_PASSWORD),
+                max_connection_lifetime=3600,
+                max_connection_pool_size=50,
+                connection_acquisition_timeout=120,
+                connection_timeout=30,
+                keep_alive=True
+            )
+
+            # Verify connectivity with retry logic
+            max_retries = 3
+            for attempt in range(max_retries):
+                try:
+                    await self.driver.verify_connectivity()
+                    logger.info("Async driver successfully connected to Neo4j database")
+                    break
+                except Exception as e:
+                    if attempt < max_retries - 1:
+                        logger.warning(f"Async connection attempt {attempt + 1} failed, retrying...")
+                        await asyncio.sleep(2)
+                        continue
+                    raise
+        except Exception as e:
+            error_msg = f"Failed to connect to Neo4j at {Config.NEO4J_URI}: {str(e)}"
+            logger.error(error_msg)
+            raise Exception(error_msg)
+
+    async def close(self):
+        """Close the async database connection"""
+        if self._monitor_task:
+            self._monitor_task.cancel()
+            try:
+                await self._monitor_task
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._monitor_task = None
+        if self.driver:
+            try:
+                await self.driver.close()
+                logger.info("Async Neo4j connection closed")
+            except Exception as e:
+                logger.warning(f"Error closing async Neo4j connection: {str(e)}")
+            finally:
+                self.driver = None
+                self._initialized = False
+                self._healthy = False
+
+    async def _check_connection(self):
+        """Check if the async driver is still alive and can connect"""
+        try:
+            if self.driver:
+                await self.driver.verify_connectivity()
+                return True
+        except Exception as e:
+            logger.warning(f"Async connection check failed: {str(e)}, will reconnect")
+        return False
+
+    def _mark_unhealthy(self, reason):
+        """Flag the driver for reconnection on the next query"""
+        if self._healthy:
+            logger.warning(f"Marking async Neo4j connection unhealthy: {reason}")
+        self._healthy = False
+
+    async def _liveness_loop(self):
+        """Periodically probe the driver in the background and record its health"""
+        while True:
+            await asyncio.sleep(Config.NEO4J_LIVENESS_INTERVAL)
+            if not self.driver or not self._initialized:
+                continue
+            if await self._check_connection():
+                if not self._healthy:
+                    logger.info("Async Neo4j connection healthy again")
+                self._healthy = True
+            else:
+                self._mark_unhealthy("background liveness probe failed")
+
+    async def _ensure_connected(self):
+        """Ensure database is connected before executing queries"""
+        # Hot path: only a flag check, no network round trip
+        if self._initialized and self._healthy:
+            return
+        # The lock is created lazily so it binds to the running event loop
+        if self._connect_lock is None:
+            self._connect_lock = asyncio.Lock()
+        async with self._connect_lock:
+            if not self._initialized or not self._healthy:
+                try:
+                    await self._connect()
+                    self._initialized = True
+                    self._healthy = True
+                except Exception as e:
+                    raise Exception(f"Database connection failed: {str(e)}")
+        if self._monitor_task is None or self._monitor_task.done():
+            self._monitor_task = asyncio.create_task(self._liveness_loop())
+
+    async def _run(self, query, parameters, label):
+        """Run a query with retry and reconnection, returning a list of record dicts"""
+        max_retries = 3
+        last_error = None
+
+        for attempt in range(max_retries):
+            try:
+                await self._ensure_connected()
+
+                async with self.driver.session() as session:
+                    result = await session.run(query, parameters or {})
+                    return [record.data() async for record in result]
+            except (ServiceUnavailable, SessionExpired) as e:
+                # These are connection-related errors, try to reconnect
+                last_error = e
+                logger.warning(f"Connection error on {label} attempt {attempt + 1}/{max_retries}: {str(e)}")
+                self._mark_unhealthy(str(e))
+                if attempt < max_retries - 1:
+                    await asyncio.sleep(1 * (attempt + 1))  # Exponential backoff
+                    continue
+            except TransientError as e:
+                last_error = e
+                logger.warning(f"Transient error on {label} attempt {attempt + 1}/{max_retries}: {str(e)}")
+                if attempt < max_retries - 1:
+                    await asyncio.sleep(1 * (attempt + 1))
+                    continue
+            except Exception as e:
+                last_error = e
+                if attempt < max_retries - 1:
+                    logger.warning(f"{label.capitalize()} error on attempt {attempt + 1}/{max_retries}: {str(e)}")
+                    await asyncio.sleep(1)
+                    continue
+                break
+
+        error_msg = f"{label.capitalize()} execution failed after {max_retries} attempts: {str(last_error)}"
+        logger.error(error_msg)
+        raise Exception(error_msg)
+
+    async def execute_query(self, query, parameters=None):
+        """Execute a read query with automatic retry and reconnection"""
+        return await self._run(query, parameters, "query")
+
+    async def execute_write_query(self, query, parameters=None):
+        """Execute a write query with automatic retry and reconnection"""
+        return await self._run(query, parameters, "write query")
+
+async_db = AsyncNeo4jDatabase()
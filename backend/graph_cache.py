@@ -0,0 +1,167 @@
+"""
+In-process cache of serialized section graph payloads.
+
+Section graphs only change through the node write endpoints, so the JSON body built
+for a section is kept in memory and served as-is on repeat views. Entries are keyed
+by the identifier the client used (section gid, query string or graph path) and are
+also indexed by the section's `graph name` so that a write to a `gr_id` can drop
+every entry for that graph. Memory is bounded by a byte budget with LRU eviction.
+
+Every entry carries a strong ETag (a hash of the body) so the routes can answer
+`If-None-Match` with 304 straight from the cache. The stories list is cached under
+the STORIES_TAG pseudo graph name, which node writes invalidate as well.
+"""
+import hashlib
+import json
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Set, Tuple
+
+from fastapi.encoders import jsonable_encoder
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+CacheKey = Tuple[str, str]
+
+# Pseudo graph name for payloads built from the story/chapter/section hierarchy
+STORIES_TAG = "__stories__"
+
+
+def serialize_payload(payload: Any) -> bytes:
+    """Encode a payload exactly like FastAPI's default JSONResponse would"""
+    return json.dumps(
+        jsonable_encoder(payload),
+        ensure_ascii=False,
+        allow_nan=False,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+def payload_etag(body: bytes) -> str:
+    """Strong ETag for a serialized payload"""
+    return f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """True if an If-None-Match header value matches `etag` (weak comparison, per RFC 9110)"""
+    if not if_none_match:
+        return False
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*":
+            return True
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+class GraphCache:
+    """Byte-bounded LRU cache of serialized graph payloads, invalidated by graph name"""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[CacheKey, Dict[str, Any]]" = OrderedDict()
+        self._keys_by_graph: Dict[str, Set[CacheKey]] = {}
+        self._size = 0
+        self._lock = threading.Lock()
+        # Bumped on every invalidation so a payload built before a write is never stored after it
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def get(self, key: CacheKey) -> Optional[Tuple[bytes, str]]:
+        """Return the cached (body, etag) for `key` and mark it most recently used"""
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry["body"], entry["etag"]
+
+    def put(self, key: CacheKey, body: bytes, graph_name: Optional[str], generation: Optional[int] = None) -> str:
+        """
+        Store a serialized body for `key`, evicting least recently used entries as needed.
+        Pass the `generation` read before querying to skip storing if a write happened meanwhile.
+        Returns the body's ETag whether or not it was cached.
+        """
+        etag = payload_etag(body)
+        if not self.enabled or graph_name is None:
+            return etag
+        size = len(body)
+        if size > self.max_bytes:
+            logger.info(f"Graph payload for {key} ({size} bytes) exceeds cache budget, not caching")
+            return etag
+        graph_name = str(graph_name)
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return etag
+            self._remove(key)
+            self._entries[key] = {"body": body, "etag": etag, "graph_name": graph_name, "size": size}
+            self._keys_by_graph.setdefault(graph_name, set()).add(key)
+            self._size += size
+            while self._size > self.max_bytes and self._entries:
+                oldest_key = next(iter(self._entries))
+                self._remove(oldest_key)
+                self.evictions += 1
+        return etag
+
+    def invalidate_graph(self, graph_name: Any) -> int:
+        """Drop every entry built for the section graph `graph_name` (a node's gr_id, or STORIES_TAG)"""
+        if graph_name is None:
+            return 0
+        with self._lock:
+            self.generation += 1
+            keys = list(self._keys_by_graph.get(str(graph_name), ()))
+            for key in keys:
+                self._remove(key)
+        if keys:
+            logger.info(f"Invalidated {len(keys)} cached graph payload(s) for graph '{graph_name}'")
+        return len(keys)
+
+    def clear(self):
+        """Drop all entries"""
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+            self._keys_by_graph.clear()
+            self._size = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._size,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    def _remove(self, key: CacheKey):
+        # Caller holds the lock
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self._size -= entry["size"]
+        keys = self._keys_by_graph.get(entry["graph_name"])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_graph[entry["graph_name"]]
+
+
+graph_cache = GraphCache(Config.GRAPH_CACHE_MAX_BYTES)
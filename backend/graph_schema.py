@@ -0,0 +1,173 @@
+"""
+Neo4j schema bootstrap for index-backed section membership.
+
+The imported graph stores section membership as `node.gr_id = section.\`graph name\``
+with mixed value types (strings, integers, floats), and nodes carry arbitrary labels.
+Neo4j can only use an index for a labelled property compared without a function
+wrapped around it, so this module materializes:
+
+- `gid_key`:  toString(gid) on :story, :chapter and :section nodes
+- `gr_key`:   toString(`graph name`) on :section nodes
+- `gr_key`:   toString(gr_id) on every non-hierarchy node, plus the :GraphMember label
+
+and creates range indexes on those keys. The query builders in queries.py rely on
+these properties: nodes without them are invisible to stories, graph and calendar reads.
+Write paths keep them current: /api/nodes/create sets them directly and /api/cypher/execute
+normalizes after write queries. At startup the app counts stale nodes and, with
+GRAPH_NORMALIZE_ON_STARTUP, normalizes them in a background task. After bulk imports
+outside the app, run `python migrate_graph_schema.py`.
+"""
+import logging
+import re
+from typing import Dict, List
+
+logger = logging.getLogger(__name__)
+
+# Label added to every node that belongs to a section graph (has a gr_id)
+MEMBER_LABEL = "GraphMember"
+
+HIERARCHY_LABELS = ["story", "chapter", "section"]
+
+DEFAULT_BATCH_SIZE = 10000
+
+INDEXES: List[str] = [
+    "CREATE RANGE INDEX section_gid IF NOT EXISTS FOR (s:section) ON (s.gid)",
+    "CREATE RANGE INDEX section_gid_key IF NOT EXISTS FOR (s:section) ON (s.gid_key)",
+    "CREATE RANGE INDEX section_graph_name IF NOT EXISTS FOR (s:section) ON (s.`graph name`)",
+    "CREATE RANGE INDEX section_name IF NOT EXISTS FOR (s:section) ON (s.`Section Name`)",
+    "CREATE RANGE INDEX section_gr_key IF NOT EXISTS FOR (s:section) ON (s.gr_key)",
+    "CREATE RANGE INDEX story_gid_key IF NOT EXISTS FOR (s:story) ON (s.gid_key)",
+    "CREATE RANGE INDEX story_name IF NOT EXISTS FOR (s:story) ON (s.`Story Name`)",
+    "CREATE RANGE INDEX chapter_gid_key IF NOT EXISTS FOR (c:chapter) ON (c.gid_key)",
+    f"CREATE RANGE INDEX graph_member_gr_key IF NOT EXISTS FOR (n:{MEMBER_LABEL}) ON (n.gr_key)",
+    f"CREATE RANGE INDEX graph_member_gid IF NOT EXISTS FOR (n:{MEMBER_LABEL}) ON (n.gid)",
+]
+
+# Each statement only touches nodes whose keys are missing or stale, so re-running is cheap.
+NORMALIZATION_STEPS: List[Dict[str, str]] = [
+    {
+        "name": "hierarchy gid_key",
+        "query": """
+        MATCH (n)
+        WHERE (n:story OR n:chapter OR n:section)
+          AND n.gid IS NOT NULL
+          AND (n.gid_key IS NULL OR n.gid_key <> toString(n.gid))
+        CALL {{
+          WITH n
+          SET n.gid_key = toString(n.gid)
+        }} IN TRANSACTIONS OF {batch_size} ROWS
+        RETURN count(n) AS updated
+        """,
+    },
+    {
+        "name": "section gr_key",
+        "query": """
+        MATCH (s:section)
+        WHERE s.`graph name` IS NOT NULL
+          AND (s.gr_key IS NULL OR s.gr_key <> toString(s.`graph name`))
+        CALL {{
+          WITH s
+          SET s.gr_key = toString(s.`graph name`)
+        }} IN TRANSACTIONS OF {batch_size} ROWS
+        RETURN count(s) AS updated
+        """,
+    },
+    {
+        "name": "member label and gr_key",
+        "query": """
+        MATCH (n)
+        WHERE n.gr_id IS NOT NULL
+          AND NONE(l IN labels(n) WHERE toLower(l) IN ['story','chapter','section'])
+          AND (NOT n:{member_label} OR n.gr_key IS NULL OR n.gr_key <> toString(n.gr_id))
+        CALL {{
+          WITH n
+          SET n:{member_label}, n.gr_key = toString(n.gr_id)
+        }} IN TRANSACTIONS OF {batch_size} ROWS
+        RETURN count(n) AS updated
+        """,
+    },
+    {
+        "name": "stale members",
+        "query": """
+        MATCH (n:{member_label})
+        WHERE n.gr_id IS NULL
+           OR ANY(l IN labels(n) WHERE toLower(l) IN ['story','chapter','section'])
+        CALL {{
+          WITH n
+          REMOVE n:{member_label}, n.gr_key
+        }} IN TRANSACTIONS OF {batch_size} ROWS
+        RETURN count(n) AS updated
+        """,
+    },
+]
+
+
+# Nodes the normalization steps above would still rewrite
+UNNORMALIZED_COUNT_QUERY = f"""
+MATCH (n)
+WHERE ((n:story OR n:chapter OR n:section) AND n.gid IS NOT NULL
+       AND (n.gid_key IS NULL OR n.gid_key <> toString(n.gid)))
+   OR (n:section AND n.`graph name` IS NOT NULL
+       AND (n.gr_key IS NULL OR n.gr_key <> toString(n.`graph name`)))
+   OR (n.gr_id IS NOT NULL
+       AND NONE(l IN labels(n) WHERE toLower(l) IN ['story','chapter','section'])
+       AND (NOT n:{MEMBER_LABEL} OR n.gr_key IS NULL OR n.gr_key <> toString(n.gr_id)))
+RETURN count(n) AS unnormalized
+"""
+
+
+def membership_properties(properties: dict, label: str) -> dict:
+    """
+    Fill in the materialized keys on `properties` for a node created with `label`.
+    Used by write paths that create nodes so they are visible to the indexed queries.
+    """
+    if label.lower() in HIERARCHY_LABELS:
+        if properties.get("gid") not in (None, ""):
+            properties["gid_key"] = str(properties["gid"])
+        if label.lower() == "section" and properties.get("graph name") not in (None, ""):
+            properties["gr_key"] = str(properties["graph name"])
+    elif properties.get("gr_id") not in (None, ""):
+        properties["gr_key"] = str(properties["gr_id"])
+    return properties
+
+
+def strip_member_label(node_type: str) -> str:
+    """Remove the internal member label from a `db.schema` nodeType string like ":`entity`:`GraphMember`" """
+    if not isinstance(node_type, str):
+        return node_type
+    return re.sub(rf":`?{MEMBER_LABEL}`?", "", node_type)
+
+
+def ensure_graph_indexes(database) -> int:
+    """Create the range indexes used by the section queries (idempotent)"""
+    for index_query in INDEXES:
+        logger.info(f"Ensuring index: {index_query[:80]}...")
+        database.execute_write_query(index_query)
+    return len(INDEXES)
+
+
+def normalize_graph_keys(database, batch_size: int = DEFAULT_BATCH_SIZE) -> Dict[str, int]:
+    """Materialize gid_key / gr_key and the member label in batched transactions (idempotent)"""
+    counts = {}
+    for step in NORMALIZATION_STEPS:
+        query = step["query"].format(batch_size=int(batch_size), member_label=MEMBER_LABEL)
+        logger.info(f"Normalizing {step['name']}...")
+        result = database.execute_write_query(query)
+        updated = result[0].get("updated", 0) if result else 0
+        counts[step["name"]] = updated
+        logger.info(f"✓ {step['name']}: {updated} node(s) updated")
+    return counts
+
+
+def count_unnormalized_nodes(database) -> int:
+    """Nodes missing (or with stale) membership keys, i.e. hidden from the section queries"""
+    result = database.execute_query(UNNORMALIZED_COUNT_QUERY)
+    return result[0].get("unnormalized", 0) if result else 0
+
+
+def bootstrap_graph_schema(database, batch_size: int = DEFAULT_BATCH_SIZE, indexes_only: bool = False) -> Dict[str, int]:
+    """Create indexes and, unless `indexes_only`, normalize membership keys"""
+    ensure_graph_indexes(database)
+    if indexes_only:
+        return {}
+    return normalize_graph_keys(database, batch_size=batch_size)
@@ -0,0 +1,129 @@
+"""
+Materialized node statistics on :section, :chapter and :story nodes.
+
+Statistics used to be recomputed with COUNT(DISTINCT ...) over every member node on
+each request. They are now stored as properties:
+
+- `stat_total_nodes`:   number of :GraphMember nodes in the node's section graph(s)
+- `stat_entity_count`:  number of distinct entity nodes among them
+- `stat_updated_date`:  latest date found on those nodes
+
+`rebuild_graph_statistics` recomputes everything (run `python rebuild_graph_statistics.py`
+after imports). The node write endpoints keep the counters current with
+`apply_node_delta`. Nodes whose statistics were never built are left untouched, so
+readers can tell "not materialized" (NULL) apart from zero and fall back to a live count.
+"""
+import logging
+from typing import Any, Dict, Optional
+
+from graph_schema import DEFAULT_BATCH_SIZE
+
+logger = logging.getLogger(__name__)
+
+# Property keys checked (in order) for a node's date, matching the statistics queries
+DATE_PROPERTIES = ["date", "Date", "Relationship Date", "Action Date", "Process Date", "Disb Date"]
+
+SECTION_REBUILD_QUERY = """
+MATCH (s:section)
+CALL {{
+  WITH s
+  OPTIONAL MATCH (n:GraphMember)
+  WHERE s.gr_key IS NOT NULL AND n.gr_key = s.gr_key
+  WITH s,
+       COUNT(DISTINCT n) AS total_nodes,
+       COUNT(DISTINCT CASE WHEN ANY(l IN labels(n) WHERE toLower(l) = 'entity') THEN coalesce(toString(n.gid), elementId(n)) ELSE null END) AS entity_count,
+       MAX(coalesce(n.date, n.`Date`, n.`Relationship Date`, n.`Action Date`, n.`Process Date`, n.`Disb Date`)) AS updated_date
+  SET s.stat_total_nodes = total_nodes,
+      s.stat_entity_count = entity_count,
+      s.stat_updated_date = updated_date
+}} IN TRANSACTIONS OF {batch_size} ROWS
+RETURN count(s) AS updated
+"""
+
+# Chapters and stories aggregate over the distinct graph keys of the sections below them
+HIERARCHY_REBUILD_QUERY = """
+MATCH (h:{label})
+CALL {{
+  WITH h
+  OPTIONAL MATCH {section_pattern}
+  WITH h, [g IN COLLECT(DISTINCT section.gr_key) WHERE g <> ""] AS section_graph_names
+  UNWIND CASE WHEN size(section_graph_names) = 0 THEN [null] ELSE section_graph_names END AS section_graph_name
+  OPTIONAL MATCH (n:GraphMember)
+  WHERE n.gr_key = section_graph_name
+  WITH h,
+       COUNT(DISTINCT n) AS total_nodes,
+       COUNT(DISTINCT CASE WHEN ANY(l IN labels(n) WHERE toLower(l) = 'entity') THEN coalesce(toString(n.gid), elementId(n)) ELSE null END) AS entity_count,
+       MAX(coalesce(n.date, n.`Date`, n.`Relationship Date`, n.`Action Date`, n.`Process Date`, n.`Disb Date`)) AS updated_date
+  SET h.stat_total_nodes = total_nodes,
+      h.stat_entity_count = entity_count,
+      h.stat_updated_date = updated_date
+}} IN TRANSACTIONS OF {batch_size} ROWS
+RETURN count(h) AS updated
+"""
+
+HIERARCHY_SECTION_PATTERNS = {
+    "chapter": "(h)-[:chapter_section]-(section:section)",
+    "story": "(h)-[:story_chapter]-(:chapter)-[:chapter_section]-(section:section)",
+}
+
+# Applied when a member node is created (delta = 1) or deleted (delta = -1) in a section graph.
+# Every section, chapter and story that covers the graph is adjusted once.
+NODE_DELTA_QUERY = """
+MATCH (s:section)
+WHERE s.gr_key = $graph_name
+OPTIONAL MATCH (chapter:chapter)-[:chapter_section]-(s)
+OPTIONAL MATCH (story:story)-[:story_chapter]-(chapter)
+WITH COLLECT(DISTINCT s) + COLLECT(DISTINCT chapter) + COLLECT(DISTINCT story) AS targets
+UNWIND targets AS t
+WITH t
+WHERE t.stat_total_nodes IS NOT NULL
+SET t.stat_total_nodes = CASE WHEN t.stat_total_nodes + $delta < 0 THEN 0 ELSE t.stat_total_nodes + $delta END,
+    t.stat_entity_count = CASE WHEN coalesce(t.stat_entity_count, 0) + $entity_delta < 0 THEN 0 ELSE coalesce(t.stat_entity_count, 0) + $entity_delta END,
+    t.stat_updated_date = CASE
+      WHEN $date IS NOT NULL AND (t.stat_updated_date IS NULL OR $date > t.stat_updated_date) THEN $date
+      ELSE t.stat_updated_date
+    END
+RETURN count(t) AS updated
+"""
+
+
+def node_date(properties: Dict[str, Any]) -> Optional[Any]:
+    """First date-like property of a node, in the same order the statistics queries use"""
+    for key in DATE_PROPERTIES:
+        if properties.get(key) not in (None, ""):
+            return properties[key]
+    return None
+
+
+def apply_node_delta(database, graph_name: Any, delta: int, is_entity: bool = False, date: Any = None) -> int:
+    """
+    Adjust materialized statistics after a member node was created (delta=1) or deleted (delta=-1).
+    Deleting a node cannot lower `stat_updated_date`; a rebuild corrects it.
+    """
+    if graph_name is None:
+        return 0
+    result = database.execute_write_query(NODE_DELTA_QUERY, {
+        "graph_name": str(graph_name),
+        "delta": delta,
+        "entity_delta": delta if is_entity else 0,
+        "date": date if delta > 0 else None,
+    })
+    return result[0].get("updated", 0) if result else 0
+
+
+def rebuild_graph_statistics(database, batch_size: int = DEFAULT_BATCH_SIZE) -> Dict[str, int]:
+    """Recompute statistics for every section, chapter and story (idempotent)"""
+    counts = {}
+    logger.info("Rebuilding section statistics...")
+    result = database.execute_write_query(SECTION_REBUILD_QUERY.format(batch_size=int(batch_size)))
+    counts["section"] = result[0].get("updated", 0) if result else 0
+
+    for label, section_pattern in HIERARCHY_SECTION_PATTERNS.items():
+        logger.info(f"Rebuilding {label} statistics...")
+        query = HIERARCHY_REBUILD_QUERY.format(label=label, section_pattern=section_pattern, batch_size=int(batch_size))
+        result = database.execute_write_query(query)
+        counts[label] = result[0].get("updated", 0) if result else 0
+
+    for label, updated in counts.items():
+        logger.info(f"✓ {label}: {updated} node(s) updated")
+    return counts
@@ -2,23 +2,37 @@
 import platform_fix
 
 from contextlib import asynccontextmanager
-from fastapi import FastAPI, HTTPException, Depends, UploadFile, File, Form
+from fastapi import FastAPI, HTTPException, Depends, UploadFile, File, Form, Response, Header, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
+from fastapi.concurrency import run_in_threadpool
 from typing import Optional, List
+import asyncio
 import time
+import re
+import json
 import logging
 import os
-import aiofiles
 from config import Config
-from services import get_all_stories, get_graph_data, get_graph_data_by_section_and_country, search_with_ai, get_story_statistics, get_all_node_types, get_calendar_data, get_cluster_data, get_entity_wikidata, search_entity_wikidata
-from models import GraphData, UserCreate, UserLogin, Token, UserResponse, GoogleAuthRequest, UserActivityCreate, UserActivityResponse, AdminLoginRequest, SubmissionCreate, SubmissionResponse, UserSubscriptionResponse, SubmissionUpdateRequest
-from pydantic import BaseModel
-from auth import create_access_token, verify_google_token, get_current_user, get_current_admin_user
+from services import get_stories_payload_async, get_graph_payload_async, get_graph_data_by_section_and_country, search_with_ai, get_story_statistics_async, get_all_story_statistics_payload_async, get_all_node_types, get_calendar_payload_async, get_cluster_data_async, get_entity_wikidata, search_entity_wikidata
+from models import GraphData, UserCreate, UserLogin, Token, UserResponse, GoogleAuthRequest, UserActivityCreate, UserActivityResponse, AdminLoginRequest, SubmissionCreate, SubmissionResponse, SubmissionSummary, UserSubscriptionResponse, SubmissionUpdateRequest
+from pydantic import BaseModel, ValidationError
+from auth import create_access_token, create_stream_token, decode_stream_token, STREAM_TOKEN_EXPIRE_SECONDS, verify_google_token, get_current_user, get_current_admin_user
 from user_service import create_user, authenticate_user, get_user_by_email, create_or_update_google_user, get_user_by_id, get_all_users, get_user_statistics
-from activity_service import create_activity, get_activities, get_activity_statistics, get_user_activity_summary
-from submission_service import create_submission, process_submission, get_submission, get_user_submissions, get_all_submissions
+from activity_service import create_activities_batch, get_activities, get_activity_statistics, get_user_activity_summary
+from submission_service import create_submission, get_submission, get_user_submissions, get_all_submissions, save_upload, UploadTooLargeError, UPLOAD_DIR
+from submission_worker import submission_worker
+from submission_progress import submission_progress, TERMINAL_STAGES
 from subscription_service import get_user_subscription, update_user_subscription, get_subscription_plan, SUBSCRIPTION_PLANS
-from rate_limit_service import check_rate_limit, record_request
+from rate_limit_service import check_rate_limit, record_request, invalidate_user_tier
+from graph_schema import MEMBER_LABEL, HIERARCHY_LABELS, count_unnormalized_nodes, ensure_graph_indexes, normalize_graph_keys, membership_properties, strip_member_label
+from graph_cache import graph_cache, etag_matches, STORIES_TAG
+from graph_statistics import apply_node_delta, node_date
+from neon_database import neon_db
+from activity_ingest import activity_ingest
+from pagination import NEXT_CURSOR_HEADER, decode_cursor, next_cursor
+from request_limits import limit_requests, stats as request_limit_stats
+from body_limits import BodySizeLimitMiddleware
 from datetime import timedelta, datetime
 
 # Configure logging
@@ -36,6 +50,21 @@ except ValueError as e:
     logger.error(f"Configuration validation failed: {e}")
     raise
 
+# Startup work that must not delay serving; referenced here so it isn't garbage collected
+_background_tasks = set()
+
+
+async def normalize_graph_in_background():
+    """Materialize missing membership keys after startup, then drop cached graphs built without them"""
+    from database import db
+    try:
+        counts = await run_in_threadpool(normalize_graph_keys, db)
+        graph_cache.clear()
+        logger.info(f"Normalized graph membership keys in the background: {counts}")
+    except Exception as e:
+        logger.error(f"Background graph normalization failed: {e}. Run `python migrate_graph_schema.py`.")
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan manager - handles startup and shutdown"""
@@ -53,11 +82,54 @@ async def lifespan(app: FastAPI):
         except Exception as e:
             logger.error(f"Database connection test failed: {e}")
             logger.warning("Application will continue, but database operations may fail")
+        # Section reads only see nodes with materialized keys (see graph_schema.py). Startup only
+        # ensures the indexes and counts stale nodes; normalization itself runs in the background
+        try:
+            await run_in_threadpool(ensure_graph_indexes, db)
+            unnormalized = await run_in_threadpool(count_unnormalized_nodes, db)
+            if unnormalized and Config.GRAPH_NORMALIZE_ON_STARTUP:
+                logger.warning(f"{unnormalized} graph node(s) lack membership keys; normalizing in the background")
+                task = asyncio.create_task(normalize_graph_in_background())
+                _background_tasks.add(task)
+                task.add_done_callback(_background_tasks.discard)
+            elif unnormalized:
+                logger.error(
+                    f"{unnormalized} graph node(s) lack gid_key/gr_key/:{MEMBER_LABEL} and are hidden from "
+                    "stories, graph and calendar. Run `python migrate_graph_schema.py`."
+                )
+        except Exception as e:
+            logger.error(
+                f"Could not check the graph schema: {e}. Nodes without membership keys stay hidden "
+                "from graph reads until `python migrate_graph_schema.py` has run."
+            )
     except Exception as e:
         logger.error(f"Failed to initialize database: {e}")
         logger.warning("Application will continue, but database operations may fail")
+
+    # Warm up the async driver used by the graph read routes
+    try:
+        from database import async_db
+        await async_db.execute_query("RETURN 1 as test")
+        logger.info("Async database connection verified successfully")
+    except Exception as e:
+        logger.error(f"Async database connection test failed: {e}")
+        logger.warning("Application will continue, but graph read endpoints may fail")
+
+    # Background writer for /api/activity/track
+    activity_ingest.start()
+    # Background processing of submissions (also resumes pending/interrupted ones)
+    submission_progress.attach(asyncio.get_running_loop())
+    submission_worker.start()
     
     yield
+
+    submission_worker.stop()
+
+    # Flush queued activity events while the Postgres pool is still open
+    try:
+        await activity_ingest.stop()
+    except Exception as e:
+        logger.warning(f"Error flushing activity events: {e}")
     
     # Shutdown: Close database connection
     logger.info("Shutting down application...")
@@ -67,6 +139,15 @@ async def lifespan(app: FastAPI):
         logger.info("Database connection closed")
     except Exception as e:
         logger.warning(f"Error closing database connection: {e}")
+    try:
+        from database import async_db
+        await async_db.close()
+    except Exception as e:
+        logger.warning(f"Error closing async database connection: {e}")
+    try:
+        neon_db.close()
+    except Exception as e:
+        logger.warning(f"Error closing Postgres connection pool: {e}")
 
 app = FastAPI(
     title="Graph Visualization API",
@@ -75,19 +156,44 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
-# Note: Request body size limit is controlled by uvicorn/hypercorn
-# To increase it, use: uvicorn.run(..., limit_max_requests=10000)
-# Or set environment variable: UVICORN_LIMIT_MAX_REQUESTS=10000
-# The default limit is usually sufficient, but for very large graphs,
-# you may need to increase it at the server level
+# Reject oversized submission bodies before Starlette spools them to disk: the PDF cap plus
+# room for the other form fields and multipart framing. Added before CORS so 413s carry CORS headers.
+app.add_middleware(
+    BodySizeLimitMiddleware,
+    max_bytes=Config.SUBMISSION_MAX_UPLOAD_BYTES + 1024 * 1024,
+    paths=["/api/submissions"],
+)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=Config.CORS_ORIGINS,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", NEXT_CURSOR_HEADER, "Retry-After"],
 )
 
+def cached_json_response(body: bytes, etag: str, if_none_match: Optional[str] = None) -> Response:
+    """JSON response carrying a strong ETag; 304 with no body when the client already has it"""
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+def parse_cursor(cursor: Optional[str]) -> Optional[tuple]:
+    """Decode a keyset pagination cursor from the query string (400 if malformed)"""
+    if not cursor:
+        return None
+    try:
+        return decode_cursor(cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+def set_next_cursor(response: Response, items: list, limit: int, *fields: str):
+    """Expose the cursor for the following page in the X-Next-Cursor header"""
+    cursor = next_cursor(items, limit, *fields)
+    if cursor:
+        response.headers[NEXT_CURSOR_HEADER] = cursor
+
 @app.get("/")
 async def root():
     return {
@@ -124,7 +230,7 @@ async def register_user(user_data: UserCreate):
     """
     try:
         # Check if user already exists
-        existing_user = get_user_by_email(user_data.email)
+        existing_user = await run_in_threadpool(get_user_by_email, user_data.email)
         if existing_user:
             raise HTTPException(
                 status_code=400,
@@ -133,7 +239,7 @@ async def register_user(user_data: UserCreate):
         
         # Create new user
         try:
-            new_user = create_user(user_data, auth_provider="local")
+            new_user = await run_in_threadpool(create_user, user_data, auth_provider="local")
         except ValueError as e:
             # User already exists or validation error
             raise HTTPException(
@@ -189,7 +295,7 @@ async def login_user(user_credentials: UserLogin):
     try:
         # Authenticate user
         try:
-            user = authenticate_user(user_credentials.email, user_credentials.password)
+            user = await run_in_threadpool(authenticate_user, user_credentials.email, user_credentials.password)
         except Exception as e:
             error_msg = str(e)
             # Check if it's a database table issue
@@ -275,7 +381,7 @@ async def google_auth(auth_request: GoogleAuthRequest):
             )
         
         # Create or update user
-        user = create_or_update_google_user(google_user_info)
+        user = await run_in_threadpool(create_or_update_google_user, google_user_info)
         
         if not user:
             raise HTTPException(
@@ -317,7 +423,7 @@ async def get_current_user_info(current_user: dict = Depends(get_current_user)):
     """
     try:
         # Fetch fresh user data from database
-        user = get_user_by_id(current_user['id'])
+        user = await run_in_threadpool(get_user_by_id, current_user['id'])
         
         if not user:
             raise HTTPException(
@@ -356,7 +462,7 @@ async def admin_login(credentials: AdminLoginRequest):
         from admin_user_service import authenticate_admin_user
         
         # Authenticate admin user from PostgreSQL
-        user = authenticate_admin_user(credentials.email, credentials.password)
+        user = await run_in_threadpool(authenticate_admin_user, credentials.email, credentials.password)
         
         if not user:
             raise HTTPException(
@@ -413,41 +519,62 @@ async def admin_login(credentials: AdminLoginRequest):
 
 # ============== Activity Tracking Endpoints ==============
 
-@app.post("/api/activity/track", response_model=UserActivityResponse)
+@app.post("/api/activity/track", status_code=202)
 async def track_activity(activity: UserActivityCreate):
     """
     Track user activity (page views, section views, etc.)
     Can be called by authenticated or anonymous users
+    
+    Events are validated and queued for a batched write (see activity_ingest.py);
+    the response does not wait for Postgres.
+    """
+    if activity_ingest.enqueue(activity):
+        return {"status": "queued"}
+    # Queue full (or ingest not running): drop the event rather than insert it on the request path
+    return {"status": "dropped"}
+
+@app.post("/api/activity/track/batch", status_code=202)
+async def track_activity_batch(request: Request):
+    """
+    Track a batch of activity events (JSON array of UserActivityCreate)
+    
+    Accepts any content type so browsers can send it with navigator.sendBeacon,
+    which posts strings as text/plain without a CORS preflight.
+    The whole batch is inserted with a single statement.
     """
     try:
-        try:
-            result = create_activity(activity)
-        except Exception as e:
-            error_msg = str(e)
-            # Check if table doesn't exist
-            if "relation" in error_msg.lower() and "does not exist" in error_msg.lower():
-                logger.error("Database tables not initialized")
-                raise HTTPException(
-                    status_code=500,
-                    detail="Database not initialized. Please contact administrator."
-                )
-            # Re-raise other exceptions
-            raise
-        
-        if not result:
+        payload = json.loads(await request.body() or b"[]")
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Request body must be a JSON array of activity events")
+    if isinstance(payload, dict):
+        payload = payload.get("events", [])
+    if not isinstance(payload, list):
+        raise HTTPException(status_code=400, detail="Request body must be a JSON array of activity events")
+    if len(payload) > Config.ACTIVITY_BATCH_MAX_EVENTS:
+        raise HTTPException(status_code=413, detail=f"At most {Config.ACTIVITY_BATCH_MAX_EVENTS} events per batch")
+
+    try:
+        activities = [UserActivityCreate.model_validate(event) for event in payload]
+    except ValidationError as e:
+        raise HTTPException(status_code=422, detail=e.errors())
+
+    if not activities:
+        return {"status": "recorded", "count": 0}
+
+    try:
+        inserted = await run_in_threadpool(create_activities_batch, activities)
+        return {"status": "recorded", "count": inserted}
+    except Exception as e:
+        error_msg = str(e)
+        if "relation" in error_msg.lower() and "does not exist" in error_msg.lower():
             raise HTTPException(
                 status_code=500,
-                detail="Failed to create activity record"
+                detail="Database not initialized. Please contact administrator."
             )
-        
-        return result
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.exception(f"Error tracking activity: {e}")
+        logger.exception(f"Error tracking activity batch: {e}")
         raise HTTPException(
             status_code=500,
-            detail=f"Activity tracking failed: {str(e)}"
+            detail=f"Activity tracking failed: {error_msg}"
         )
 
 # ============== Admin Dashboard Endpoints ==============
@@ -461,7 +588,7 @@ async def get_admin_statistics(
     Get activity statistics for admin dashboard (Admin only)
     """
     try:
-        stats = get_activity_statistics(days=days)
+        stats = await run_in_threadpool(get_activity_statistics, days=days)
         return stats
     except Exception as e:
         logger.exception(f"Error fetching admin statistics: {e}")
@@ -472,29 +599,36 @@ async def get_admin_statistics(
 
 @app.get("/api/admin/activities", response_model=List[UserActivityResponse])
 async def get_admin_activities(
+    response: Response,
     user_id: Optional[str] = None,
     session_id: Optional[str] = None,
     activity_type: Optional[str] = None,
     days: int = 7,
     limit: int = 100,
     skip: int = 0,
+    cursor: Optional[str] = None,
     current_user: dict = Depends(get_current_admin_user)
 ):
     """
     Get user activities with filters (Admin only)
+    Pass the X-Next-Cursor response header back as `cursor` to fetch the next page.
     """
+    after = parse_cursor(cursor)
     try:
         start_date = datetime.utcnow() - timedelta(days=days) if days else None
         
-        activities = get_activities(
+        activities = await run_in_threadpool(
+            get_activities,
             user_id=user_id,
             session_id=session_id,
             activity_type=activity_type,
             start_date=start_date,
             limit=limit,
-            skip=skip
+            skip=skip,
+            after=after
         )
         
+        set_next_cursor(response, activities, limit, "timestamp", "id")
         return activities
     except Exception as e:
         logger.exception(f"Error fetching activities: {e}")
@@ -513,7 +647,7 @@ async def get_user_activity(
     Get activity summary for a specific user (Admin only)
     """
     try:
-        summary = get_user_activity_summary(user_id, days=days)
+        summary = await run_in_threadpool(get_user_activity_summary, user_id, days=days)
         return summary
     except Exception as e:
         logger.exception(f"Error fetching user activity: {e}")
@@ -541,7 +675,7 @@ async def create_submission_endpoint(
         user_id = current_user['id']
         
         # Check rate limit
-        allowed, error_msg = check_rate_limit(user_id)
+        allowed, error_msg = await run_in_threadpool(check_rate_limit, user_id)
         if not allowed:
             raise HTTPException(status_code=429, detail=error_msg)
         
@@ -553,6 +687,7 @@ async def create_submission_endpoint(
         file_path = None
         file_name = None
         file_size = None
+        file_sha256 = None
         
         if submission_type == 'pdf':
             if not file:
@@ -562,17 +697,18 @@ async def create_submission_endpoint(
             if not file.filename.endswith('.pdf'):
                 raise HTTPException(status_code=400, detail="Only PDF files are allowed")
             
-            # Save file
-            upload_dir = os.path.join(os.path.dirname(__file__), "uploads")
-            os.makedirs(upload_dir, exist_ok=True)
-            
+            # BodySizeLimitMiddleware has already bounded the request body; here the file itself is
+            # copied to disk in chunks (size and hash computed on the way) and held to the exact cap
             file_name = file.filename
-            file_path = os.path.join(upload_dir, f"{user_id}_{int(time.time())}_{file_name}")
+            file_path = os.path.join(UPLOAD_DIR, f"{user_id}_{int(time.time())}_{os.path.basename(file_name)}")
             
-            async with aiofiles.open(file_path, 'wb') as f:
-                content = await file.read()
-                file_size = len(content)
-                await f.write(content)
+            try:
+                file_size, file_sha256 = await save_upload(file, file_path, Config.SUBMISSION_MAX_UPLOAD_BYTES)
+            except UploadTooLargeError as e:
+                raise HTTPException(status_code=413, detail=str(e))
+            if file_size == 0:
+                os.remove(file_path)
+                raise HTTPException(status_code=400, detail="Uploaded PDF file is empty")
         
         elif submission_type == 'url':
             if not input_url:
@@ -599,24 +735,18 @@ async def create_submission_endpoint(
             tags=tags_list
         )
         
-        submission = create_submission(user_id, submission_data, file_path, file_name, file_size)
+        submission = await run_in_threadpool(create_submission, user_id, submission_data, file_path, file_name, file_size, file_sha256)
         
         if not submission:
             raise HTTPException(status_code=500, detail="Failed to create submission")
         
         # Record request for rate limiting
-        record_request(user_id, int(submission.id), "submission")
+        await run_in_threadpool(record_request, user_id, int(submission.id), "submission")
         
-        # Process submission asynchronously (in production, use a task queue)
-        # For now, process synchronously
-        try:
-            processed_submission = process_submission(submission.id)
-            if processed_submission:
-                return processed_submission
-        except Exception as e:
-            logger.error(f"Error processing submission: {e}")
-            # Return submission even if processing fails
-            pass
+        # Processed in the background; clients poll GET /api/submissions/{id} for the result.
+        # If the worker isn't running, the submission stays pending until the next startup.
+        if not submission_worker.enqueue(submission.id):
+            logger.warning(f"Submission worker not running, submission {submission.id} left pending")
         
         return submission
     except HTTPException:
@@ -632,7 +762,7 @@ async def get_submission_endpoint(
 ):
     """Get a submission by ID"""
     try:
-        submission = get_submission(submission_id)
+        submission = await run_in_threadpool(get_submission, submission_id)
         if not submission:
             raise HTTPException(status_code=404, detail="Submission not found")
         
@@ -647,15 +777,90 @@ async def get_submission_endpoint(
         logger.exception(f"Error getting submission: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to get submission: {str(e)}")
 
-@app.get("/api/submissions", response_model=List[SubmissionResponse])
+# Seconds between keep-alive comments on progress streams (the stored status is re-checked each time)
+SSE_KEEPALIVE_SECONDS = 15
+
+def format_sse(event: dict) -> str:
+    return f"data: {json.dumps(event, default=str)}\n\n"
+
+@app.post("/api/submissions/{submission_id}/events/token")
+async def submission_events_token_endpoint(
+    submission_id: str,
+    current_user: dict = Depends(get_current_user)
+):
+    """
+    Issue a short-lived token for the submission's event stream. EventSource can't send
+    headers, and the login token must not end up in URLs (access and proxy logs).
+    """
+    submission = await run_in_threadpool(get_submission, submission_id)
+    if not submission:
+        raise HTTPException(status_code=404, detail="Submission not found")
+    if submission.user_id != current_user['id'] and not current_user.get('is_admin'):
+        raise HTTPException(status_code=403, detail="Access denied")
+    return {"token": create_stream_token(current_user['id'], submission_id), "expires_in": STREAM_TOKEN_EXPIRE_SECONDS}
+
+@app.get("/api/submissions/{submission_id}/events")
+async def submission_events_endpoint(submission_id: str, request: Request, token: str):
+    """
+    Stream a submission's progress as Server-Sent Events until it completes or fails.
+    `token` comes from POST /api/submissions/{id}/events/token (checked when the stream opens).
+    """
+    if not decode_stream_token(token, submission_id):
+        raise HTTPException(status_code=401, detail="Could not validate credentials")
+
+    submission = await run_in_threadpool(get_submission, submission_id)
+    if not submission:
+        raise HTTPException(status_code=404, detail="Submission not found")
+
+    def stored_status_event(current) -> dict:
+        return {"submission_id": submission_id, "stage": current.status, "status": current.status}
+
+    async def stream():
+        # Subscribe before reading the latest event so nothing published in between is missed
+        queue = submission_progress.subscribe(submission_id)
+        try:
+            if submission.status in TERMINAL_STAGES:
+                event = stored_status_event(submission)
+            else:
+                event = submission_progress.latest(submission_id) or stored_status_event(submission)
+            yield format_sse(event)
+            while event["status"] not in TERMINAL_STAGES:
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=SSE_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        return
+                    # The job may be running on another instance; fall back to the stored status
+                    current = await run_in_threadpool(get_submission, submission_id)
+                    if current and current.status in TERMINAL_STAGES:
+                        event = stored_status_event(current)
+                        yield format_sse(event)
+                    else:
+                        yield ": keep-alive\n\n"
+                    continue
+                yield format_sse(event)
+        finally:
+            submission_progress.unsubscribe(submission_id, queue)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@app.get("/api/submissions", response_model=List[SubmissionSummary])
 async def get_user_submissions_endpoint(
+    response: Response,
     limit: int = 50,
     offset: int = 0,
+    cursor: Optional[str] = None,
     current_user: dict = Depends(get_current_user)
 ):
-    """Get all submissions for the current user"""
+    """Get all submissions for the current user (paginate with `cursor`, see X-Next-Cursor)"""
+    after = parse_cursor(cursor)
     try:
-        submissions = get_user_submissions(current_user['id'], limit, offset)
+        submissions = await run_in_threadpool(get_user_submissions, current_user['id'], limit, offset, after=after)
+        set_next_cursor(response, submissions, limit, "created_at", "id")
         return submissions
     except Exception as e:
         logger.exception(f"Error getting user submissions: {e}")
@@ -667,7 +872,7 @@ async def get_user_subscription_endpoint(
 ):
     """Get current user's subscription details"""
     try:
-        subscription = get_user_subscription(current_user['id'])
+        subscription = await run_in_threadpool(get_user_subscription, current_user['id'])
         if not subscription:
             raise HTTPException(status_code=404, detail="Subscription not found")
         return subscription
@@ -681,13 +886,17 @@ async def get_user_subscription_endpoint(
 
 @app.get("/api/admin/submissions")
 async def get_admin_submissions(
+    response: Response,
     limit: int = 100,
     offset: int = 0,
+    cursor: Optional[str] = None,
     current_user: dict = Depends(get_current_admin_user)
 ):
-    """Get all submissions (Admin only)"""
+    """Get all submissions (Admin only, paginate with `cursor`, see X-Next-Cursor)"""
+    after = parse_cursor(cursor)
     try:
-        submissions = get_all_submissions(limit, offset)
+        submissions = await run_in_threadpool(get_all_submissions, limit, offset, after=after)
+        set_next_cursor(response, submissions, limit, "created_at", "id")
         return submissions
     except Exception as e:
         logger.exception(f"Error getting all submissions: {e}")
@@ -710,11 +919,12 @@ async def update_user_subscription_endpoint(
             raise HTTPException(status_code=400, detail="subscription_tier is required")
         
         status = update_data.subscription_status or "active"
-        success = update_user_subscription(user_id, update_data.subscription_tier, status)
+        success = await run_in_threadpool(update_user_subscription, user_id, update_data.subscription_tier, status)
         
         if not success:
             raise HTTPException(status_code=404, detail="User not found")
         
+        invalidate_user_tier(user_id)
         return {"message": "Subscription updated successfully"}
     except HTTPException:
         raise
@@ -735,13 +945,17 @@ async def get_subscription_plans_endpoint(
 
 @app.get("/api/admin/users")
 async def get_all_users_endpoint(
+    response: Response,
     limit: int = 100,
     offset: int = 0,
+    cursor: Optional[str] = None,
     current_user: dict = Depends(get_current_admin_user)
 ):
-    """Get all users (Admin only)"""
+    """Get all users (Admin only, paginate with `cursor`, see X-Next-Cursor)"""
+    after = parse_cursor(cursor)
     try:
-        users = get_all_users(limit, offset)
+        users = await run_in_threadpool(get_all_users, limit, offset, after=after)
+        set_next_cursor(response, users, limit, "created_at", "id", "source")
         return users
     except Exception as e:
         logger.exception(f"Error getting users: {e}")
@@ -753,7 +967,7 @@ async def get_user_statistics_endpoint(
 ):
     """Get user statistics (Admin only)"""
     try:
-        stats = get_user_statistics()
+        stats = await run_in_threadpool(get_user_statistics)
         return stats
     except Exception as e:
         logger.exception(f"Error getting user statistics: {e}")
@@ -768,12 +982,12 @@ async def get_admin_dashboard(
     """
     try:
         # Get statistics for last 7 days
-        stats_7d = get_activity_statistics(days=7)
+        stats_7d = await run_in_threadpool(get_activity_statistics, days=7)
         # Get statistics for last 30 days
-        stats_30d = get_activity_statistics(days=30)
+        stats_30d = await run_in_threadpool(get_activity_statistics, days=30)
         
         # Get recent activities
-        recent_activities = get_activities(limit=20, skip=0)
+        recent_activities = await run_in_threadpool(get_activities, limit=20, skip=0)
         
         return {
             "stats_7_days": stats_7d,
@@ -799,6 +1013,12 @@ async def health_check():
         "database": "unknown",
         "database_uri": Config.NEO4J_URI,
         "database_user": Config.NEO4J_USER,
+        "graph_cache": graph_cache.stats(),
+        "postgres_pool": neon_db.metrics() if neon_db.is_configured() else None,
+        "activity_ingest": activity_ingest.stats(),
+        "request_limits": request_limit_stats(),
+        "submission_worker": submission_worker.stats(),
+        "submission_progress": submission_progress.stats(),
         "timestamp": None
     }
     
@@ -821,43 +1041,44 @@ async def health_check():
     return health_status
 
 @app.get("/api/stories", response_model=List[dict])
-async def get_stories():
+async def get_stories(if_none_match: Optional[str] = Header(None)):
     try:
-        stories = get_all_stories()
-
-        return [story.model_dump() for story in stories]
+        body, etag = await get_stories_payload_async()
+        return cached_json_response(body, etag, if_none_match)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching stories: {str(e)}")
 
-@app.get("/api/graph/{substory_id}", response_model=dict)
-async def get_graph_by_substory_id(substory_id: str):
+@app.get("/api/graph/{substory_id}", response_model=dict, dependencies=[Depends(limit_requests("graph"))])
+async def get_graph_by_substory_id(substory_id: str, if_none_match: Optional[str] = Header(None)):
     try:
+        # Served from the section graph cache as pre-serialized JSON when available;
+        # a matching If-None-Match on a cached section is answered without touching Neo4j
         if substory_id.isdigit() or (substory_id.replace('.', '').isdigit()):
-            graph_data = get_graph_data(section_gid=substory_id)
+            body, etag = await get_graph_payload_async(section_gid=substory_id)
         else:
-            graph_data = get_graph_data(section_query=substory_id)
-        return graph_data.model_dump()
+            body, etag = await get_graph_payload_async(section_query=substory_id)
+        return cached_json_response(body, etag, if_none_match)
     except Exception as e:
         raise HTTPException(
             status_code=500,
             detail=f"Error fetching graph data for substory {substory_id}: {str(e)}"
         )
 
-@app.get("/api/graph", response_model=dict)
-async def get_graph_by_path(graph_path: Optional[str] = None):
+@app.get("/api/graph", response_model=dict, dependencies=[Depends(limit_requests("graph"))])
+async def get_graph_by_path(graph_path: Optional[str] = None, if_none_match: Optional[str] = Header(None)):
     if not graph_path:
         raise HTTPException(status_code=400, detail="graph_path parameter is required")
 
     try:
-        graph_data = get_graph_data(graph_path=graph_path)
-        return graph_data.model_dump()
+        body, etag = await get_graph_payload_async(graph_path=graph_path)
+        return cached_json_response(body, etag, if_none_match)
     except Exception as e:
         raise HTTPException(
             status_code=500,
             detail=f"Error fetching graph data for path {graph_path}: {str(e)}"
         )
 
-@app.get("/api/graph/{substory_id}/country/{country_name}", response_model=dict)
+@app.get("/api/graph/{substory_id}/country/{country_name}", response_model=dict, dependencies=[Depends(limit_requests("graph"))])
 async def get_graph_by_substory_and_country(substory_id: str, country_name: str):
     """Get graph data for a section filtered by country"""
     try:
@@ -866,7 +1087,7 @@ async def get_graph_by_substory_and_country(substory_id: str, country_name: str)
         # For now, treat substory_id as section_query (same as get_graph_by_substory_id)
         section_query = substory_id
         
-        graph_data = get_graph_data_by_section_and_country(section_query, country_name)
+        graph_data = await run_in_threadpool(get_graph_data_by_section_and_country, section_query, country_name)
         return graph_data.model_dump()
     except Exception as e:
         raise HTTPException(
@@ -874,8 +1095,8 @@ async def get_graph_by_substory_and_country(substory_id: str, country_name: str)
             detail=f"Error fetching graph data for substory {substory_id} and country {country_name}: {str(e)}"
         )
 
-@app.get("/api/calendar", response_model=dict)
-async def get_calendar_by_section(section_query: Optional[str] = None, section_gid: Optional[str] = None, section_title: Optional[str] = None):
+@app.get("/api/calendar", response_model=dict, dependencies=[Depends(limit_requests("graph"))])
+async def get_calendar_by_section(section_query: Optional[str] = None, section_gid: Optional[str] = None, section_title: Optional[str] = None, if_none_match: Optional[str] = Header(None)):
     """Get calendar/timeline data for a section based on relationships with all nodes"""
     logger.info(f"Calendar endpoint called with section_query={section_query}, section_gid={section_gid}, section_title={section_title}")
     
@@ -885,13 +1106,12 @@ async def get_calendar_by_section(section_query: Optional[str] = None, section_g
     
     try:
         logger.debug(f"Fetching calendar data for section_query={section_query}")
-        calendar_data = get_calendar_data(
+        body, etag = await get_calendar_payload_async(
             section_gid=section_gid,
             section_query=section_query,
             section_title=section_title
         )
-        logger.info(f"Successfully retrieved calendar data: {len(calendar_data.get('calendar_items', []))} items")
-        return calendar_data
+        return cached_json_response(body, etag, if_none_match)
     except ValueError as e:
         logger.warning(f"Validation error in calendar endpoint: {str(e)}")
         raise HTTPException(status_code=400, detail=str(e))
@@ -903,7 +1123,7 @@ async def get_calendar_by_section(section_query: Optional[str] = None, section_g
         )
 
 
-@app.get("/api/cluster", response_model=dict)
+@app.get("/api/cluster", response_model=dict, dependencies=[Depends(limit_requests("graph"))])
 async def get_cluster_endpoint(
     node_type: str,
     property_key: str,
@@ -919,7 +1139,7 @@ async def get_cluster_endpoint(
     - `section_query`: optional filter to a section (matches `n.section`)
     """
     try:
-        return get_cluster_data(
+        return await get_cluster_data_async(
             node_type=node_type,
             property_key=property_key,
             section_query=section_query,
@@ -931,11 +1151,23 @@ async def get_cluster_endpoint(
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching cluster data: {str(e)}")
 
+@app.get("/api/stories/statistics", response_model=dict)
+async def get_all_story_statistics_endpoint(if_none_match: Optional[str] = Header(None)):
+    """Get statistics for all stories in one request, keyed by story id"""
+    try:
+        body, etag = await get_all_story_statistics_payload_async()
+        return cached_json_response(body, etag, if_none_match)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Error fetching story statistics: {str(e)}"
+        )
+
 @app.get("/api/stories/{story_id}/statistics", response_model=dict)
 async def get_story_statistics_endpoint(story_id: str):
     """Get statistics for a story (total nodes, entity count, etc.)"""
     try:
-        statistics = get_story_statistics(story_id)
+        statistics = await get_story_statistics_async(story_id)
         return statistics
     except Exception as e:
         raise HTTPException(
@@ -947,7 +1179,7 @@ async def get_story_statistics_endpoint(story_id: str):
 async def get_node_types():
     """Get all distinct node types from the database"""
     try:
-        node_types = get_all_node_types()
+        node_types = await run_in_threadpool(get_all_node_types)
         return node_types
     except Exception as e:
         raise HTTPException(
@@ -975,7 +1207,7 @@ async def get_entity_wikidata_by_name(entity_name: str):
         
         logger.info(f"API endpoint called - entity_name: '{entity_name}'")
         
-        result = get_entity_wikidata(entity_name.strip())
+        result = await run_in_threadpool(get_entity_wikidata, entity_name.strip())
         
         logger.info(f"API response - found: {result.get('found')}, has_data: {bool(result.get('data'))}")
         
@@ -1009,7 +1241,7 @@ async def search_entity_wikidata_endpoint(name: Optional[str] = None, q: Optiona
         # Limit the results to prevent abuse
         actual_limit = min(max(1, limit), 50)
         
-        result = search_entity_wikidata(search_term.strip(), actual_limit)
+        result = await run_in_threadpool(search_entity_wikidata, search_term.strip(), actual_limit)
         return result
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
@@ -1028,7 +1260,7 @@ class SummaryRequest(BaseModel):
     query: str  # User's question about the graph
     graphData: dict  # The current graph data with nodes and links
 
-@app.post("/api/ai/summary", response_model=dict)
+@app.post("/api/ai/summary", response_model=dict, dependencies=[Depends(limit_requests("ai"))])
 async def generate_ai_summary(request: SummaryRequest):
     """
     Generate an AI summary of graph data with embedded entity markers.
@@ -1045,7 +1277,9 @@ async def generate_ai_summary(request: SummaryRequest):
         
         from services import generate_graph_summary
         
-        summary_data = generate_graph_summary(
+        # GROK calls block for seconds; keep them off the event loop
+        summary_data = await run_in_threadpool(
+            generate_graph_summary,
             query=request.query.strip(),
             graph_data=request.graphData
         )
@@ -1061,13 +1295,13 @@ async def generate_ai_summary(request: SummaryRequest):
             detail=f"Error generating AI summary: {str(e)}"
         )
 
-@app.post("/api/ai/search", response_model=dict)
+@app.post("/api/ai/search", response_model=dict, dependencies=[Depends(limit_requests("ai"))])
 async def ai_search(search_query: SearchQuery):
     try:
         if not search_query.query or not search_query.query.strip():
             raise HTTPException(status_code=400, detail="Query parameter is required")
 
-        graph_data, generated_query = search_with_ai(search_query.query.strip())
+        graph_data, generated_query = await run_in_threadpool(search_with_ai, search_query.query.strip())
         return {
             "graphData": graph_data.model_dump(),
             "generatedQuery": generated_query
@@ -1080,13 +1314,13 @@ async def ai_search(search_query: SearchQuery):
             detail=f"Error performing AI search: {str(e)}"
         )
 
-@app.get("/api/ai/search", response_model=dict)
+@app.get("/api/ai/search", response_model=dict, dependencies=[Depends(limit_requests("ai"))])
 async def ai_search_get(query: str):
     try:
         if not query or not query.strip():
             raise HTTPException(status_code=400, detail="Query parameter is required")
 
-        graph_data, generated_query = search_with_ai(query.strip())
+        graph_data, generated_query = await run_in_threadpool(search_with_ai, query.strip())
         return {
             "graphData": graph_data.model_dump(),
             "generatedQuery": generated_query
@@ -1108,7 +1342,7 @@ class CreateNodeRequest(BaseModel):
     # Optional: attach this new node to the currently selected section (new DB uses :section gid -> gr_id).
     section_gid: Optional[str] = None
 
-@app.post("/api/cypher/execute", response_model=dict)
+@app.post("/api/cypher/execute", response_model=dict, dependencies=[Depends(limit_requests("cypher"))])
 async def execute_cypher_query(cypher_query: CypherQuery):
     try:
         if not cypher_query.query or not cypher_query.query.strip():
@@ -1120,7 +1354,16 @@ async def execute_cypher_query(cypher_query: CypherQuery):
         from database import db
 
         try:
-            results = db.execute_query(query)
+            results = await run_in_threadpool(db.execute_query, query)
+
+            # Ad-hoc queries may write to the graph: keep the membership keys of written nodes
+            # current (only missing/stale ones are touched), and drop cached section graphs
+            if re.search(r"\b(CREATE|MERGE|DELETE|SET|REMOVE)\b", query, re.IGNORECASE):
+                try:
+                    await run_in_threadpool(normalize_graph_keys, db)
+                except Exception as e:
+                    logger.error(f"Could not normalize membership keys after Cypher write: {e}")
+                graph_cache.clear()
             
             
             if results:
@@ -1203,6 +1446,25 @@ async def execute_cypher_query(cypher_query: CypherQuery):
                         return str(obj)
             
             serializable_results = [make_serializable(record) for record in results]
+
+            # Hide the internal :GraphMember label from schema results, merging the
+            # label combinations that become identical once it is removed.
+            if is_schema_query:
+                merged_results = {}
+                for record in serializable_results:
+                    if not isinstance(record, dict) or "nodeType" not in record:
+                        merged_results[id(record)] = record
+                        continue
+                    node_type = strip_member_label(record.get("nodeType"))
+                    if not node_type or node_type == ":":
+                        continue
+                    record["nodeType"] = node_type
+                    existing = merged_results.get(node_type)
+                    if existing is None:
+                        merged_results[node_type] = record
+                    elif isinstance(existing.get("properties"), list) and isinstance(record.get("properties"), list):
+                        existing["properties"] = list(dict.fromkeys(existing["properties"] + record["properties"]))
+                serializable_results = list(merged_results.values())
             
             response = {
                 "graphData": GraphData(nodes=[], links=[]).model_dump(),
@@ -1265,7 +1527,7 @@ async def create_node(node_request: CreateNodeRequest):
                 section_lookup = db.execute_query(
                     """
                     MATCH (s:section)
-                    WHERE toString(s.gid) = toString($gid)
+                    WHERE s.gid_key = $gid
                     RETURN s.`graph name` AS graph_name
                     LIMIT 1
                     """,
@@ -1296,6 +1558,13 @@ async def create_node(node_request: CreateNodeRequest):
             node_label = f"`{clean_category}`"
         else:
             node_label = clean_category
+
+        # Materialize the indexed gid_key/gr_key properties so the node shows up in section queries;
+        # section members also carry the :GraphMember label used by the gr_key index
+        membership_properties(properties, clean_category)
+        is_member = "gr_key" in properties and clean_category.lower() not in HIERARCHY_LABELS
+        if is_member:
+            node_label = f"{node_label}:{MEMBER_LABEL}"
         
         # Build property assignments
         # Property names with spaces need backticks in Cypher
@@ -1332,6 +1601,23 @@ async def create_node(node_request: CreateNodeRequest):
         # Execute write query
         try:
             results = db.execute_write_query(query, params)
+
+            # Keep the materialized section/chapter/story statistics current
+            if results and is_member:
+                try:
+                    apply_node_delta(
+                        db,
+                        properties.get("gr_key"),
+                        1,
+                        is_entity=clean_category.lower() == "entity",
+                        date=node_date(properties),
+                    )
+                except Exception as stats_error:
+                    logger.warning(f"[BACKEND] Could not update graph statistics: {stats_error}")
+
+            # Cached section graphs for this node's graph are now stale
+            graph_cache.invalidate_graph(properties.get("gr_key"))
+            graph_cache.invalidate_graph(STORIES_TAG)
             
             if not results or len(results) == 0:
                 raise HTTPException(
@@ -1468,8 +1754,14 @@ async def delete_node(node_request: DeleteNodeRequest):
            OR toString(id(n)) = $node_id
            OR (toFloat($node_id) IS NOT NULL AND id(n) = toInteger(toFloat($node_id)))
            OR elementId(n) = $node_id
+        // Remember which section graph the node belonged to (gr_id, or `graph name` for a section)
+        WITH n, toString(coalesce(n.gr_id, n.`graph name`)) AS graph_name,
+             CASE WHEN n:GraphMember THEN {
+               graph_name: n.gr_key,
+               is_entity: ANY(l IN labels(n) WHERE toLower(l) = 'entity')
+             } END AS member
         DETACH DELETE n
-        RETURN count(n) as deleted_count
+        RETURN count(n) as deleted_count, collect(DISTINCT graph_name) AS graph_names, collect(member) AS members
         """
         
         params = {"node_id": node_id_str}
@@ -1490,6 +1782,16 @@ async def delete_node(node_request: DeleteNodeRequest):
                 )
             
             deleted_count = results[0].get('deleted_count', 0)
+
+            for member in results[0].get('members') or []:
+                try:
+                    apply_node_delta(db, member.get('graph_name'), -1, is_entity=member.get('is_entity', False))
+                except Exception as stats_error:
+                    logger.warning(f"[BACKEND] Could not update graph statistics: {stats_error}")
+
+            for graph_name in results[0].get('graph_names') or []:
+                graph_cache.invalidate_graph(graph_name)
+            graph_cache.invalidate_graph(STORIES_TAG)
             
             logger.info(f"[BACKEND] Deleted count: {deleted_count}")
             
@@ -0,0 +1,284 @@
+"""
+Migration and maintenance script for monthly range partitions on user_activities.
+
+Analytics queries filter user_activities by timestamp, so partitioning by month lets
+Postgres prune everything outside the requested window and lets old months be
+dropped (or detached for archiving) instead of deleted row by row.
+
+Commands:
+    python migrate_activity_partitions.py convert     # one-off: convert the table, then maintain
+    python migrate_activity_partitions.py maintain    # create upcoming partitions, apply retention
+
+Options:
+    --months-ahead N       partitions to create ahead of the current month (default 3)
+    --retention-months N   keep this many months including the current one (default
+                           ACTIVITY_RETENTION_MONTHS, 0 = keep everything)
+    --archive              detach expired partitions (renamed *_archived) instead of dropping
+    --keep-legacy          convert: keep the old table as user_activities_legacy
+
+Run `maintain` from a monthly cron job. Rows written while maintenance lapsed land in
+user_activities_default; `maintain` creates their months and moves them out of it, so
+retention applies to them again. Dashboard statistics come from the rollup tables
+(migrate_activity_rollups.py), which are not affected by retention.
+"""
+import argparse
+import sys
+from datetime import date
+from neon_database import neon_db
+from config import Config
+from migrate_activity_user_refs import TRIGGER as USER_REF_TRIGGER, INDEXES as USER_REF_INDEXES
+import logging
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+PARTITION_PREFIX = "user_activities_p"
+
+PARTITIONED_TABLE = """
+CREATE TABLE user_activities (
+    id BIGINT NOT NULL DEFAULT nextval('user_activities_id_seq'),
+    user_id VARCHAR(255),
+    session_id VARCHAR(255) NOT NULL,
+    activity_type VARCHAR(100) NOT NULL,
+    page_url TEXT,
+    section_id VARCHAR(255),
+    section_title VARCHAR(500),
+    duration_seconds INTEGER,
+    metadata JSONB,
+    timestamp TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (id, timestamp)
+) PARTITION BY RANGE (timestamp);
+"""
+
+# Created on the parent, so every partition (present and future) gets them
+ACTIVITY_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_user_activities_timestamp ON user_activities(timestamp);",
+    "CREATE INDEX IF NOT EXISTS idx_user_activities_user_id_ts ON user_activities(user_id, timestamp DESC);",
+    "CREATE INDEX IF NOT EXISTS idx_user_activities_session_id_ts ON user_activities(session_id, timestamp DESC);",
+    "CREATE INDEX IF NOT EXISTS idx_user_activities_type_ts ON user_activities(activity_type, timestamp DESC);",
+    "CREATE INDEX IF NOT EXISTS idx_user_activities_section_id ON user_activities(section_id);",
+]
+
+def add_months(month_start: date, months: int) -> date:
+    """First day of the month `months` after `month_start`"""
+    index = month_start.year * 12 + (month_start.month - 1) + months
+    return date(index // 12, index % 12 + 1, 1)
+
+def partition_name(month_start: date) -> str:
+    return f"{PARTITION_PREFIX}{month_start.year:04d}{month_start.month:02d}"
+
+def is_partitioned() -> bool:
+    result = neon_db.execute_query("""
+    SELECT EXISTS (
+        SELECT 1 FROM pg_partitioned_table p
+        JOIN pg_class c ON c.oid = p.partrelid
+        WHERE c.relname = 'user_activities'
+    ) AS partitioned
+    """)
+    return bool(result and result[0].get('partitioned'))
+
+def create_partition_sql(month_start: date) -> str:
+    return (
+        f"CREATE TABLE IF NOT EXISTS {partition_name(month_start)} PARTITION OF user_activities "
+        f"FOR VALUES FROM ('{month_start.isoformat()}') TO ('{add_months(month_start, 1).isoformat()}');"
+    )
+
+def convert_to_partitioned(months_ahead: int, keep_legacy: bool = False):
+    """Replace user_activities with a partitioned copy (one transaction, table locked meanwhile)"""
+    with neon_db.connection() as connection:
+        connection.autocommit = False
+        with connection.cursor() as cursor:
+            cursor.execute("LOCK TABLE user_activities IN ACCESS EXCLUSIVE MODE;")
+            cursor.execute("SELECT date_trunc('month', MIN(timestamp))::date AS first_month FROM user_activities;")
+            first_month = cursor.fetchone()[0]
+            cursor.execute("""
+            SELECT COUNT(*) = 2 FROM information_schema.columns
+            WHERE table_name = 'user_activities' AND column_name IN ('user_ref_id', 'user_kind');
+            """)
+            has_user_refs = cursor.fetchone()[0]
+
+            cursor.execute("ALTER TABLE user_activities RENAME TO user_activities_legacy;")
+            cursor.execute("ALTER TABLE user_activities_legacy RENAME CONSTRAINT user_activities_pkey TO user_activities_legacy_pkey;")
+            # Keep the id sequence (and its current value) for the new table
+            cursor.execute("ALTER SEQUENCE user_activities_id_seq OWNED BY NONE;")
+            cursor.execute(PARTITIONED_TABLE)
+            cursor.execute("ALTER SEQUENCE user_activities_id_seq OWNED BY user_activities.id;")
+            cursor.execute("CREATE TABLE IF NOT EXISTS user_activities_default PARTITION OF user_activities DEFAULT;")
+            # Carry over the typed user references (migrate_activity_user_refs.py) if present
+            copied_columns = "id, user_id, session_id, activity_type, page_url, section_id, section_title, duration_seconds, metadata"
+            if has_user_refs:
+                cursor.execute("ALTER TABLE user_activities ADD COLUMN user_ref_id INTEGER, ADD COLUMN user_kind VARCHAR(10);")
+                for statement in USER_REF_TRIGGER:
+                    cursor.execute(statement)
+                copied_columns += ", user_ref_id, user_kind"
+
+            current_month = date.today().replace(day=1)
+            month = first_month or current_month
+            while month <= add_months(current_month, months_ahead):
+                cursor.execute(create_partition_sql(month))
+                month = add_months(month, 1)
+
+            if has_user_refs:
+                # The copy already has its references; don't let the trigger look them up again
+                cursor.execute("ALTER TABLE user_activities DISABLE TRIGGER trg_user_activities_user_ref;")
+            cursor.execute(f"""
+            INSERT INTO user_activities ({copied_columns}, timestamp)
+            SELECT {copied_columns}, COALESCE(timestamp, CURRENT_TIMESTAMP)
+            FROM user_activities_legacy;
+            """)
+            copied = cursor.rowcount
+            if has_user_refs:
+                cursor.execute("ALTER TABLE user_activities ENABLE TRIGGER trg_user_activities_user_ref;")
+
+            # Index names are schema-wide, so move the legacy indexes out of the way of the new ones
+            if keep_legacy:
+                cursor.execute("""
+                SELECT indexname FROM pg_indexes
+                WHERE tablename = 'user_activities_legacy' AND indexname LIKE 'idx_user_activities_%';
+                """)
+                for (index_name,) in cursor.fetchall():
+                    cursor.execute(f'ALTER INDEX "{index_name}" RENAME TO "{index_name}_legacy";')
+            else:
+                cursor.execute("DROP TABLE user_activities_legacy;")
+
+            for index_query in ACTIVITY_INDEXES + (USER_REF_INDEXES if has_user_refs else []):
+                cursor.execute(index_query)
+        connection.commit()
+    logger.info(f"✓ Converted user_activities to monthly partitions ({copied} rows copied)")
+
+def _months_in_default() -> list:
+    """Months that have rows in the default partition (written while no monthly partition existed)"""
+    if not neon_db.execute_query("SELECT to_regclass('user_activities_default') IS NOT NULL AS present")[0]['present']:
+        return []
+    rows = neon_db.execute_query("""
+    SELECT DISTINCT date_trunc('month', timestamp)::date AS month
+    FROM user_activities_default
+    ORDER BY month
+    """)
+    return [row['month'] for row in rows]
+
+def move_default_rows(month_start: date) -> int:
+    """
+    Create the partition for `month_start` when the default partition already holds rows for it.
+    Postgres refuses to add a partition whose range has rows in the default partition, so in one
+    transaction: detach the default, create the month, move its rows over, re-attach the default.
+    Inserts into user_activities wait for the transaction (ACCESS EXCLUSIVE lock on the parent).
+    """
+    name = partition_name(month_start)
+    bounds = (month_start, add_months(month_start, 1))
+    with neon_db.connection() as connection:
+        connection.autocommit = False
+        with connection.cursor() as cursor:
+            cursor.execute("ALTER TABLE user_activities DETACH PARTITION user_activities_default;")
+            cursor.execute(create_partition_sql(month_start))
+            cursor.execute(f"""
+            WITH moved AS (
+                DELETE FROM user_activities_default
+                WHERE timestamp >= %s AND timestamp < %s
+                RETURNING *
+            )
+            INSERT INTO {name} SELECT * FROM moved;
+            """, bounds)
+            moved = cursor.rowcount
+            cursor.execute("ALTER TABLE user_activities ATTACH PARTITION user_activities_default DEFAULT;")
+        connection.commit()
+    logger.info(f"✓ Created {name} and moved {moved} row(s) into it from user_activities_default")
+    return moved
+
+def ensure_future_partitions(months_ahead: int) -> int:
+    """
+    Create partitions for the current month and the next `months_ahead` months, plus any month
+    whose rows ended up in the default partition because maintenance lapsed
+    """
+    current_month = date.today().replace(day=1)
+    stranded = set(_months_in_default())
+    months = sorted(stranded | {add_months(current_month, offset) for offset in range(months_ahead + 1)})
+    for month in months:
+        try:
+            if month in stranded:
+                move_default_rows(month)
+            else:
+                neon_db.execute_write_query(create_partition_sql(month))
+        except Exception as e:
+            raise RuntimeError(
+                f"Could not create partition {partition_name(month)}: {e}. If user_activities_default holds "
+                f"rows for {month:%Y-%m}, move them manually: DETACH PARTITION user_activities_default, "
+                f"create {partition_name(month)}, move the month's rows into it, then ATTACH PARTITION "
+                "user_activities_default DEFAULT (in one transaction)."
+            ) from e
+    logger.info(f"✓ Partitions ensured through {partition_name(add_months(current_month, months_ahead))}")
+    return len(months)
+
+def apply_retention(retention_months: int, archive: bool = False) -> list:
+    """Drop (or detach) monthly partitions that end before the retention window"""
+    if retention_months <= 0:
+        logger.info("Retention disabled, keeping all partitions")
+        return []
+    cutoff = add_months(date.today().replace(day=1), -(retention_months - 1))
+    cutoff_name = partition_name(cutoff)
+    partitions = neon_db.execute_query("""
+    SELECT c.relname AS name
+    FROM pg_inherits i
+    JOIN pg_class c ON c.oid = i.inhrelid
+    JOIN pg_class p ON p.oid = i.inhparent
+    WHERE p.relname = 'user_activities' AND c.relname LIKE %s
+    ORDER BY c.relname
+    """, (f"{PARTITION_PREFIX}%",))
+
+    expired = [row['name'] for row in partitions if row['name'] < cutoff_name]
+    for name in expired:
+        if archive:
+            neon_db.execute_write_query(f"ALTER TABLE user_activities DETACH PARTITION {name};")
+            neon_db.execute_write_query(f"ALTER TABLE {name} RENAME TO {name}_archived;")
+            logger.info(f"✓ Detached {name} (archived as {name}_archived)")
+        else:
+            neon_db.execute_write_query(f"DROP TABLE {name};")
+            logger.info(f"✓ Dropped {name}")
+    return expired
+
+def main(command: str, months_ahead: int, retention_months: int, archive: bool, keep_legacy: bool):
+    """Convert and/or maintain the user_activities partitions"""
+
+    if not Config.NEON_DATABASE_URL:
+        logger.error("NEON_DATABASE_URL is not configured")
+        sys.exit(1)
+
+    try:
+        neon_db._connect()
+
+        if command == "convert":
+            if is_partitioned():
+                logger.info("user_activities is already partitioned, running maintenance only")
+            else:
+                convert_to_partitioned(months_ahead, keep_legacy=keep_legacy)
+        elif not is_partitioned():
+            logger.error("user_activities is not partitioned yet; run `python migrate_activity_partitions.py convert` first")
+            sys.exit(1)
+
+        ensure_future_partitions(months_ahead)
+        expired = apply_retention(retention_months, archive=archive)
+
+        logger.info("\n" + "=" * 60)
+        logger.info("✅ SUCCESS! user_activities partitions are up to date")
+        logger.info("=" * 60)
+        logger.info(f"Partitions ahead: {months_ahead} month(s)")
+        logger.info(f"Retention: {retention_months or 'unlimited'} month(s), {len(expired)} partition(s) {'archived' if archive else 'dropped'}")
+        logger.info("=" * 60)
+
+    except Exception as e:
+        logger.error(f"Error maintaining activity partitions: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+    finally:
+        neon_db.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Monthly partitions and retention for user_activities")
+    parser.add_argument("command", choices=["convert", "maintain"], help="convert the table once, or run maintenance")
+    parser.add_argument("--months-ahead", type=int, default=3, help="Future monthly partitions to create")
+    parser.add_argument("--retention-months", type=int, default=Config.ACTIVITY_RETENTION_MONTHS, help="Months of raw events to keep (0 = all)")
+    parser.add_argument("--archive", action="store_true", help="Detach expired partitions instead of dropping them")
+    parser.add_argument("--keep-legacy", action="store_true", help="Keep the unpartitioned table as user_activities_legacy")
+    args = parser.parse_args()
+    main(args.command, args.months_ahead, args.retention_months, args.archive, args.keep_legacy)
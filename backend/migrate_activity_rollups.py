@@ -0,0 +1,129 @@
+"""
+Migration script to create and backfill the activity rollup tables used by the admin dashboard.
+
+- activity_rollup_hourly: event count and total duration per hour, activity type and section
+- activity_daily_actors:  distinct users and sessions seen per day
+
+Once the tables exist, activity_service updates them in the same statement as every insert
+into user_activities. Re-running this script rebuilds both tables from user_activities
+(user_activities is locked against writes for the duration of the rebuild).
+
+Running backends only notice new tables every ROLLUP_CHECK_INTERVAL seconds, so on the
+first run the backfill waits that long; after it, every insert is counted exactly once.
+
+Usage:
+    python migrate_activity_rollups.py              # create tables and backfill
+    python migrate_activity_rollups.py --no-backfill
+"""
+import argparse
+import sys
+import time
+from neon_database import neon_db
+from activity_service import ROLLUP_CHECK_INTERVAL
+from config import Config
+import logging
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+CREATE_TABLES = [
+    """
+    CREATE TABLE IF NOT EXISTS activity_rollup_hourly (
+        bucket TIMESTAMP NOT NULL,
+        activity_type VARCHAR(100) NOT NULL,
+        section_title VARCHAR(500) NOT NULL DEFAULT '',
+        events BIGINT NOT NULL DEFAULT 0,
+        duration_seconds BIGINT NOT NULL DEFAULT 0,
+        PRIMARY KEY (bucket, activity_type, section_title)
+    );
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS activity_daily_actors (
+        day DATE NOT NULL,
+        actor_kind VARCHAR(10) NOT NULL,
+        actor_id VARCHAR(255) NOT NULL,
+        PRIMARY KEY (day, actor_kind, actor_id)
+    );
+    """,
+]
+
+BACKFILL_STATEMENTS = [
+    "LOCK TABLE user_activities IN SHARE MODE;",
+    "TRUNCATE activity_rollup_hourly, activity_daily_actors;",
+    """
+    INSERT INTO activity_rollup_hourly (bucket, activity_type, section_title, events, duration_seconds)
+    SELECT date_trunc('hour', timestamp), activity_type, COALESCE(section_title, ''),
+           COUNT(*), COALESCE(SUM(duration_seconds), 0)
+    FROM user_activities
+    WHERE timestamp IS NOT NULL
+    GROUP BY 1, 2, 3;
+    """,
+    """
+    INSERT INTO activity_daily_actors (day, actor_kind, actor_id)
+    SELECT DISTINCT timestamp::date, 'user', user_id
+    FROM user_activities
+    WHERE timestamp IS NOT NULL AND user_id IS NOT NULL
+    UNION
+    SELECT DISTINCT timestamp::date, 'session', session_id
+    FROM user_activities
+    WHERE timestamp IS NOT NULL;
+    """,
+]
+
+def migrate_activity_rollups(backfill: bool = True):
+    """Create the activity rollup tables and rebuild them from user_activities"""
+
+    if not Config.NEON_DATABASE_URL:
+        logger.error("NEON_DATABASE_URL is not configured")
+        sys.exit(1)
+
+    try:
+        neon_db._connect()
+
+        existing = neon_db.execute_query("SELECT to_regclass('activity_rollup_hourly') IS NOT NULL AS exists")
+        created = not (existing and existing[0].get('exists'))
+
+        for statement in CREATE_TABLES:
+            neon_db.execute_write_query(statement)
+        logger.info("✓ Rollup tables created")
+
+        if backfill and created:
+            # Let running backends start maintaining the rollups before rebuilding them
+            logger.info(f"Waiting {ROLLUP_CHECK_INTERVAL}s for running backends to pick up the new tables...")
+            time.sleep(ROLLUP_CHECK_INTERVAL + 5)
+
+        if backfill:
+            logger.info("Backfilling rollups from user_activities...")
+            # One transaction, so concurrent inserts wait instead of being counted twice or missed
+            with neon_db.connection() as connection:
+                connection.autocommit = False
+                with connection.cursor() as cursor:
+                    for statement in BACKFILL_STATEMENTS:
+                        cursor.execute(statement)
+                connection.commit()
+
+            counts = neon_db.execute_query("""
+            SELECT (SELECT COUNT(*) FROM activity_rollup_hourly) AS hourly_rows,
+                   (SELECT COUNT(*) FROM activity_daily_actors) AS actor_rows
+            """)
+            logger.info(f"✓ Backfilled {counts[0]['hourly_rows']} hourly rows and {counts[0]['actor_rows']} daily actor rows")
+
+        logger.info("\n" + "=" * 60)
+        logger.info("✅ SUCCESS! Activity rollups are ready")
+        logger.info("=" * 60)
+        logger.info("Dashboard statistics will now be read from the rollup tables")
+        logger.info("=" * 60)
+
+    except Exception as e:
+        logger.error(f"Error creating activity rollups: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+    finally:
+        neon_db.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Create and backfill activity rollup tables")
+    parser.add_argument("--no-backfill", action="store_true", help="Only create the tables")
+    args = parser.parse_args()
+    migrate_activity_rollups(backfill=not args.no_backfill)
@@ -0,0 +1,128 @@
+"""
+Migration script adding a typed user reference to user_activities.
+
+user_activities.user_id is the free-form string sent by the tracking client, so joining it
+to users/admin_users needs CAST(u.id AS VARCHAR), which rules out the primary key indexes.
+This adds:
+
+- user_ref_id: INTEGER id of the user the event belongs to
+- user_kind:   'user' (users table) or 'admin' (admin_users table)
+
+A BEFORE INSERT trigger fills both columns for new events (ids are looked up in users
+first, then admin_users, matching the previous COALESCE order), and existing events are
+backfilled here. activity_service joins on (user_kind, user_ref_id) once the columns exist.
+
+Usage:
+    python migrate_activity_user_refs.py
+"""
+import sys
+from neon_database import neon_db
+from config import Config
+import logging
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+ADD_COLUMNS = """
+ALTER TABLE user_activities
+    ADD COLUMN IF NOT EXISTS user_ref_id INTEGER,
+    ADD COLUMN IF NOT EXISTS user_kind VARCHAR(10);
+"""
+
+TRIGGER_FUNCTION = """
+CREATE OR REPLACE FUNCTION set_activity_user_ref() RETURNS trigger AS $$
+BEGIN
+    NEW.user_ref_id := NULL;
+    NEW.user_kind := NULL;
+    -- At most 9 digits, so the cast can't overflow INTEGER
+    IF NEW.user_id ~ '^[0-9]{1,9}$' THEN
+        IF EXISTS (SELECT 1 FROM users WHERE id = NEW.user_id::integer) THEN
+            NEW.user_ref_id := NEW.user_id::integer;
+            NEW.user_kind := 'user';
+        ELSIF EXISTS (SELECT 1 FROM admin_users WHERE id = NEW.user_id::integer) THEN
+            NEW.user_ref_id := NEW.user_id::integer;
+            NEW.user_kind := 'admin';
+        END IF;
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+TRIGGER = [
+    "DROP TRIGGER IF EXISTS trg_user_activities_user_ref ON user_activities;",
+    """
+    CREATE TRIGGER trg_user_activities_user_ref
+    BEFORE INSERT ON user_activities
+    FOR EACH ROW EXECUTE FUNCTION set_activity_user_ref();
+    """,
+]
+
+# Only rows the trigger hasn't seen; users take precedence over admin_users
+BACKFILL = [
+    ("users", """
+    UPDATE user_activities ua
+    SET user_ref_id = u.id, user_kind = 'user'
+    FROM users u
+    WHERE ua.user_kind IS NULL AND ua.user_id = CAST(u.id AS VARCHAR);
+    """),
+    ("admin_users", """
+    UPDATE user_activities ua
+    SET user_ref_id = au.id, user_kind = 'admin'
+    FROM admin_users au
+    WHERE ua.user_kind IS NULL AND ua.user_id = CAST(au.id AS VARCHAR);
+    """),
+]
+
+INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_user_activities_user_ref ON user_activities(user_kind, user_ref_id);",
+]
+
+def migrate_activity_user_refs():
+    """Add, populate and index user_activities.user_ref_id / user_kind"""
+
+    if not Config.NEON_DATABASE_URL:
+        logger.error("NEON_DATABASE_URL is not configured")
+        sys.exit(1)
+
+    try:
+        neon_db._connect()
+
+        logger.info("Adding user_ref_id and user_kind columns...")
+        neon_db.execute_write_query(ADD_COLUMNS)
+        logger.info("✓ Columns added")
+
+        # Install the trigger before backfilling so no insert falls between the two
+        neon_db.execute_write_query(TRIGGER_FUNCTION)
+        for statement in TRIGGER:
+            neon_db.execute_write_query(statement)
+        logger.info("✓ Insert trigger installed")
+
+        for source, statement in BACKFILL:
+            logger.info(f"Backfilling references to {source}...")
+            with neon_db.connection() as connection:
+                with connection.cursor() as cursor:
+                    cursor.execute(statement)
+                    logger.info(f"✓ {cursor.rowcount} activities linked to {source}")
+
+        for index_query in INDEXES:
+            logger.info(f"Creating index: {index_query[:60]}...")
+            neon_db.execute_write_query(index_query)
+        logger.info("✓ All indexes created")
+
+        logger.info("\n" + "=" * 60)
+        logger.info("✅ SUCCESS! user_activities has typed user references")
+        logger.info("=" * 60)
+        logger.info("Admin activity listings now join users by primary key")
+        logger.info("=" * 60)
+
+    except Exception as e:
+        logger.error(f"Error migrating activity user references: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+    finally:
+        neon_db.close()
+
+if __name__ == "__main__":
+    migrate_activity_user_refs()
@@ -0,0 +1,55 @@
+"""
+Migration script to bootstrap the Neo4j schema used by the section queries.
+
+Creates range indexes and materializes the string membership keys (gid_key, gr_key)
+plus the :GraphMember label. Safe to run repeatedly; only stale nodes are rewritten.
+
+Usage:
+    python migrate_graph_schema.py                 # indexes + key normalization
+    python migrate_graph_schema.py --indexes-only  # only create indexes
+    python migrate_graph_schema.py --batch-size 5000
+"""
+import argparse
+import sys
+from database import db
+from config import Config
+from graph_schema import bootstrap_graph_schema, DEFAULT_BATCH_SIZE
+import logging
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def migrate_graph_schema(batch_size: int = DEFAULT_BATCH_SIZE, indexes_only: bool = False):
+    """Create graph indexes and normalize membership keys in Neo4j"""
+
+    try:
+        Config.validate()
+    except ValueError as e:
+        logger.error(str(e))
+        sys.exit(1)
+
+    try:
+        counts = bootstrap_graph_schema(db, batch_size=batch_size, indexes_only=indexes_only)
+
+        logger.info("\n" + "=" * 60)
+        logger.info("✅ SUCCESS! Graph schema bootstrapped")
+        logger.info("=" * 60)
+        logger.info("Indexes ensured on :section, :story, :chapter and :GraphMember")
+        for step_name, updated in counts.items():
+            logger.info(f"  - {step_name}: {updated} node(s) updated")
+        logger.info("=" * 60)
+
+    except Exception as e:
+        logger.error(f"Error bootstrapping graph schema: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bootstrap Neo4j indexes and membership keys")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Nodes updated per transaction")
+    parser.add_argument("--indexes-only", action="store_true", help="Only create indexes, skip key normalization")
+    args = parser.parse_args()
+    migrate_graph_schema(batch_size=args.batch_size, indexes_only=args.indexes_only)
@@ -77,6 +77,36 @@ def create_subscription_tables():
         );
         """
         
+        # processing_started_at: set when a worker claims a submission (re-queues abandoned jobs)
+        # file_sha256: hash of the uploaded file, computed while streaming it to disk
+        # nodes_count, links_count, error_message: listing columns, so listings never read processing_result
+        submissions_worker_columns = """
+        ALTER TABLE submissions ADD COLUMN IF NOT EXISTS processing_started_at TIMESTAMP;
+        ALTER TABLE submissions ADD COLUMN IF NOT EXISTS file_sha256 VARCHAR(64);
+        ALTER TABLE submissions ADD COLUMN IF NOT EXISTS nodes_count INTEGER;
+        ALTER TABLE submissions ADD COLUMN IF NOT EXISTS links_count INTEGER;
+        ALTER TABLE submissions ADD COLUMN IF NOT EXISTS error_message TEXT;
+        """
+        
+        # Fill the listing columns of submissions processed before they existed
+        submissions_summary_backfill = """
+        UPDATE submissions
+        SET nodes_count = CASE WHEN processing_result ? 'nodes_count' THEN (processing_result->>'nodes_count')::int END,
+            links_count = CASE WHEN processing_result ? 'links_count' THEN (processing_result->>'links_count')::int END,
+            error_message = left(processing_result->>'error', 500)
+        WHERE processing_result IS NOT NULL
+          AND nodes_count IS NULL AND links_count IS NULL AND error_message IS NULL;
+        """
+        
+        # Completed processing results by content fingerprint (see submission_results.py)
+        submission_results_query = """
+        CREATE TABLE IF NOT EXISTS submission_results (
+            fingerprint VARCHAR(80) PRIMARY KEY,
+            processing_result JSONB NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+        """
+        
         # Create rate_limit_tracking table
         rate_limit_tracking_query = """
         CREATE TABLE IF NOT EXISTS rate_limit_tracking (
@@ -90,15 +120,43 @@ def create_subscription_tables():
         );
         """
         
+        # Monthly request counters, incremented by rate_limit_service.record_request
+        rate_limit_monthly_usage_query = """
+        CREATE TABLE IF NOT EXISTS rate_limit_monthly_usage (
+            user_id INTEGER NOT NULL,
+            month DATE NOT NULL,
+            request_count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (user_id, month),
+            FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
+        );
+        """
+        
+        # Seed the current month's counters from the tracking table (only raises existing counts)
+        rate_limit_monthly_usage_backfill = """
+        INSERT INTO rate_limit_monthly_usage AS m (user_id, month, request_count)
+        SELECT user_id, date_trunc('month', request_timestamp)::date, COUNT(*)
+        FROM rate_limit_tracking
+        WHERE request_timestamp >= date_trunc('month', timezone('UTC', now()))
+        GROUP BY 1, 2
+        ON CONFLICT (user_id, month) DO UPDATE SET request_count = GREATEST(m.request_count, EXCLUDED.request_count);
+        """
+        
         # Create indexes
         indexes = [
             "CREATE INDEX IF NOT EXISTS idx_users_subscription_tier ON users(subscription_tier);",
             "CREATE INDEX IF NOT EXISTS idx_submissions_user_id ON submissions(user_id);",
             "CREATE INDEX IF NOT EXISTS idx_submissions_status ON submissions(status);",
+            "CREATE INDEX IF NOT EXISTS idx_submissions_queue ON submissions(created_at, id) WHERE status IN ('pending', 'processing');",
+            "CREATE INDEX IF NOT EXISTS idx_submissions_file_sha256 ON submissions(file_sha256) WHERE file_sha256 IS NOT NULL;",
             "CREATE INDEX IF NOT EXISTS idx_submissions_created_at ON submissions(created_at);",
             "CREATE INDEX IF NOT EXISTS idx_rate_limit_user_id ON rate_limit_tracking(user_id);",
             "CREATE INDEX IF NOT EXISTS idx_rate_limit_timestamp ON rate_limit_tracking(request_timestamp);",
-            "CREATE INDEX IF NOT EXISTS idx_rate_limit_user_timestamp ON rate_limit_tracking(user_id, request_timestamp);"
+            "CREATE INDEX IF NOT EXISTS idx_rate_limit_user_timestamp ON rate_limit_tracking(user_id, request_timestamp);",
+            # Keyset pagination of the admin listings on (created_at, id)
+            "CREATE INDEX IF NOT EXISTS idx_submissions_created_id ON submissions(created_at DESC, id DESC);",
+            "CREATE INDEX IF NOT EXISTS idx_submissions_user_created_id ON submissions(user_id, created_at DESC, id DESC);",
+            "CREATE INDEX IF NOT EXISTS idx_users_created_id ON users(created_at DESC, id DESC);",
+            "CREATE INDEX IF NOT EXISTS idx_admin_users_created_id ON admin_users(created_at DESC, id DESC);"
         ]
         
         logger.info("Adding subscription columns to users table...")
@@ -111,12 +169,23 @@ def create_subscription_tables():
         
         logger.info("Creating submissions table...")
         neon_db.execute_query(submissions_table_query)
+        neon_db.execute_query(submissions_worker_columns)
+        neon_db.execute_query(submissions_summary_backfill)
         logger.info("✓ submissions table created")
         
+        logger.info("Creating submission_results table...")
+        neon_db.execute_query(submission_results_query)
+        logger.info("✓ submission_results table created")
+        
         logger.info("Creating rate_limit_tracking table...")
         neon_db.execute_query(rate_limit_tracking_query)
         logger.info("✓ rate_limit_tracking table created")
         
+        logger.info("Creating rate_limit_monthly_usage table...")
+        neon_db.execute_query(rate_limit_monthly_usage_query)
+        neon_db.execute_query(rate_limit_monthly_usage_backfill)
+        logger.info("✓ rate_limit_monthly_usage table created")
+        
         for index_query in indexes:
             logger.info(f"Creating index: {index_query[:60]}...")
             neon_db.execute_query(index_query)
@@ -130,7 +199,9 @@ def create_subscription_tables():
         logger.info("  - users.subscription_tier, subscription_status, etc.")
         logger.info("  - admin_users.subscription_tier")
         logger.info("  - submissions")
+        logger.info("  - submission_results")
         logger.info("  - rate_limit_tracking")
+        logger.info("  - rate_limit_monthly_usage")
         logger.info("=" * 60)
         
     except Exception as e:
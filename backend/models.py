@@ -185,6 +185,22 @@ class SubmissionResponse(BaseModel):
     created_at: datetime
     processed_at: Optional[datetime] = None
 
+class SubmissionSummary(BaseModel):
+    """Listing projection of a submission; the result is fetched from /api/submissions/{id}"""
+    id: str
+    user_id: str
+    submission_type: str
+    input_url: Optional[str] = None
+    file_name: Optional[str] = None
+    file_size: Optional[int] = None
+    status: str
+    nodes_count: Optional[int] = None
+    links_count: Optional[int] = None
+    error_message: Optional[str] = None
+    tags: Optional[List[str]] = []
+    created_at: datetime
+    processed_at: Optional[datetime] = None
+
 class SubmissionUpdateRequest(BaseModel):
     subscription_tier: Optional[str] = None
     subscription_status: Optional[str] = None
@@ -1,9 +1,17 @@
 """
 Neon PostgreSQL Database Handler
-Handles connections to Neon PostgreSQL for entity wikidata queries.
+Handles pooled connections to Neon PostgreSQL for users, activity, subscriptions and wikidata.
+
+psycopg2 connections must not be shared between threads, so every call checks a
+connection out of a bounded pool, runs on its own cursor and returns the connection.
+Callers wait (up to NEON_POOL_TIMEOUT seconds) when all connections are in use.
 """
+import threading
+from contextlib import contextmanager
 import psycopg2
-from psycopg2.extras import RealDictCursor
+from psycopg2 import extensions
+from psycopg2.extras import RealDictCursor, execute_values
+from psycopg2.pool import ThreadedConnectionPool
 from config import Config
 import logging
 import time
@@ -14,58 +22,159 @@ logger = logging.getLogger(__name__)
 class NeonDatabase:
     """
     Database handler for Neon PostgreSQL connections.
-    Provides connection management and query execution with retry logic.
+    Provides a bounded connection pool and query execution with retry logic.
     """
 
     def __init__(self):
-        self.connection = None
+        self.pool = None
         self._initialized = False
+        self._pool_lock = threading.Lock()
+        self._slots = None
+        # id(connection) -> time it was last returned, used to decide when to ping on checkout
+        self._last_used = {}
+        self._metrics_lock = threading.Lock()
+        self._checked_out = 0
+        self._checkouts = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._timeouts = 0
+        self._discarded = 0
 
     def _connect(self):
-        """Establish connection to Neon PostgreSQL"""
-        try:
-            # Close existing connection if any
-            if self.connection:
-                try:
-                    self.connection.close()
-                except:
-                    pass
-                self.connection = None
-                self._initialized = False
+        """Create the connection pool to Neon PostgreSQL, unless another caller already did"""
+        with self._pool_lock:
+            if self._initialized and self.pool and not self.pool.closed:
+                # Built by a concurrent caller while we waited for the lock
+                return
+            try:
+                # Only a closed or half-initialized pool gets here
+                self._close_pool()
 
-            if not Config.NEON_DATABASE_URL:
-                raise ValueError("NEON_DATABASE_URL is not configured")
-
-            logger.info("Connecting to Neon PostgreSQL...")
-            self.connection = psycopg2.connect(
-                Config.NEON_DATABASE_URL,
-                sslmode='require',
-                connect_timeout=30
-            )
-            # Set autocommit for read queries
-            self.connection.autocommit = True
-            logger.info("Successfully connected to Neon PostgreSQL")
-            self._initialized = True
-        except Exception as e:
-            logger.error(f"Failed to connect to Neon PostgreSQL: {e}")
-            raise
+                if not Config.NEON_DATABASE_URL:
+                    raise ValueError("NEON_DATABASE_URL is not configured")
+
+                logger.info(f"Connecting to Neon PostgreSQL (pool size {Config.NEON_POOL_MIN_SIZE}-{Config.NEON_POOL_MAX_SIZE})...")
+                self.pool = ThreadedConnectionPool(
+                    Config.NEON_POOL_MIN_SIZE,
+                    Config.NEON_POOL_MAX_SIZE,
+                    Config.NEON_DATABASE_URL,
+                    sslmode='require',
+                    connect_timeout=30
+                )
+                # ThreadedConnectionPool raises instead of waiting when exhausted; the semaphore bounds waiting
+                self._slots = threading.BoundedSemaphore(Config.NEON_POOL_MAX_SIZE)
+                self._last_used = {}
+                logger.info("Successfully connected to Neon PostgreSQL")
+                self._initialized = True
+            except Exception as e:
+                logger.error(f"Failed to connect to Neon PostgreSQL: {e}")
+                raise
 
     def _ensure_connected(self):
-        """Ensure database is connected before executing queries"""
-        if not self._initialized or not self.connection or self.connection.closed:
+        """Ensure the pool exists before checking out connections"""
+        if not self._initialized or not self.pool or self.pool.closed:
             self._connect()
 
-    def _check_connection(self):
-        """Check if connection is still alive"""
+    def _is_healthy(self, connection):
+        """Checkout health check: drop closed/broken connections, ping ones that sat idle"""
+        if connection.closed:
+            return False
+        status = connection.get_transaction_status()
+        if status == extensions.TRANSACTION_STATUS_UNKNOWN:
+            return False
+        if status != extensions.TRANSACTION_STATUS_IDLE:
+            try:
+                connection.rollback()
+            except Exception:
+                return False
+        last_used = self._last_used.get(id(connection))
+        if last_used is None or time.monotonic() - last_used < Config.NEON_POOL_PING_AFTER:
+            # Freshly opened or recently used
+            return True
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            return True
+        except Exception as e:
+            logger.warning(f"Pooled connection failed health check: {e}")
+            return False
+
+    def _checkout(self):
+        """Check a healthy connection out of the pool, waiting for a free slot if needed"""
+        self._ensure_connected()
+        pool, slots = self.pool, self._slots
+
+        start = time.monotonic()
+        if not slots.acquire(timeout=Config.NEON_POOL_TIMEOUT):
+            with self._metrics_lock:
+                self._timeouts += 1
+            raise Exception(f"Timed out after {Config.NEON_POOL_TIMEOUT}s waiting for a Neon PostgreSQL connection")
+        waited = time.monotonic() - start
+
+        try:
+            connection = pool.getconn()
+            while not self._is_healthy(connection):
+                self._last_used.pop(id(connection), None)
+                pool.putconn(connection, close=True)
+                with self._metrics_lock:
+                    self._discarded += 1
+                connection = pool.getconn()
+            if not connection.autocommit:
+                # Autocommit for both reads and single-statement writes
+                connection.autocommit = True
+        except Exception:
+            slots.release()
+            raise
+
+        with self._metrics_lock:
+            self._checked_out += 1
+            self._checkouts += 1
+            self._wait_total += waited
+            self._wait_max = max(self._wait_max, waited)
+        return pool, slots, connection
+
+    def _release(self, pool, slots, connection, discard=False):
+        """Return a connection to the pool it came from (closing it if broken)"""
         try:
-            if self.connection and not self.connection.closed:
-                # Try a simple query to verify connection
-                with self.connection.cursor() as cursor:
-                    cursor.execute("SELECT 1")
-                return True
+            if discard:
+                self._last_used.pop(id(connection), None)
+            else:
+                self._last_used[id(connection)] = time.monotonic()
+            if pool.closed:
+                connection.close()
+            else:
+                pool.putconn(connection, close=discard or bool(connection.closed))
+            if discard:
+                with self._metrics_lock:
+                    self._discarded += 1
         except Exception as e:
-            logger.warning(f"Connection check failed: {e}")
-        return False
+            logger.warning(f"Error returning connection to pool: {e}")
+        finally:
+            slots.release()
+            with self._metrics_lock:
+                self._checked_out -= 1
+
+    @contextmanager
+    def connection(self):
+        """
+        Check out a pooled connection for several statements (e.g. an explicit transaction).
+        Connections are in autocommit mode; set `autocommit = False` and commit yourself if needed.
+        """
+        pool, slots, connection = self._checkout()
+        discard = False
+        try:
+            yield connection
+        except (psycopg2.OperationalError, psycopg2.InterfaceError):
+            discard = True
+            raise
+        finally:
+            if not discard and not connection.closed and not connection.autocommit:
+                try:
+                    connection.rollback()
+                    connection.autocommit = True
+                except Exception:
+                    discard = True
+            self._release(pool, slots, connection, discard=discard)
 
     def execute_query(self, query, parameters=None):
         """
@@ -78,18 +187,16 @@ class NeonDatabase:
 
         for attempt in range(max_retries):
             try:
-                self._ensure_connected()
-                
-                with self.connection.cursor(cursor_factory=RealDictCursor) as cursor:
-                    cursor.execute(query, parameters or ())
-                    if cursor.description:
-                        return cursor.fetchall()
-                    return []
+                with self.connection() as connection:
+                    with connection.cursor(cursor_factory=RealDictCursor) as cursor:
+                        cursor.execute(query, parameters or ())
+                        if cursor.description:
+                            return cursor.fetchall()
+                        return []
             except (psycopg2.OperationalError, psycopg2.InterfaceError) as e:
-                # Connection-related errors, try to reconnect
+                # Connection-related errors: the broken connection was discarded, retry on a fresh one
                 last_error = e
                 logger.warning(f"Connection error on attempt {attempt + 1}/{max_retries}: {e}")
-                self._initialized = False
                 if attempt < max_retries - 1:
                     time.sleep(1 * (attempt + 1))  # Exponential backoff
                     continue
@@ -104,7 +211,7 @@ class NeonDatabase:
         error_msg = f"Query execution failed after {max_retries} attempts: {last_error}"
         logger.error(error_msg)
         raise Exception(error_msg)
-    
+
     def execute_write_query(self, query, parameters=None):
         """
         Execute a write query (INSERT, UPDATE, DELETE).
@@ -112,18 +219,51 @@ class NeonDatabase:
         """
         return self.execute_query(query, parameters)
 
-    def close(self):
-        """Close database connection"""
-        if self.connection:
+    def execute_values(self, query, rows, template=None, page_size=1000, fetch=False):
+        """
+        Multi-row INSERT via psycopg2's execute_values (`query` contains a single `VALUES %s`).
+        Runs once, without retries, since a failed batch may already have been written.
+        """
+        if not rows:
+            return []
+        with self.connection() as connection:
+            with connection.cursor(cursor_factory=RealDictCursor) as cursor:
+                result = execute_values(cursor, query, rows, template=template, page_size=page_size, fetch=fetch)
+                return result or []
+
+    def metrics(self):
+        """Pool usage metrics for /health"""
+        with self._metrics_lock:
+            return {
+                "initialized": self._initialized,
+                "min_size": Config.NEON_POOL_MIN_SIZE,
+                "max_size": Config.NEON_POOL_MAX_SIZE,
+                "checked_out": self._checked_out,
+                "checkouts": self._checkouts,
+                "wait_time_total_ms": round(self._wait_total * 1000, 1),
+                "wait_time_avg_ms": round(self._wait_total * 1000 / self._checkouts, 2) if self._checkouts else 0,
+                "wait_time_max_ms": round(self._wait_max * 1000, 1),
+                "timeouts": self._timeouts,
+                "discarded": self._discarded,
+            }
+
+    def _close_pool(self):
+        # Caller holds _pool_lock
+        if self.pool:
             try:
-                self.connection.close()
-                logger.info("Neon PostgreSQL connection closed")
+                self.pool.closeall()
+                logger.info("Neon PostgreSQL connection pool closed")
             except Exception as e:
-                logger.warning(f"Error closing Neon connection: {e}")
+                logger.warning(f"Error closing Neon connection pool: {e}")
             finally:
-                self.connection = None
+                self.pool = None
                 self._initialized = False
 
+    def close(self):
+        """Close all pooled connections"""
+        with self._pool_lock:
+            self._close_pool()
+
     def is_configured(self):
         """Check if Neon database is configured"""
         return bool(Config.NEON_DATABASE_URL)
@@ -131,5 +271,3 @@ class NeonDatabase:
 
 # Singleton instance
 neon_db = NeonDatabase()
-
-
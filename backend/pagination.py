@@ -0,0 +1,45 @@
+"""
+Keyset (cursor) pagination helpers for the admin listing endpoints.
+
+Listings are ordered by (created_at, id) descending. Instead of an OFFSET, a page asks
+for the rows strictly after the last row of the previous page, which Postgres answers
+with an index range scan no matter how deep the page is.
+
+The cursor is the last row's sort key, JSON encoded as URL-safe base64. Endpoints
+return it in the X-Next-Cursor header while there may be more rows.
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Optional
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(created_at, row_id, *extra) -> str:
+    """Encode a sort key (created_at as datetime or ISO string, id, optional tie-breakers)"""
+    if isinstance(created_at, datetime):
+        created_at = created_at.isoformat()
+    payload = json.dumps([created_at, str(row_id), *extra], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple:
+    """Decode a cursor into (created_at, id, *extra); raises ValueError if it is malformed"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return (datetime.fromisoformat(values[0]), int(values[1]), *values[2:])
+    except (ValueError, TypeError, IndexError, KeyError) as e:
+        raise ValueError(f"Invalid pagination cursor: {cursor}") from e
+
+
+def next_cursor(items: list, limit: int, *fields: str) -> Optional[str]:
+    """Cursor pointing after the last item of a full page, None when the page was the last one"""
+    if not items or len(items) < limit:
+        return None
+    last = items[-1]
+    values = [last.get(field) if isinstance(last, dict) else getattr(last, field, None) for field in fields]
+    if values[0] is None or values[1] is None:
+        return None
+    return encode_cursor(*values)
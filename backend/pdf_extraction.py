@@ -0,0 +1,188 @@
+"""
+PDF text extraction for submissions
+
+Kept free of database and service imports so it can run in worker processes
+(see submission_worker.py) without initializing connections there.
+
+Pages are extracted in ranges of PAGES_PER_TASK. With an executor (a process pool),
+ranges are parsed in parallel and consumed in page order; extraction stops as soon as
+MAX_TEXT_CHARS characters have been collected. Extracted text is cached on disk by the
+file's SHA-256, so resubmitting the same PDF skips parsing entirely; entries older than the
+result TTL are pruned by the submission worker (prune_text_cache).
+"""
+from collections import deque
+from concurrent.futures import BrokenExecutor, CancelledError, Executor, Future
+from typing import Callable, Iterator, List, Optional, Tuple
+import hashlib
+import logging
+import os
+import tempfile
+import time
+import PyPDF2
+import pdfplumber
+
+logger = logging.getLogger(__name__)
+
+# Only this much text is used for a submission
+MAX_TEXT_CHARS = 50000
+PAGES_PER_TASK = 8
+TEXT_CACHE_DIR = os.path.join(os.path.dirname(__file__), "uploads", ".text_cache")
+
+
+def file_sha256(file_path: str) -> str:
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as file:
+        for chunk in iter(lambda: file.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def count_pages(file_path: str) -> int:
+    """Number of pages (reads only the page tree)"""
+    try:
+        with open(file_path, 'rb') as file:
+            return len(PyPDF2.PdfReader(file).pages)
+    except Exception as e:
+        logger.warning(f"PyPDF2 could not read the page tree, trying pdfplumber: {e}")
+        with pdfplumber.open(file_path) as pdf:
+            return len(pdf.pages)
+
+
+def extract_page_range(file_path: str, start: int, end: int) -> List[str]:
+    """
+    Text of pages [start, end) (0-based), one string per page.
+    Runs in worker processes; falls back to PyPDF2 for this range only if pdfplumber fails.
+    """
+    try:
+        # pdfplumber page numbers are 1-based
+        with pdfplumber.open(file_path, pages=list(range(start + 1, end + 1))) as pdf:
+            return [page.extract_text() or "" for page in pdf.pages]
+    except Exception as e:
+        logger.warning(f"pdfplumber failed on pages {start + 1}-{end}, trying PyPDF2: {e}")
+        with open(file_path, 'rb') as file:
+            reader = PyPDF2.PdfReader(file)
+            return [reader.pages[index].extract_text() or "" for index in range(start, min(end, len(reader.pages)))]
+
+
+def _ranges_in_order(file_path: str, ranges: List[Tuple[int, int]], executor: Optional[Executor], max_in_flight: int) -> Iterator[List[str]]:
+    """Yield each range's page texts in order, keeping up to `max_in_flight` ranges running ahead"""
+    if executor is None:
+        for start, end in ranges:
+            yield extract_page_range(file_path, start, end)
+        return
+
+    pending = deque()
+    remaining = iter(ranges)
+    try:
+        while True:
+            while len(pending) < max_in_flight:
+                next_range = next(remaining, None)
+                if next_range is None:
+                    break
+                try:
+                    future = executor.submit(extract_page_range, file_path, *next_range)
+                except RuntimeError:
+                    # Pool shut down mid-job (app stopping): parse this range here
+                    future = Future()
+                    future.set_result(extract_page_range(file_path, *next_range))
+                pending.append(future)
+            if not pending:
+                return
+            yield pending.popleft().result()
+    finally:
+        # Early stop (or error): don't parse pages nobody will read
+        for future in pending:
+            future.cancel()
+
+
+def _read_cache(digest: str) -> Optional[str]:
+    try:
+        with open(os.path.join(TEXT_CACHE_DIR, f"{digest}.txt"), 'r', encoding='utf-8') as file:
+            return file.read()
+    except OSError:
+        return None
+
+
+def _write_cache(digest: str, text: str):
+    try:
+        os.makedirs(TEXT_CACHE_DIR, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=TEXT_CACHE_DIR, suffix=".tmp")
+        with os.fdopen(fd, 'w', encoding='utf-8') as file:
+            file.write(text)
+        os.replace(temp_path, os.path.join(TEXT_CACHE_DIR, f"{digest}.txt"))
+    except OSError as e:
+        logger.warning(f"Could not cache extracted PDF text: {e}")
+
+
+def prune_text_cache(max_age_seconds: float) -> int:
+    """Remove cached texts written more than `max_age_seconds` ago; returns the number removed"""
+    cutoff = time.time() - max_age_seconds
+    removed = 0
+    try:
+        entries = list(os.scandir(TEXT_CACHE_DIR))
+    except OSError:
+        return 0
+    for entry in entries:
+        try:
+            if entry.is_file() and entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+                removed += 1
+        except OSError:
+            # Removed concurrently, or still being written
+            pass
+    return removed
+
+
+def extract_text_from_pdf(
+    file_path: str,
+    file_sha256_hex: Optional[str] = None,
+    executor: Optional[Executor] = None,
+    max_in_flight: int = 4,
+    on_progress: Optional[Callable[[int, int], None]] = None
+) -> Tuple[str, Optional[str]]:
+    """
+    Extract text content from a PDF file
+    Returns (text_content, error_message)
+
+    `executor` parses page ranges in parallel (e.g. a ProcessPoolExecutor);
+    `on_progress(pages_done, total_pages)` is called as ranges complete.
+    CancelledError / BrokenExecutor from the executor are raised rather than reported as errors.
+    """
+    try:
+        digest = file_sha256_hex or file_sha256(file_path)
+        cached = _read_cache(digest)
+        if cached is not None:
+            logger.info(f"Using cached text for PDF {os.path.basename(file_path)}")
+            return cached, None
+
+        total_pages = count_pages(file_path)
+        ranges = [(start, min(start + PAGES_PER_TASK, total_pages)) for start in range(0, total_pages, PAGES_PER_TASK)]
+
+        parts: List[str] = []
+        length = 0
+        pages_done = 0
+        chunks = _ranges_in_order(file_path, ranges, executor, max_in_flight)
+        try:
+            for page_texts in chunks:
+                for page_text in page_texts:
+                    if page_text:
+                        parts.append(page_text)
+                        length += len(page_text) + 1
+                pages_done += len(page_texts)
+                if on_progress:
+                    on_progress(pages_done, total_pages)
+                if length >= MAX_TEXT_CHARS:
+                    logger.info(f"Stopped PDF extraction after {pages_done}/{total_pages} pages (text budget reached)")
+                    break
+        finally:
+            chunks.close()
+
+        text_content = "\n".join(parts)[:MAX_TEXT_CHARS]
+        _write_cache(digest, text_content)
+        return text_content, None
+    except (CancelledError, BrokenExecutor):
+        # The executor was shut down or died; the caller decides whether to retry
+        raise
+    except Exception as e:
+        logger.error(f"Error extracting text from PDF {file_path}: {e}")
+        return "", str(e)
@@ -1,5 +1,33 @@
 from typing import Optional, Tuple
 
+# Section membership uses the materialized, indexed keys created by graph_schema.py:
+#   (:section).gid_key = toString(gid), (:section).gr_key = toString(`graph name`)
+#   (:GraphMember).gr_key = toString(gr_id)
+# Compare against those keys directly (never wrapped in toString()) so the planner can seek
+# the range indexes instead of scanning every node.
+
+def _section_match_clause(section_gid: Optional[str] = None, section_query: Optional[str] = None, section_title: Optional[str] = None) -> Tuple[str, dict]:
+    """Build an index-backed MATCH for a section identified by gid, query string or title"""
+    if section_gid:
+        # URL supplies gid as string; gid_key holds the canonical string form.
+        return "MATCH (section:section) WHERE section.gid_key = $section_gid", {"section_gid": str(section_gid)}
+    elif section_query:
+        # Backwards/compat: treat section_query as section.gid (string), or try matching common section name fields.
+        return """
+        MATCH (section:section)
+        WHERE section.gid_key = $section_query
+           OR section.`Section Name` = $section_query
+           OR section.`graph name` = $section_query
+        """, {"section_query": str(section_query)}
+    elif section_title:
+        # New DB uses `Section Name` / `graph name` instead of Section_Title
+        return """
+        MATCH (section:section)
+        WHERE section.`Section Name` = $section_title
+           OR section.`graph name` = $section_title
+        """, {"section_title": section_title}
+    raise ValueError("At least one of section_gid, section_query, or section_title must be provided")
+
 def get_all_stories_query():
     """Query to fetch all stories with their chapters and sections.
 
@@ -33,7 +61,8 @@ def get_all_stories_query():
              chapter_number: chapter_number,
              chapter_title: coalesce(chapter.`Chapter Name`, toString(chapter.gid)),
              sections: sections,
-             total_nodes: 0
+             // Materialized by graph_statistics.py (0 until statistics are rebuilt)
+             total_nodes: coalesce(chapter.stat_total_nodes, 0)
          }) AS chapters_raw
     WITH story, story_number,
          [c IN chapters_raw WHERE c.gid IS NOT NULL | c] AS chapters_filtered
@@ -63,7 +92,7 @@ def get_story_by_id_query(story_id: str):
     """
     return """
     MATCH (story:story)
-    WHERE toString(story.gid) = $story_id
+    WHERE story.gid_key = $story_id
        OR story.`Story Name` = $story_id
        OR toString(story.`Story Number`) = $story_id
        OR toString(story.`Story Number_new`) = $story_id
@@ -95,7 +124,7 @@ def get_story_by_id_query(story_id: str):
         story_brief: "",
         chapters: [c IN chapters WHERE c.gid IS NOT NULL ORDER BY c.chapter_number]
     } AS story
-    """, {"story_id": story_id}
+    """, {"story_id": str(story_id)}
 
 def get_graph_data_by_section_query(section_gid: Optional[str] = None, section_query: Optional[str] = None, section_title: Optional[str] = None) -> Tuple[str, dict]:
     """
@@ -107,84 +136,56 @@ def get_graph_data_by_section_query(section_gid: Optional[str] = None, section_q
       * Section has: `graph name` property (with space)
       * Other nodes have: `gr_id` property
     - When a section is clicked, return all nodes where `node.gr_id == section.graph name`
-    - Return all relationships between those nodes
+      (compared through the indexed `gr_key` properties materialized by graph_schema.py)
+    - Return all relationships between those nodes, expanded from the collected node set
+      with a directed match so each relationship is returned exactly once
+    - `graph_name` is returned alongside so callers can key caches by the section graph
     """
     
-    # Build the match clause based on what parameter was provided
-    if section_gid:
-        # URL supplies gid as string; compare via toString() for type safety.
-        match_clause = "MATCH (section:section) WHERE toString(section.gid) = toString($section_gid)"
-        params = {"section_gid": section_gid}
-    elif section_query:
-        # Backwards/compat: treat section_query as section.gid (string), or try matching common section name fields.
-        match_clause = """
-        MATCH (section:section)
-        WHERE toString(section.gid) = toString($section_query)
-           OR section.`Section Name` = $section_query
-           OR section.`graph name` = $section_query
-        """
-        params = {"section_query": section_query}
-    elif section_title:
-        # New DB uses `Section Name` / `graph name` instead of Section_Title
-        match_clause = """
-        MATCH (section:section)
-        WHERE section.`Section Name` = $section_title
-           OR section.`graph name` = $section_title
-        """
-        params = {"section_title": section_title}
-    else:
-        raise ValueError("At least one of section_gid, section_query, or section_title must be provided")
+    match_clause, params = _section_match_clause(section_gid, section_query, section_title)
     
     query = f"""
     {match_clause}
-    // Get the section's `graph name` - this is the key that matches other nodes' gr_id
-    WITH section, toString(section.`graph name`) AS section_graph_name
-
-    // Collect all nodes where node.gr_id == section.`graph name` (excluding story/chapter/section hierarchy)
-    MATCH (node)
-    WHERE toString(node.gr_id) = section_graph_name
-      AND NONE(l IN labels(node) WHERE toLower(l) IN ['story','chapter','section'])
-    WITH section_graph_name, COLLECT(DISTINCT node) AS all_nodes
-
-    // Collect relationships between nodes in this section's graph
-    // Only include relationships where BOTH endpoints have the same gr_id
-    MATCH (a)-[rel]-(b)
-    WHERE toString(a.gr_id) = section_graph_name
-      AND toString(b.gr_id) = section_graph_name
-      AND NONE(l IN labels(a) WHERE toLower(l) IN ['story','chapter','section'])
-      AND NONE(l IN labels(b) WHERE toLower(l) IN ['story','chapter','section'])
-    WITH all_nodes,
-         COLLECT(DISTINCT {{
-           rel: rel,
-           from: a,
-           to: b,
-           type: type(rel)
-         }}) AS all_rels
+    // Get the section's `graph name` key - this is the key that matches other nodes' gr_key
+    WITH section, section.gr_key AS section_graph_name
+
+    // Collect all nodes where node.gr_key == section.gr_key (:GraphMember excludes story/chapter/section hierarchy)
+    MATCH (node:GraphMember)
+    WHERE node.gr_key = section_graph_name
+    WITH section_graph_name, COLLECT(node) AS all_nodes
+
+    // Expand relationships only from the collected nodes. The match is directed so each
+    // relationship is found once (from its start node) and needs no DISTINCT; the end
+    // node must belong to the same section, checked against the indexed gr_key.
+    UNWIND CASE WHEN size(all_nodes) = 0 THEN [null] ELSE all_nodes END AS a
+    OPTIONAL MATCH (a)-[rel]->(b:GraphMember)
+    WHERE b.gr_key = section_graph_name
+    WITH section_graph_name, all_nodes, COLLECT(rel) AS all_rels
 
     RETURN {{
       nodes: [n IN all_nodes | n {{
         .*,
         elementId: elementId(n),
-        labels: labels(n),
-        node_type: head(labels(n))
+        labels: [l IN labels(n) WHERE l <> 'GraphMember'],
+        node_type: head([l IN labels(n) WHERE l <> 'GraphMember'])
       }}],
-      links: [rd IN all_rels | {{
-        gid: coalesce(toString(rd.rel.gid), elementId(rd.rel)),
-        elementId: elementId(rd.rel),
-        type: rd.type,
+      links: [rel IN all_rels | {{
+        gid: coalesce(toString(rel.gid), elementId(rel)),
+        elementId: elementId(rel),
+        type: type(rel),
         // Ensure link endpoints match node ids (gid preferred, fallback to elementId)
-        from_gid: coalesce(toString(rd.from.gid), elementId(rd.from)),
-        to_gid: coalesce(toString(rd.to.gid), elementId(rd.to)),
-        from_labels: labels(rd.from),
-        to_labels: labels(rd.to),
+        from_gid: coalesce(toString(startNode(rel).gid), elementId(startNode(rel))),
+        to_gid: coalesce(toString(endNode(rel).gid), elementId(endNode(rel))),
+        from_labels: [l IN labels(startNode(rel)) WHERE l <> 'GraphMember'],
+        to_labels: [l IN labels(endNode(rel)) WHERE l <> 'GraphMember'],
         // Common fields consumed by the frontend
-        relationship_summary: coalesce(rd.rel.summary, rd.rel.`Relationship Summary`, rd.rel.`Relationship Summary_new`, rd.rel.name, rd.rel.text),
-        article_title: coalesce(rd.rel.title, rd.rel.`Article Title`, rd.rel.`Source Title`),
-        article_url: coalesce(rd.rel.url, rd.rel.`Article URL`, rd.rel.`article URL`, rd.rel.`Source URL`),
-        relationship_date: coalesce(rd.rel.date, rd.rel.`Date`, rd.rel.`Relationship Date`),
-        properties: properties(rd.rel)
+        relationship_summary: coalesce(rel.summary, rel.`Relationship Summary`, rel.`Relationship Summary_new`, rel.name, rel.text),
+        article_title: coalesce(rel.title, rel.`Article Title`, rel.`Source Title`),
+        article_url: coalesce(rel.url, rel.`Article URL`, rel.`article URL`, rel.`Source URL`),
+        relationship_date: coalesce(rel.date, rel.`Date`, rel.`Relationship Date`),
+        properties: properties(rel)
       }}]
-    }} AS graphData
+    }} AS graphData, section_graph_name AS graph_name
     """
     
     return query, params
@@ -204,7 +205,7 @@ def get_cluster_data_query(
       We match it against actual Neo4j labels using a normalized comparison:
         replace(toLower(label), ' ', '_') == node_type  OR  toLower(label) == node_type
     - `property_key` is the Neo4j property name to cluster by.
-    - Optionally filters to a section via `n.section = section_query` if provided.
+    - Optionally filters to a section's members (`n.gr_key = section.gr_key`) if `section_query` is provided.
 
     Returns a dict shape:
       {
@@ -213,25 +214,27 @@ def get_cluster_data_query(
       }
     """
 
-    query = """
-    // Resolve section filter to section.`graph name` if provided.
-    WITH $section_query AS section_query
-    OPTIONAL MATCH (sec:section)
-    WHERE section_query IS NOT NULL
-      AND (
-        toString(sec.gid) = toString(section_query)
-        OR sec.`Section Name` = section_query
-        OR sec.`graph name` = section_query
-      )
-    WITH section_query, toString(sec.`graph name`) AS section_graph_name
-
+    if section_query:
+        # Resolve section filter to section.gr_key and seek members through the gr_key index.
+        match_clause = """
+    MATCH (sec:section)
+    WHERE sec.gid_key = $section_key
+       OR sec.`Section Name` = $section_query
+       OR sec.`graph name` = $section_query
+    WITH DISTINCT sec.gr_key AS section_graph_name
+    MATCH (n:GraphMember)
+    WHERE n.gr_key = section_graph_name
+      AND ANY(l IN labels(n) WHERE replace(toLower(l), ' ', '_') = $node_type OR toLower(l) = $node_type)
+      AND n[$property_key] IS NOT NULL
+    """
+    else:
+        match_clause = """
     MATCH (n)
     WHERE ANY(l IN labels(n) WHERE replace(toLower(l), ' ', '_') = $node_type OR toLower(l) = $node_type)
       AND n[$property_key] IS NOT NULL
-      AND (
-        section_query IS NULL
-        OR toString(n.gr_id) = section_graph_name
-      )
+    """
+
+    query = match_clause + """
     WITH n, toString(n[$property_key]) AS propVal
     WITH propVal,
          collect(DISTINCT {
@@ -267,6 +270,7 @@ def get_cluster_data_query(
         "node_type": node_type,
         "property_key": property_key,
         "section_query": section_query,
+        "section_key": str(section_query) if section_query is not None else None,
         "cluster_limit": cluster_limit,
         "node_limit": node_limit,
     }
@@ -277,7 +281,7 @@ def get_section_by_id_query(section_gid: str):
     """Get section details by gid"""
     return """
     MATCH (section:section)
-    WHERE toString(section.gid) = toString($section_gid)
+    WHERE section.gid_key = $section_gid
     OPTIONAL MATCH (chapter:chapter)-[:chapter_section]-(section)
     RETURN {
         gid: section.gid,
@@ -291,7 +295,7 @@ def get_section_by_id_query(section_gid: str):
             chapter_title: coalesce(chapter.`Chapter Name`, toString(chapter.gid))
         }
     } AS section
-    """, {"section_gid": section_gid}
+    """, {"section_gid": str(section_gid)}
 
 def get_graph_data_by_section_and_country_query(section_query: str, country_name: str) -> Tuple[str, dict]:
     """
@@ -306,58 +310,51 @@ def get_graph_data_by_section_and_country_query(section_query: str, country_name
     
     query = """
     MATCH (section:section)
-    WHERE toString(section.gid) = toString($section_query)
+    WHERE section.gid_key = $section_query
        OR section.`Section Name` = $section_query
        OR section.`graph name` = $section_query
-    WITH section, toString(section.`graph name`) AS section_graph_name
+    WITH section, section.gr_key AS section_graph_name
 
-    // Find the country node(s) matching the country name where country.gr_id = section.`graph name`
-    MATCH (country)
-    WHERE toString(country.gr_id) = section_graph_name
+    // Find the country node(s) matching the country name where country.gr_key = section.gr_key
+    MATCH (country:GraphMember)
+    WHERE country.gr_key = section_graph_name
       AND ANY(l IN labels(country) WHERE toLower(l) = 'country')
       AND toLower(coalesce(country.name, country.`Country Name`, country.`Country Name_new`, '')) = toLower($country_name)
 
-    // Collect nodes within 2 hops of the country (with the same gr_id)
-    MATCH (country)-[*0..2]-(n)
-    WHERE toString(n.gr_id) = section_graph_name
-      AND NONE(l IN labels(n) WHERE toLower(l) IN ['story','chapter','section'])
-    WITH COLLECT(DISTINCT n) AS all_nodes
-
-    MATCH (a)-[rel]-(b)
-    WHERE a IN all_nodes AND b IN all_nodes
-      AND NONE(l IN labels(a) WHERE toLower(l) IN ['story','chapter','section'])
-      AND NONE(l IN labels(b) WHERE toLower(l) IN ['story','chapter','section'])
-    WITH all_nodes,
-         COLLECT(DISTINCT {
-           rel: rel,
-           from: a,
-           to: b,
-           type: type(rel)
-         }) AS all_rels
+    // Collect nodes within 2 hops of the country (with the same gr_key)
+    MATCH (country)-[*0..2]-(n:GraphMember)
+    WHERE n.gr_key = section_graph_name
+    WITH section_graph_name, COLLECT(DISTINCT n) AS all_nodes
+
+    // Expand relationships from the collected nodes only (directed: one row per relationship)
+    UNWIND CASE WHEN size(all_nodes) = 0 THEN [null] ELSE all_nodes END AS a
+    OPTIONAL MATCH (a)-[rel]->(b:GraphMember)
+    WHERE b.gr_key = section_graph_name AND b IN all_nodes
+    WITH all_nodes, COLLECT(rel) AS all_rels
 
     RETURN {
       nodes: [n IN all_nodes | n {
         .*,
         elementId: elementId(n),
-        labels: labels(n),
-        node_type: head(labels(n))
+        labels: [l IN labels(n) WHERE l <> 'GraphMember'],
+        node_type: head([l IN labels(n) WHERE l <> 'GraphMember'])
       }],
-      links: [rd IN all_rels | {
-        gid: coalesce(toString(rd.rel.gid), elementId(rd.rel)),
-        elementId: elementId(rd.rel),
-        type: rd.type,
-        from_gid: coalesce(toString(rd.from.gid), elementId(rd.from)),
-        to_gid: coalesce(toString(rd.to.gid), elementId(rd.to)),
-        relationship_summary: coalesce(rd.rel.summary, rd.rel.`Relationship Summary`, rd.rel.name, rd.rel.text),
-        article_title: coalesce(rd.rel.title, rd.rel.`Article Title`),
-        article_url: coalesce(rd.rel.url, rd.rel.`Article URL`, rd.rel.`article URL`),
-        relationship_date: coalesce(rd.rel.date, rd.rel.`Date`, rd.rel.`Relationship Date`),
-        properties: properties(rd.rel)
+      links: [rel IN all_rels | {
+        gid: coalesce(toString(rel.gid), elementId(rel)),
+        elementId: elementId(rel),
+        type: type(rel),
+        from_gid: coalesce(toString(startNode(rel).gid), elementId(startNode(rel))),
+        to_gid: coalesce(toString(endNode(rel).gid), elementId(endNode(rel))),
+        relationship_summary: coalesce(rel.summary, rel.`Relationship Summary`, rel.name, rel.text),
+        article_title: coalesce(rel.title, rel.`Article Title`),
+        article_url: coalesce(rel.url, rel.`Article URL`, rel.`article URL`),
+        relationship_date: coalesce(rel.date, rel.`Date`, rel.`Relationship Date`),
+        properties: properties(rel)
       }]
     } AS graphData
     """
 
-    params = {"section_query": section_query, "country_name": country_name}
+    params = {"section_query": str(section_query), "country_name": country_name}
     return query, params
 
 def get_calendar_data_by_section_query(section_gid: Optional[str] = None, section_query: Optional[str] = None, section_title: Optional[str] = None) -> Tuple[str, dict]:
@@ -373,35 +370,15 @@ def get_calendar_data_by_section_query(section_gid: Optional[str] = None, sectio
     """
     
     # Build the match clause based on what parameter was provided (new DB: section_query treated as section.gid)
-    if section_gid:
-        match_clause = "MATCH (section:section) WHERE toString(section.gid) = toString($section_gid)"
-        params = {"section_gid": section_gid}
-    elif section_query:
-        match_clause = """
-        MATCH (section:section)
-        WHERE toString(section.gid) = toString($section_query)
-           OR section.`Section Name` = $section_query
-           OR section.`graph name` = $section_query
-        """
-        params = {"section_query": section_query}
-    elif section_title:
-        match_clause = """
-        MATCH (section:section)
-        WHERE section.`Section Name` = $section_title
-           OR section.`graph name` = $section_title
-        """
-        params = {"section_title": section_title}
-    else:
-        raise ValueError("At least one of section_gid, section_query, or section_title must be provided")
+    match_clause, params = _section_match_clause(section_gid, section_query, section_title)
     
     query = f"""
     {match_clause}
-    WITH section, toString(section.`graph name`) AS section_graph_name
+    WITH section, section.gr_key AS section_graph_name
 
-    // Timeline items: nodes with a usable date and/or event-like labels, where node.gr_id = section.`graph name`
-    MATCH (n)
-    WHERE toString(n.gr_id) = section_graph_name
-      AND NONE(l IN labels(n) WHERE toLower(l) IN ['story','chapter','section'])
+    // Timeline items: nodes with a usable date and/or event-like labels, where node.gr_key = section.gr_key
+    MATCH (n:GraphMember)
+    WHERE n.gr_key = section_graph_name
       AND (
         ANY(l IN labels(n) WHERE toLower(l) IN ['action','process','result','event_attend','funding','relationship'])
         OR coalesce(n.date, n.`Date`, n.`Relationship Date`, n.`Action Date`, n.`Process Date`, n.`Disb Date`) IS NOT NULL
@@ -409,40 +386,37 @@ def get_calendar_data_by_section_query(section_gid: Optional[str] = None, sectio
     WITH section, section_graph_name,
          COLLECT(DISTINCT {{
            gid: coalesce(toString(n.gid), elementId(n)),
-           node_type: head(labels(n)),
+           node_type: head([l IN labels(n) WHERE l <> 'GraphMember']),
            date: coalesce(n.date, n.`Date`, n.`Relationship Date`, n.`Action Date`, n.`Process Date`, n.`Disb Date`),
            name: coalesce(n.title, n.name, n.`Article Title`, n.summary, toString(n.gid)),
            description: coalesce(n.summary, n.`Summary`, n.text, ""),
            properties: n {{ .* }}
          }}) AS timeline_items
 
-    // Floating items: everything else in the section with matching gr_id (non-hierarchy nodes)
-    MATCH (f)
-    WHERE toString(f.gr_id) = section_graph_name
-      AND NONE(l IN labels(f) WHERE toLower(l) IN ['story','chapter','section'])
+    // Floating items: everything else in the section with matching gr_key (non-hierarchy nodes)
+    MATCH (f:GraphMember)
+    WHERE f.gr_key = section_graph_name
     WITH section, section_graph_name, timeline_items,
          COLLECT(DISTINCT {{
            gid: coalesce(toString(f.gid), elementId(f)),
-           node_type: head(labels(f)),
+           node_type: head([l IN labels(f) WHERE l <> 'GraphMember']),
            name: coalesce(f.title, f.name, f.`Article Title`, f.summary, toString(f.gid)),
            description: coalesce(f.summary, f.`Summary`, f.text, ""),
            properties: f {{ .* }}
          }}) AS floating_items
 
-    // Relationships: between all nodes inside this section (by gr_id)
-    MATCH (source)-[rel]-(target)
-    WHERE toString(source.gr_id) = section_graph_name
-      AND toString(target.gr_id) = section_graph_name
-      AND NONE(l IN labels(source) WHERE toLower(l) IN ['story','chapter','section'])
-      AND NONE(l IN labels(target) WHERE toLower(l) IN ['story','chapter','section'])
-    WITH section, timeline_items, floating_items,
+    // Relationships: between all nodes inside this section (by gr_key)
+    MATCH (source:GraphMember)-[rel]-(target:GraphMember)
+    WHERE source.gr_key = section_graph_name
+      AND target.gr_key = section_graph_name
+    WITH section, section_graph_name, timeline_items, floating_items,
          COLLECT(DISTINCT {{
            gid: coalesce(toString(rel.gid), elementId(rel)),
            type: type(rel),
            source_gid: coalesce(toString(source.gid), elementId(source)),
            target_gid: coalesce(toString(target.gid), elementId(target)),
-           source_type: head(labels(source)),
-           target_type: head(labels(target)),
+           source_type: head([l IN labels(source) WHERE l <> 'GraphMember']),
+           target_type: head([l IN labels(target) WHERE l <> 'GraphMember']),
            date: coalesce(rel.date, rel.`Date`, rel.`Relationship Date`),
            properties: rel {{ .* }}
          }}) AS relationships
@@ -453,33 +427,30 @@ def get_calendar_data_by_section_query(section_gid: Optional[str] = None, sectio
       timeline_items: timeline_items,
       floating_items: floating_items,
       relationships: relationships
-    }} AS calendarData
+    }} AS calendarData, section_graph_name AS graph_name
     """
     
     return query, params
 
-def get_story_statistics_query(story_gid: Optional[str] = None, story_title: Optional[str] = None):
-    """Get statistics for a story: total nodes, entity count, etc."""
-    if story_gid:
-        match_clause = "MATCH (story:story) WHERE toString(story.gid) = toString($story_gid)"
-        params = {"story_gid": story_gid}
-    elif story_title:
-        match_clause = "MATCH (story:story) WHERE story.`Story Name` = $story_title"
-        params = {"story_title": story_title}
-    else:
-        raise ValueError("Either story_gid or story_title must be provided")
+def get_story_statistics_query(story_id: str):
+    """
+    Get statistics for a story: total nodes, entity count, etc.
+    The story is matched by gid or title in one query, preferring an exact gid match.
+    """
+    match_clause = """MATCH (story:story) WHERE story.gid_key = $story_id OR story.`Story Name` = $story_id
+    WITH story ORDER BY CASE WHEN story.gid_key = $story_id THEN 0 ELSE 1 END LIMIT 1"""
+    params = {"story_id": str(story_id)}
     
     query = f"""
     {match_clause}
     OPTIONAL MATCH (story)-[:story_chapter]-(chapter:chapter)
     OPTIONAL MATCH (chapter)-[:chapter_section]-(section:section)
     WITH story,
-         COLLECT(DISTINCT toString(section.`graph name`)) AS section_graph_names
+         COLLECT(DISTINCT section.gr_key) AS section_graph_names
     WITH story, [g IN section_graph_names WHERE g IS NOT NULL AND g <> ""] AS section_graph_names
 
-    MATCH (n)
-    WHERE toString(n.gr_id) IN section_graph_names
-      AND NONE(l IN labels(n) WHERE toLower(l) IN ['story','chapter','section'])
+    OPTIONAL MATCH (n:GraphMember)
+    WHERE n.gr_key IN section_graph_names
     WITH story,
          COUNT(DISTINCT n) AS total_nodes,
          COUNT(DISTINCT CASE WHEN ANY(l IN labels(n) WHERE toLower(l) = 'entity') THEN coalesce(toString(n.gid), elementId(n)) ELSE null END) AS entity_count,
@@ -497,19 +468,86 @@ def get_story_statistics_query(story_gid: Optional[str] = None, story_title: Opt
     
     return query, params
 
+def get_materialized_story_statistics_query(story_id: Optional[str] = None) -> Tuple[str, dict]:
+    """
+    Read the statistics materialized on :story nodes (see graph_statistics.py).
+
+    With `story_id`, matches a single story by gid or title in one query; otherwise returns
+    every story. `materialized` is false for stories whose statistics were never built,
+    so callers can fall back to the live queries below.
+    """
+    if story_id:
+        match_clause = "MATCH (story:story) WHERE story.gid_key = $story_id OR story.`Story Name` = $story_id"
+        # Prefer an exact gid match over a title match
+        order_clause = "ORDER BY CASE WHEN story.gid_key = $story_id THEN 0 ELSE 1 END"
+        params = {"story_id": str(story_id)}
+    else:
+        match_clause = "MATCH (story:story)"
+        order_clause = ""
+        params = {}
+
+    query = f"""
+    {match_clause}
+    RETURN {{
+      story_gid: story.gid,
+      story_title: coalesce(story.`Story Name`, toString(story.gid)),
+      total_nodes: coalesce(story.stat_total_nodes, 0),
+      entity_count: coalesce(story.stat_entity_count, 0),
+      highlighted_nodes: 0,
+      updated_date: story.stat_updated_date,
+      materialized: story.stat_total_nodes IS NOT NULL
+    }} AS statistics
+    {order_clause}
+    """
+
+    return query, params
+
+def get_all_story_statistics_query():
+    """
+    Live statistics for every story in one grouped pass (replaces one statistics query per story).
+    Used when the materialized statistics have not been built yet.
+
+    Each story's section graph keys are collected, then member nodes are matched through
+    the indexed gr_key and aggregated per story.
+    """
+    return """
+    MATCH (story:story)
+    OPTIONAL MATCH (story)-[:story_chapter]-(chapter:chapter)
+    OPTIONAL MATCH (chapter)-[:chapter_section]-(section:section)
+    WITH story,
+         [g IN COLLECT(DISTINCT section.gr_key) WHERE g <> ""] AS section_graph_names
+
+    // Stories without sections still produce a row (with zero counts)
+    UNWIND CASE WHEN size(section_graph_names) = 0 THEN [null] ELSE section_graph_names END AS section_graph_name
+    OPTIONAL MATCH (n:GraphMember)
+    WHERE n.gr_key = section_graph_name
+    WITH story,
+         COUNT(DISTINCT n) AS total_nodes,
+         COUNT(DISTINCT CASE WHEN ANY(l IN labels(n) WHERE toLower(l) = 'entity') THEN coalesce(toString(n.gid), elementId(n)) ELSE null END) AS entity_count,
+         MAX(coalesce(n.date, n.`Date`, n.`Relationship Date`, n.`Action Date`, n.`Process Date`, n.`Disb Date`)) AS updated_date
+
+    RETURN {
+      story_gid: story.gid,
+      story_title: coalesce(story.`Story Name`, toString(story.gid)),
+      total_nodes: total_nodes,
+      entity_count: entity_count,
+      highlighted_nodes: 0,
+      updated_date: updated_date
+    } AS statistics
+    """
+
 def get_all_node_types_query():
     """Query to fetch all distinct node types (labels) from the database"""
     # Use a query that finds all distinct labels by checking actual nodes
     # This is more reliable than CALL db.labels() which may not work in all Neo4j versions
     query = """
     // New DB: return normalized label names for nodes that participate in graphs (by gr_id).
-    MATCH (n)
-    WHERE n.gr_id IS NOT NULL
-      AND NONE(l IN labels(n) WHERE toLower(l) IN ['story','chapter','section'])
+    MATCH (n:GraphMember)
     WITH labels(n) AS nodeLabels
     UNWIND nodeLabels AS label
     WITH label
     WHERE toLower(label) NOT IN ['story','chapter','section']
+      AND label <> 'GraphMember'
     RETURN DISTINCT replace(toLower(label), ' ', '_') AS node_type
     ORDER BY node_type
     """
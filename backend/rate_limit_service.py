@@ -1,78 +1,119 @@
 """
 Rate limiting service for user submissions
 Checks per-second and per-month limits based on subscription tier
+
+- Per-second limits use an in-process sliding window (no database access).
+- Monthly limits read one row of rate_limit_monthly_usage, which record_request
+  increments atomically together with appending to rate_limit_tracking.
+
+The sliding window is per process, so with several workers the effective
+per-second limit is multiplied by the worker count; the monthly limit is shared.
 """
-from typing import Optional, Tuple
-from datetime import datetime, timedelta
+from typing import Dict, Optional, Tuple
+from collections import deque
+import threading
+import time
 from neon_database import neon_db
-from subscription_service import get_user_subscription, get_subscription_plan
+from subscription_service import get_subscription_plan, get_requests_this_month, current_usage_month
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Seconds a user's tier is cached before it is read from the users table again
+TIER_CACHE_TTL = 60
+
+
+class SlidingWindowLimiter:
+    """Thread-safe sliding window counter: at most `limit` hits per key within `window` seconds"""
+
+    def __init__(self, window: float = 1.0):
+        self.window = window
+        self._hits: Dict[str, deque] = {}
+        self._lock = threading.Lock()
+
+    def allow(self, key: str, limit: int) -> bool:
+        """Record a hit for `key` if it is under the limit; False (and nothing recorded) otherwise"""
+        now = time.monotonic()
+        with self._lock:
+            hits = self._hits.setdefault(key, deque())
+            while hits and now - hits[0] >= self.window:
+                hits.popleft()
+            if len(hits) >= limit:
+                return False
+            hits.append(now)
+            if len(self._hits) > 10000:
+                self._prune(now)
+            return True
+
+    def _prune(self, now: float):
+        # Caller holds _lock; forget keys with no hits inside the window
+        for key in [k for k, hits in self._hits.items() if not hits or now - hits[-1] >= self.window]:
+            del self._hits[key]
+
+
+per_second_limiter = SlidingWindowLimiter(window=1.0)
+_tier_cache: Dict[str, Tuple[str, float]] = {}
+
+
+def get_user_tier(user_id: str) -> str:
+    """Subscription tier of a user, cached for TIER_CACHE_TTL seconds"""
+    cached = _tier_cache.get(user_id)
+    if cached and time.monotonic() - cached[1] < TIER_CACHE_TTL:
+        return cached[0]
+    result = neon_db.execute_query("SELECT subscription_tier FROM users WHERE id = %s", (user_id,))
+    # Users without a row (e.g. admin accounts) default to the free tier
+    tier = (result[0].get('subscription_tier') if result else None) or 'free'
+    _tier_cache[user_id] = (tier, time.monotonic())
+    return tier
+
+
+def invalidate_user_tier(user_id: str):
+    """Forget a cached tier after the user's subscription changed"""
+    _tier_cache.pop(str(user_id), None)
+
+
 def check_rate_limit(user_id: str) -> Tuple[bool, Optional[str]]:
     """
     Check if user can make a request based on rate limits
     Returns (allowed: bool, error_message: Optional[str])
     """
     try:
-        subscription = get_user_subscription(user_id)
-        if not subscription:
-            # Default to free tier if subscription not found
-            subscription = get_user_subscription(user_id) or type('obj', (object,), {
-                'subscription_tier': 'free',
-                'requests_per_second_limit': 1,
-                'requests_per_month': 10,
-                'requests_this_month': 0
-            })
-        
-        # Get subscription plan for limits
-        plan = get_subscription_plan(subscription.subscription_tier if hasattr(subscription, 'subscription_tier') else 'free')
-        if not plan:
-            plan = get_subscription_plan('free')
-        
-        # Check monthly limit
-        now = datetime.utcnow()
-        month_start = datetime(now.year, now.month, 1)
-        
-        monthly_count_query = """
-        SELECT COUNT(*) as count
-        FROM rate_limit_tracking
-        WHERE user_id = %s AND request_timestamp >= %s
-        """
-        monthly_result = neon_db.execute_query(monthly_count_query, (user_id, month_start))
-        requests_this_month = monthly_result[0]['count'] if monthly_result else 0
-        
+        plan = get_subscription_plan(get_user_tier(user_id)) or get_subscription_plan('free')
+
+        # Check monthly limit first, so requests rejected here don't fill the per-second window
+        requests_this_month = get_requests_this_month(user_id)
         if requests_this_month >= plan.requests_per_month:
             return False, f"Monthly limit reached ({plan.requests_per_month} requests). Please upgrade your subscription."
-        
-        # Check per-second limit (requests in the last second)
-        one_second_ago = now - timedelta(seconds=1)
-        per_second_count_query = """
-        SELECT COUNT(*) as count
-        FROM rate_limit_tracking
-        WHERE user_id = %s AND request_timestamp >= %s
-        """
-        per_second_result = neon_db.execute_query(per_second_count_query, (user_id, one_second_ago))
-        requests_last_second = per_second_result[0]['count'] if per_second_result else 0
-        
-        if requests_last_second >= plan.requests_per_second:
+
+        # Check per-second limit last (in memory; only an admitted request is recorded as a hit)
+        if not per_second_limiter.allow(str(user_id), plan.requests_per_second):
             return False, f"Rate limit exceeded ({plan.requests_per_second} requests per second). Please slow down."
-        
+
         return True, None
-        
+
     except Exception as e:
         logger.error(f"Error checking rate limit: {e}")
         return False, "Error checking rate limits"
 
 def record_request(user_id: str, submission_id: Optional[int] = None, request_type: str = "submission") -> bool:
-    """Record a request for rate limiting purposes"""
+    """Record a request for rate limiting purposes (tracking row and monthly counter in one statement)"""
     try:
         query = """
-        INSERT INTO rate_limit_tracking (user_id, submission_id, request_type, request_timestamp)
-        VALUES (%s, %s, %s, CURRENT_TIMESTAMP)
+        WITH tracked AS (
+            INSERT INTO rate_limit_tracking (user_id, submission_id, request_type, request_timestamp)
+            VALUES (%(user_id)s, %(submission_id)s, %(request_type)s, CURRENT_TIMESTAMP)
+        )
+        INSERT INTO rate_limit_monthly_usage AS m (user_id, month, request_count)
+        VALUES (%(user_id)s, %(month)s, 1)
+        ON CONFLICT (user_id, month) DO UPDATE SET request_count = m.request_count + 1
+        RETURNING request_count
         """
-        neon_db.execute_write_query(query, (user_id, submission_id, request_type))
+        neon_db.execute_write_query(query, {
+            "user_id": user_id,
+            "submission_id": submission_id,
+            "request_type": request_type,
+            "month": current_usage_month(),
+        })
         return True
     except Exception as e:
         logger.error(f"Error recording request: {e}")
@@ -0,0 +1,53 @@
+"""
+Maintenance script to rebuild the materialized statistics on sections, chapters and stories.
+
+The node write endpoints keep the counters current incrementally; run this after
+importing data, after ad-hoc Cypher writes, or to correct `stat_updated_date` after deletes.
+
+Usage:
+    python rebuild_graph_statistics.py
+    python rebuild_graph_statistics.py --batch-size 500
+"""
+import argparse
+import sys
+from database import db
+from config import Config
+from graph_schema import DEFAULT_BATCH_SIZE
+from graph_statistics import rebuild_graph_statistics
+import logging
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def rebuild(batch_size: int = DEFAULT_BATCH_SIZE):
+    """Recompute stat_* properties on every section, chapter and story"""
+
+    try:
+        Config.validate()
+    except ValueError as e:
+        logger.error(str(e))
+        sys.exit(1)
+
+    try:
+        counts = rebuild_graph_statistics(db, batch_size=batch_size)
+
+        logger.info("\n" + "=" * 60)
+        logger.info("✅ SUCCESS! Graph statistics rebuilt")
+        logger.info("=" * 60)
+        for label, updated in counts.items():
+            logger.info(f"  - {label}: {updated} node(s)")
+        logger.info("=" * 60)
+
+    except Exception as e:
+        logger.error(f"Error rebuilding graph statistics: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild materialized story/chapter/section statistics")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Nodes updated per transaction")
+    args = parser.parse_args()
+    rebuild(batch_size=args.batch_size)
@@ -0,0 +1,157 @@
+"""
+Per-client rate limits and concurrency caps for expensive endpoint classes.
+
+Each class of endpoints ("ai", "cypher", "graph") has:
+- a token bucket per client (user id from a valid bearer token, otherwise client IP);
+  an empty bucket answers 429 with Retry-After
+- a process-wide concurrency cap; a request that can't get a slot within
+  REQUEST_QUEUE_TIMEOUT seconds answers 503 with Retry-After
+
+so a burst of AI searches or raw Cypher can't take every Neo4j connection and worker
+thread away from normal graph browsing. Use as a route dependency:
+
+    @app.post("/api/ai/search", dependencies=[Depends(limit_requests("ai"))])
+"""
+import asyncio
+import math
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+from fastapi import HTTPException, Request
+
+from auth import decode_access_token
+from config import Config
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class LimitPolicy:
+    rate_per_minute: float
+    burst: int
+    max_concurrent: int
+
+
+POLICIES: Dict[str, LimitPolicy] = {
+    "ai": LimitPolicy(Config.AI_RATE_LIMIT_PER_MINUTE, Config.AI_RATE_LIMIT_BURST, Config.AI_MAX_CONCURRENT),
+    "cypher": LimitPolicy(Config.CYPHER_RATE_LIMIT_PER_MINUTE, Config.CYPHER_RATE_LIMIT_BURST, Config.CYPHER_MAX_CONCURRENT),
+    "graph": LimitPolicy(Config.GRAPH_RATE_LIMIT_PER_MINUTE, Config.GRAPH_RATE_LIMIT_BURST, Config.GRAPH_MAX_CONCURRENT),
+}
+
+
+class TokenBuckets:
+    """Token bucket per client key: `burst` tokens, refilled at `rate_per_minute`"""
+
+    MAX_KEYS = 10000
+
+    def __init__(self, rate_per_minute: float, burst: int):
+        self.rate = rate_per_minute / 60.0
+        self.burst = burst
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+
+    def take(self, key: str) -> float:
+        """Take a token for `key`; returns 0 if granted, else seconds until one is available"""
+        now = time.monotonic()
+        tokens, updated = self._buckets.get(key, (self.burst, now))
+        tokens = min(self.burst, tokens + (now - updated) * self.rate)
+        if tokens < 1:
+            self._buckets[key] = (tokens, now)
+            return (1 - tokens) / self.rate if self.rate > 0 else 60.0
+        self._buckets[key] = (tokens - 1, now)
+        if len(self._buckets) > self.MAX_KEYS:
+            self._prune(now)
+        return 0.0
+
+    def _prune(self, now: float):
+        # Buckets that have refilled completely carry no state worth keeping
+        full_after = self.burst / self.rate if self.rate > 0 else float("inf")
+        for key in [k for k, (_, updated) in self._buckets.items() if now - updated >= full_after]:
+            del self._buckets[key]
+
+
+class EndpointClassLimiter:
+    """Token buckets plus a concurrency semaphore for one endpoint class"""
+
+    def __init__(self, name: str, policy: LimitPolicy):
+        self.name = name
+        self.policy = policy
+        self.buckets = TokenBuckets(policy.rate_per_minute, policy.burst)
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self.in_flight = 0
+        self.rate_limited = 0
+        self.overloaded = 0
+
+    @property
+    def semaphore(self) -> asyncio.Semaphore:
+        # Created on first use, inside the running event loop
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.policy.max_concurrent)
+        return self._semaphore
+
+    def stats(self) -> dict:
+        return {
+            "in_flight": self.in_flight,
+            "max_concurrent": self.policy.max_concurrent,
+            "rate_per_minute": self.policy.rate_per_minute,
+            "burst": self.policy.burst,
+            "rate_limited": self.rate_limited,
+            "overloaded": self.overloaded,
+        }
+
+
+limiters: Dict[str, EndpointClassLimiter] = {name: EndpointClassLimiter(name, policy) for name, policy in POLICIES.items()}
+
+
+def client_key(request: Request) -> str:
+    """User id from a valid bearer token, otherwise the client address"""
+    authorization = request.headers.get("authorization", "")
+    if authorization.lower().startswith("bearer "):
+        payload = decode_access_token(authorization[7:].strip())
+        if payload and payload.get("sub"):
+            return f"user:{payload['sub']}"
+    forwarded_for = request.headers.get("x-forwarded-for")
+    if Config.TRUST_FORWARDED_FOR and forwarded_for:
+        return f"ip:{forwarded_for.split(',')[0].strip()}"
+    return f"ip:{request.client.host if request.client else 'unknown'}"
+
+
+def limit_requests(endpoint_class: str):
+    """Route dependency enforcing the rate limit and concurrency cap of `endpoint_class`"""
+    limiter = limiters[endpoint_class]
+
+    async def dependency(request: Request):
+        wait = limiter.buckets.take(client_key(request))
+        if wait > 0:
+            limiter.rate_limited += 1
+            raise HTTPException(
+                status_code=429,
+                detail=f"Too many {endpoint_class} requests. Please retry in {math.ceil(wait)}s.",
+                headers={"Retry-After": str(math.ceil(wait))},
+            )
+
+        try:
+            await asyncio.wait_for(limiter.semaphore.acquire(), timeout=Config.REQUEST_QUEUE_TIMEOUT)
+        except asyncio.TimeoutError:
+            limiter.overloaded += 1
+            logger.warning(f"Rejected {endpoint_class} request: {limiter.policy.max_concurrent} already running")
+            raise HTTPException(
+                status_code=503,
+                detail=f"Server is busy with {endpoint_class} requests. Please retry shortly.",
+                headers={"Retry-After": str(math.ceil(Config.REQUEST_QUEUE_TIMEOUT))},
+            )
+
+        limiter.in_flight += 1
+        try:
+            yield
+        finally:
+            limiter.in_flight -= 1
+            limiter.semaphore.release()
+
+    return dependency
+
+
+def stats() -> dict:
+    """Per-class limiter counters for /health"""
+    return {name: limiter.stats() for name, limiter in limiters.items()}
@@ -1,6 +1,6 @@
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Tuple, Callable
 import logging
-from database import db
+from database import db, async_db
 from queries import (
     get_all_stories_query,
     get_story_by_id_query,
@@ -8,11 +8,15 @@ from queries import (
     get_graph_data_by_section_and_country_query,
     get_section_by_id_query,
     get_story_statistics_query,
+    get_all_story_statistics_query,
+    get_materialized_story_statistics_query,
     get_all_node_types_query,
     get_calendar_data_by_section_query,
     get_cluster_data_query
 )
 from models import Story, Chapter, Substory, Node, Link, GraphData
+from graph_schema import MEMBER_LABEL
+from graph_cache import graph_cache, serialize_payload, STORIES_TAG
 
 logger = logging.getLogger(__name__)
 
@@ -31,7 +35,13 @@ def format_node(node_data: Dict[str, Any]) -> Dict[str, Any]:
 
     node_id = str(raw_id) if raw_id is not None else ""
 
+    # The internal :GraphMember label (see graph_schema.py) is never a node type
+    if isinstance(node_data.get("labels"), list) and MEMBER_LABEL in node_data["labels"]:
+        node_data = {**node_data, "labels": [l for l in node_data["labels"] if l != MEMBER_LABEL]}
+
     raw_node_type = node_data.get("node_type") or node_data.get("type")
+    if raw_node_type == MEMBER_LABEL:
+        raw_node_type = None
     if not raw_node_type and isinstance(node_data.get("labels"), list) and node_data.get("labels"):
         raw_node_type = node_data["labels"][0]
 
@@ -181,89 +191,94 @@ def extract_graph_data_from_cypher_results(results: List[Dict[str, Any]]) -> Gra
 
     return GraphData(nodes=unique_nodes, links=unique_links)
 
-def get_all_stories() -> List[Story]:
-    try:
-        logger.info("Fetching all stories from database")
-        query = get_all_stories_query()
-        results = db.execute_query(query)
-        logger.debug(f"Retrieved {len(results)} story records from database")
+def _build_stories(results: List[Dict[str, Any]]) -> List[Story]:
+    """Convert story query records into Story models"""
+    stories = []
+    for record in results:
+        story_data = record.get("story", {})
+        if not story_data:
+            continue
+
+        story_title = story_data.get("story_title", "")
+        story_gid = story_data.get("story_gid", "")
+        story_brief = story_data.get("story_brief", "")
+        
+        # Convert to string and strip whitespace
+        if story_brief is not None:
+            story_brief = str(story_brief).strip()
+        else:
+            story_brief = ""
+        
+        # Log story processing (debug level to avoid spam)
+        logger.debug(f"Processing story: {story_title} (gid: {story_gid}, brief length: {len(story_brief)})")
 
-        stories = []
-        for record in results:
-            story_data = record.get("story", {})
-            if not story_data:
+        # Use Neo4j gid for stable, globally-unique story IDs.
+        # (Frontend uses title for URL sync; it uses id for selection and /statistics.)
+        story_id = str(story_gid) if story_gid else generate_id_from_title(story_title)
+
+        chapters = []
+        for chapter_data in story_data.get("chapters", []):
+            if not chapter_data or not chapter_data.get("gid"):
                 continue
 
-            story_title = story_data.get("story_title", "")
-            story_gid = story_data.get("story_gid", "")
-            story_brief = story_data.get("story_brief", "")
-            
-            # Convert to string and strip whitespace
-            if story_brief is not None:
-                story_brief = str(story_brief).strip()
-            else:
-                story_brief = ""
-            
-            # Log story processing (debug level to avoid spam)
-            logger.debug(f"Processing story: {story_title} (gid: {story_gid}, brief length: {len(story_brief)})")
+            chapter_gid = chapter_data.get("gid", "")
+            chapter_number = chapter_data.get("chapter_number", 0)
+            chapter_title = chapter_data.get("chapter_title", "")
+            chapter_total_nodes = chapter_data.get("total_nodes", 0) or 0
 
-            # Use Neo4j gid for stable, globally-unique story IDs.
-            # (Frontend uses title for URL sync; it uses id for selection and /statistics.)
-            story_id = str(story_gid) if story_gid else generate_id_from_title(story_title)
+            # Use Neo4j gid for stable, globally-unique chapter IDs (titles are used for URL sync).
+            chapter_id = str(chapter_gid)
 
-            chapters = []
-            for chapter_data in story_data.get("chapters", []):
-                if not chapter_data or not chapter_data.get("gid"):
+            substories = []
+            for section_data in chapter_data.get("sections", []):
+                if not section_data or not section_data.get("gid"):
                     continue
 
-                chapter_gid = chapter_data.get("gid", "")
-                chapter_number = chapter_data.get("chapter_number", 0)
-                chapter_title = chapter_data.get("chapter_title", "")
-                chapter_total_nodes = chapter_data.get("total_nodes", 0) or 0
-
-                # Use Neo4j gid for stable, globally-unique chapter IDs (titles are used for URL sync).
-                chapter_id = str(chapter_gid)
-
-                substories = []
-                for section_data in chapter_data.get("sections", []):
-                    if not section_data or not section_data.get("gid"):
-                        continue
-
-                    section_gid = section_data.get("gid", "")
-                    section_title = section_data.get("section_title", "")
-                    section_num = section_data.get("section_num", 0)
-
-                    # Use Neo4j gid for stable, globally-unique section IDs.
-                    # This also allows the frontend to pass a numeric identifier to /api/graph/{substory_id}.
-                    substory_id = str(section_gid)
-
-                    substories.append(Substory(
-                        id=substory_id,
-                        title=section_title or f"Section {section_num}",
-                        headline=section_title or f"Section {section_num}",
-                        brief=section_data.get("brief") or "",
-                        graphPath=None,
-                        section_query=section_data.get("section_query")
-                    ))
-
-                chapters.append(Chapter(
-                    id=chapter_id,
-                    title=chapter_title or f"Chapter {chapter_number}",
-                    headline=chapter_title or f"Chapter {chapter_number}",
-                    brief="",
-                    substories=substories,
-                    total_nodes=int(chapter_total_nodes) if chapter_total_nodes else 0
+                section_gid = section_data.get("gid", "")
+                section_title = section_data.get("section_title", "")
+                section_num = section_data.get("section_num", 0)
+
+                # Use Neo4j gid for stable, globally-unique section IDs.
+                # This also allows the frontend to pass a numeric identifier to /api/graph/{substory_id}.
+                substory_id = str(section_gid)
+
+                substories.append(Substory(
+                    id=substory_id,
+                    title=section_title or f"Section {section_num}",
+                    headline=section_title or f"Section {section_num}",
+                    brief=section_data.get("brief") or "",
+                    graphPath=None,
+                    section_query=section_data.get("section_query")
                 ))
 
-            stories.append(Story(
-                id=story_id,
-                title=story_title,
-                headline=story_title,
-                brief=story_brief,  # Already processed above
-                path=generate_id_from_title(story_title),
-                chapters=chapters
+            chapters.append(Chapter(
+                id=chapter_id,
+                title=chapter_title or f"Chapter {chapter_number}",
+                headline=chapter_title or f"Chapter {chapter_number}",
+                brief="",
+                substories=substories,
+                total_nodes=int(chapter_total_nodes) if chapter_total_nodes else 0
             ))
 
+        stories.append(Story(
+            id=story_id,
+            title=story_title,
+            headline=story_title,
+            brief=story_brief,  # Already processed above
+            path=generate_id_from_title(story_title),
+            chapters=chapters
+        ))
+
+    return stories
+
+def get_all_stories() -> List[Story]:
+    try:
+        logger.info("Fetching all stories from database")
+        query = get_all_stories_query()
+        results = db.execute_query(query)
+        logger.debug(f"Retrieved {len(results)} story records from database")
+
+        stories = _build_stories(results)
         logger.info(f"Successfully processed {len(stories)} stories")
         return stories
     except Exception as e:
@@ -272,42 +287,77 @@ def get_all_stories() -> List[Story]:
         logger.error(error_msg, exc_info=True)
         raise Exception(error_msg) from e
 
-def get_graph_data(section_gid: Optional[str] = None, section_query: Optional[str] = None, section_title: Optional[str] = None, graph_path: Optional[str] = None) -> GraphData:
+async def get_all_stories_async() -> List[Story]:
+    """Async variant of get_all_stories that awaits the async Neo4j driver"""
     try:
-        # Handle graph_path parameter - treat it as section_query if provided
-        if graph_path:
-            logger.debug(f"Fetching graph data by graph_path: {graph_path}")
-            query, params = get_graph_data_by_section_query(section_query=graph_path)
-        elif section_gid:
-            logger.debug(f"Fetching graph data by section_gid: {section_gid}")
-            query, params = get_graph_data_by_section_query(section_gid=section_gid)
-        elif section_query:
-            logger.debug(f"Fetching graph data by section_query: {section_query}")
-            query, params = get_graph_data_by_section_query(section_query=section_query)
-        elif section_title:
-            logger.debug(f"Fetching graph data by section_title: {section_title}")
-            query, params = get_graph_data_by_section_query(section_query=section_title)
-        else:
-            raise ValueError("Either section_gid, section_query, section_title, or graph_path must be provided")
+        logger.info("Fetching all stories from database")
+        query = get_all_stories_query()
+        results = await async_db.execute_query(query)
+        logger.debug(f"Retrieved {len(results)} story records from database")
 
-        results = db.execute_query(query, params)
-        logger.debug(f"Retrieved graph data: {len(results)} result(s)")
+        stories = _build_stories(results)
+        logger.info(f"Successfully processed {len(stories)} stories")
+        return stories
+    except Exception as e:
+        error_msg = f"Error fetching stories: {str(e)}"
+        logger.error(error_msg, exc_info=True)
+        raise Exception(error_msg) from e
 
-        if not results:
-            return GraphData(nodes=[], links=[])
+async def get_stories_payload_async() -> Tuple[bytes, str]:
+    """Serialized JSON body and ETag for the stories list, cached until the next node write"""
+    cache_key = ("stories", "all")
+    cached = graph_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    generation = graph_cache.generation
+    stories = await get_all_stories_async()
+    body = serialize_payload([story.model_dump() for story in stories])
+    etag = graph_cache.put(cache_key, body, STORIES_TAG, generation=generation)
+    return body, etag
+
+def _graph_data_query(section_gid: Optional[str] = None, section_query: Optional[str] = None, section_title: Optional[str] = None, graph_path: Optional[str] = None) -> Tuple[str, dict]:
+    """Pick the section query builder for whichever identifier was provided"""
+    # Handle graph_path parameter - treat it as section_query if provided
+    if graph_path:
+        logger.debug(f"Fetching graph data by graph_path: {graph_path}")
+        return get_graph_data_by_section_query(section_query=graph_path)
+    elif section_gid:
+        logger.debug(f"Fetching graph data by section_gid: {section_gid}")
+        return get_graph_data_by_section_query(section_gid=section_gid)
+    elif section_query:
+        logger.debug(f"Fetching graph data by section_query: {section_query}")
+        return get_graph_data_by_section_query(section_query=section_query)
+    elif section_title:
+        logger.debug(f"Fetching graph data by section_title: {section_title}")
+        return get_graph_data_by_section_query(section_query=section_title)
+    raise ValueError("Either section_gid, section_query, section_title, or graph_path must be provided")
+
+def _build_graph_data(results: List[Dict[str, Any]]) -> GraphData:
+    """Format the `graphData` record returned by the section graph query"""
+    logger.debug(f"Retrieved graph data: {len(results)} result(s)")
+
+    if not results:
+        return GraphData(nodes=[], links=[])
+
+    graph_data = results[0].get("graphData", {})
 
-        graph_data = results[0].get("graphData", {})
+    nodes = []
+    for node_data in graph_data.get("nodes", []):
+        nodes.append(format_node(node_data))
 
-        nodes = []
-        for node_data in graph_data.get("nodes", []):
-            nodes.append(format_node(node_data))
+    links = []
+    for link_data in graph_data.get("links", []):
+        links.append(format_link(link_data))
 
-        links = []
-        for link_data in graph_data.get("links", []):
-            links.append(format_link(link_data))
+    logger.info(f"Successfully formatted graph data: {len(nodes)} nodes, {len(links)} links")
+    return GraphData(nodes=nodes, links=links)
 
-        logger.info(f"Successfully formatted graph data: {len(nodes)} nodes, {len(links)} links")
-        return GraphData(nodes=nodes, links=links)
+def get_graph_data(section_gid: Optional[str] = None, section_query: Optional[str] = None, section_title: Optional[str] = None, graph_path: Optional[str] = None) -> GraphData:
+    try:
+        query, params = _graph_data_query(section_gid, section_query, section_title, graph_path)
+        results = db.execute_query(query, params)
+        return _build_graph_data(results)
     except ValueError as e:
         # Re-raise ValueError as-is (these are expected validation errors)
         logger.warning(f"Validation error in get_graph_data: {str(e)}")
@@ -318,6 +368,47 @@ def get_graph_data(section_gid: Optional[str] = None, section_query: Optional[st
         logger.error(error_msg, exc_info=True)
         raise Exception(error_msg) from e
 
+def _graph_cache_key(section_gid: Optional[str] = None, section_query: Optional[str] = None, section_title: Optional[str] = None, graph_path: Optional[str] = None) -> Tuple[str, str]:
+    """Cache key for a section graph request, following the same precedence as _graph_data_query"""
+    if graph_path:
+        return ("query", str(graph_path))
+    elif section_gid:
+        return ("gid", str(section_gid))
+    elif section_query:
+        return ("query", str(section_query))
+    elif section_title:
+        return ("query", str(section_title))
+    raise ValueError("Either section_gid, section_query, section_title, or graph_path must be provided")
+
+async def get_graph_payload_async(section_gid: Optional[str] = None, section_query: Optional[str] = None, section_title: Optional[str] = None, graph_path: Optional[str] = None) -> Tuple[bytes, str]:
+    """
+    Serialized JSON body and ETag for a section graph, served from graph_cache when possible.
+    Entries are tagged with the section's `graph name` so node writes can invalidate them.
+    """
+    cache_key = _graph_cache_key(section_gid, section_query, section_title, graph_path)
+    cached = graph_cache.get(cache_key)
+    if cached is not None:
+        logger.debug(f"Graph cache hit for {cache_key}")
+        return cached
+
+    generation = graph_cache.generation
+    try:
+        query, params = _graph_data_query(section_gid, section_query, section_title, graph_path)
+        results = await async_db.execute_query(query, params)
+        graph_data = _build_graph_data(results)
+    except ValueError as e:
+        logger.warning(f"Validation error in get_graph_payload_async: {str(e)}")
+        raise
+    except Exception as e:
+        error_msg = f"Error fetching graph data: {str(e)}"
+        logger.error(error_msg, exc_info=True)
+        raise Exception(error_msg) from e
+
+    body = serialize_payload(graph_data.model_dump())
+    graph_name = results[0].get("graph_name") if results else None
+    etag = graph_cache.put(cache_key, body, graph_name, generation=generation)
+    return body, etag
+
 def get_graph_data_by_section_and_country(section_query: str, country_name: str) -> GraphData:
     """Fetch graph data filtered by section and country"""
     try:
@@ -353,6 +444,62 @@ def get_graph_data_by_section_and_country(section_query: str, country_name: str)
         logger.error(error_msg, exc_info=True)
         raise Exception(error_msg) from e
 
+def _calendar_data_query(section_gid: Optional[str] = None, section_query: Optional[str] = None, section_title: Optional[str] = None) -> Tuple[str, dict]:
+    """Pick the calendar query builder for whichever identifier was provided"""
+    if section_query:
+        logger.debug(f"Fetching calendar data by section_query: {section_query}")
+        return get_calendar_data_by_section_query(section_query=section_query)
+    elif section_gid:
+        logger.debug(f"Fetching calendar data by section_gid: {section_gid}")
+        return get_calendar_data_by_section_query(section_gid=section_gid)
+    elif section_title:
+        logger.debug(f"Fetching calendar data by section_title: {section_title}")
+        return get_calendar_data_by_section_query(section_title=section_title)
+    raise ValueError("Either section_gid, section_query, or section_title must be provided")
+
+def _build_calendar_data(results: List[Dict[str, Any]], section_identifier: Optional[str]) -> Dict[str, Any]:
+    """Normalize the `calendarData` record returned by the calendar query"""
+    logger.debug(f"Retrieved calendar data: {len(results)} result(s)")
+
+    if not results:
+        logger.warning(f"No results returned for calendar data query")
+        return {
+            "section_query": section_identifier,
+            "section_title": None,
+            "timeline_items": [],
+            "floating_items": [],
+            "relationships": []
+        }
+
+    calendar_data = results[0].get("calendarData", {})
+
+    # Handle case where calendarData might be None or empty
+    if not calendar_data:
+        logger.warning(f"calendarData is empty in results")
+        return {
+            "section_query": section_identifier,
+            "section_title": None,
+            "timeline_items": [],
+            "floating_items": [],
+            "relationships": []
+        }
+
+    # Ensure all required keys exist with defaults
+    if "timeline_items" not in calendar_data:
+        calendar_data["timeline_items"] = []
+    if "floating_items" not in calendar_data:
+        calendar_data["floating_items"] = []
+    if "relationships" not in calendar_data:
+        calendar_data["relationships"] = []
+
+    logger.info(
+        f"Successfully retrieved calendar data: "
+        f"{len(calendar_data.get('timeline_items', []))} timeline items, "
+        f"{len(calendar_data.get('floating_items', []))} floating items, "
+        f"{len(calendar_data.get('relationships', []))} relationships"
+    )
+    return calendar_data
+
 def get_calendar_data(section_gid: Optional[str] = None, section_query: Optional[str] = None, section_title: Optional[str] = None) -> Dict[str, Any]:
     """
     Fetch calendar/timeline data for a section.
@@ -363,60 +510,9 @@ def get_calendar_data(section_gid: Optional[str] = None, section_query: Optional
     - relationships: all connections for dynamic positioning
     """
     try:
-        # Handle graph_path parameter - treat it as section_query if provided
-        if section_query:
-            logger.debug(f"Fetching calendar data by section_query: {section_query}")
-            query, params = get_calendar_data_by_section_query(section_query=section_query)
-        elif section_gid:
-            logger.debug(f"Fetching calendar data by section_gid: {section_gid}")
-            query, params = get_calendar_data_by_section_query(section_gid=section_gid)
-        elif section_title:
-            logger.debug(f"Fetching calendar data by section_title: {section_title}")
-            query, params = get_calendar_data_by_section_query(section_title=section_title)
-        else:
-            raise ValueError("Either section_gid, section_query, or section_title must be provided")
-
+        query, params = _calendar_data_query(section_gid, section_query, section_title)
         results = db.execute_query(query, params)
-        logger.debug(f"Retrieved calendar data: {len(results)} result(s)")
-
-        if not results:
-            logger.warning(f"No results returned for calendar data query")
-            return {
-                "section_query": section_query or section_title or section_gid,
-                "section_title": None,
-                "timeline_items": [],
-                "floating_items": [],
-                "relationships": []
-            }
-
-        calendar_data = results[0].get("calendarData", {})
-        
-        # Handle case where calendarData might be None or empty
-        if not calendar_data:
-            logger.warning(f"calendarData is empty in results")
-            return {
-                "section_query": section_query or section_title or section_gid,
-                "section_title": None,
-                "timeline_items": [],
-                "floating_items": [],
-                "relationships": []
-            }
-        
-        # Ensure all required keys exist with defaults
-        if "timeline_items" not in calendar_data:
-            calendar_data["timeline_items"] = []
-        if "floating_items" not in calendar_data:
-            calendar_data["floating_items"] = []
-        if "relationships" not in calendar_data:
-            calendar_data["relationships"] = []
-        
-        logger.info(
-            f"Successfully retrieved calendar data: "
-            f"{len(calendar_data.get('timeline_items', []))} timeline items, "
-            f"{len(calendar_data.get('floating_items', []))} floating items, "
-            f"{len(calendar_data.get('relationships', []))} relationships"
-        )
-        return calendar_data
+        return _build_calendar_data(results, section_query or section_title or section_gid)
     except ValueError as e:
         logger.warning(f"Validation error in get_calendar_data: {str(e)}")
         raise
@@ -425,6 +521,78 @@ def get_calendar_data(section_gid: Optional[str] = None, section_query: Optional
         logger.error(error_msg, exc_info=True)
         raise Exception(error_msg) from e
 
+async def get_calendar_payload_async(section_gid: Optional[str] = None, section_query: Optional[str] = None, section_title: Optional[str] = None) -> Tuple[bytes, str]:
+    """Serialized JSON body and ETag for a section's calendar data, cached like section graphs"""
+    if section_query:
+        cache_key = ("calendar:query", str(section_query))
+    elif section_gid:
+        cache_key = ("calendar:gid", str(section_gid))
+    elif section_title:
+        cache_key = ("calendar:query", str(section_title))
+    else:
+        raise ValueError("Either section_gid, section_query, or section_title must be provided")
+
+    cached = graph_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    generation = graph_cache.generation
+    try:
+        query, params = _calendar_data_query(section_gid, section_query, section_title)
+        results = await async_db.execute_query(query, params)
+        calendar_data = _build_calendar_data(results, section_query or section_title or section_gid)
+    except ValueError as e:
+        logger.warning(f"Validation error in get_calendar_payload_async: {str(e)}")
+        raise
+    except Exception as e:
+        error_msg = f"Error fetching calendar data: {str(e)}"
+        logger.error(error_msg, exc_info=True)
+        raise Exception(error_msg) from e
+
+    body = serialize_payload(calendar_data)
+    # Item counts are logged by _build_calendar_data; this is the size actually cached and sent
+    logger.info(f"Serialized calendar payload: {len(body)} bytes")
+    graph_name = results[0].get("graph_name") if results else None
+    etag = graph_cache.put(cache_key, body, graph_name, generation=generation)
+    return body, etag
+
+
+def _cluster_data_query(
+    node_type: str,
+    property_key: str,
+    section_query: Optional[str],
+    cluster_limit: int,
+    node_limit: int
+) -> Tuple[str, dict, str]:
+    """Validate cluster inputs and build the cluster query; also returns the normalized node type"""
+    if not node_type or not str(node_type).strip():
+        raise ValueError("node_type is required")
+    if not property_key or not str(property_key).strip():
+        raise ValueError("property_key is required")
+
+    # Normalize node_type coming from the UI (db.schema.nodeTypeProperties() returns labels with casing/spaces).
+    node_type_normalized = str(node_type).strip().lower().replace(" ", "_")
+
+    query, params = get_cluster_data_query(
+        node_type=node_type_normalized,
+        property_key=str(property_key).strip(),
+        section_query=section_query,
+        cluster_limit=int(cluster_limit),
+        node_limit=int(node_limit),
+    )
+    return query, params, node_type_normalized
+
+def _build_cluster_data(results: List[Dict[str, Any]], node_type_normalized: str, property_key: str, section_query: Optional[str]) -> Dict[str, Any]:
+    """Extract the `clusterData` record, falling back to an empty cluster list"""
+    empty = {
+        "node_type": node_type_normalized,
+        "property_key": property_key,
+        "section_query": section_query,
+        "clusters": []
+    }
+    if not results:
+        return empty
+    return results[0].get("clusterData", empty)
 
 def get_cluster_data(
     node_type: str,
@@ -436,53 +604,48 @@ def get_cluster_data(
     """
     Fetch cluster data grouped by a node property for a given node type (label).
     """
-    if not node_type or not str(node_type).strip():
-        raise ValueError("node_type is required")
-    if not property_key or not str(property_key).strip():
-        raise ValueError("property_key is required")
+    query, params, node_type_normalized = _cluster_data_query(node_type, property_key, section_query, cluster_limit, node_limit)
 
     try:
-        # Normalize node_type coming from the UI (db.schema.nodeTypeProperties() returns labels with casing/spaces).
-        node_type_normalized = str(node_type).strip().lower().replace(" ", "_")
-
-        query, params = get_cluster_data_query(
-            node_type=node_type_normalized,
-            property_key=str(property_key).strip(),
-            section_query=section_query,
-            cluster_limit=int(cluster_limit),
-            node_limit=int(node_limit),
-        )
-
         results = db.execute_query(query, params)
-        if not results:
-            return {
-                "node_type": node_type_normalized,
-                "property_key": property_key,
-                "section_query": section_query,
-                "clusters": []
-            }
+        return _build_cluster_data(results, node_type_normalized, property_key, section_query)
+    except Exception as e:
+        error_msg = f"Error fetching cluster data: {str(e)}"
+        logger.error(error_msg, exc_info=True)
+        raise Exception(error_msg) from e
 
-        return results[0].get("clusterData", {
-            "node_type": node_type_normalized,
-            "property_key": property_key,
-            "section_query": section_query,
-            "clusters": []
-        })
-    except ValueError:
-        raise
+async def get_cluster_data_async(
+    node_type: str,
+    property_key: str,
+    section_query: Optional[str] = None,
+    cluster_limit: int = 5,
+    node_limit: int = 10
+) -> Dict[str, Any]:
+    """Async variant of get_cluster_data that awaits the async Neo4j driver"""
+    query, params, node_type_normalized = _cluster_data_query(node_type, property_key, section_query, cluster_limit, node_limit)
+
+    try:
+        results = await async_db.execute_query(query, params)
+        return _build_cluster_data(results, node_type_normalized, property_key, section_query)
     except Exception as e:
         error_msg = f"Error fetching cluster data: {str(e)}"
         logger.error(error_msg, exc_info=True)
         raise Exception(error_msg) from e
 
-def search_with_ai(user_query: str) -> Tuple[GraphData, str]:
+def search_with_ai(user_query: str, on_stage: Optional[Callable[[str], None]] = None) -> Tuple[GraphData, str]:
+    """Run a Cypher query directly, or have GROK generate one; `on_stage` is told when each step starts"""
     from ai_service import generate_cypher_query
 
+    def stage(name: str):
+        if on_stage:
+            on_stage(name)
+
     try:
         user_query = user_query.strip()
         logger.info(f"Processing AI search query: {user_query[:100]}...")
 
         if is_cypher_query(user_query):
+            stage("executing")
             try:
                 results = db.execute_query(user_query)
             except Exception as db_error:
@@ -494,6 +657,7 @@ def search_with_ai(user_query: str) -> Tuple[GraphData, str]:
 
             return extract_graph_data_from_cypher_results(results), user_query
 
+        stage("generating_query")
         try:
             cypher_query = generate_cypher_query(user_query)
         except ValueError as e:
@@ -510,6 +674,7 @@ def search_with_ai(user_query: str) -> Tuple[GraphData, str]:
         if not cypher_query:
             raise ValueError("Failed to generate Cypher query from user query. Please try rephrasing your search.")
 
+        stage("executing")
         try:
             if "$search_term" in cypher_query or "$param" in cypher_query.lower():
                 try:
@@ -542,29 +707,42 @@ def search_with_ai(user_query: str) -> Tuple[GraphData, str]:
             raise ValueError("Database connection error. Please try again later.")
         raise ValueError(f"An error occurred during search: {error_msg}")
 
-def get_story_statistics(story_id: str) -> Dict[str, Any]:
-    """Get statistics for a story (total nodes, entity count, etc.)"""
+def _empty_story_statistics(story_id: str) -> Dict[str, Any]:
+    return {
+        "story_id": story_id,
+        "total_nodes": 0,
+        "entity_count": 0,
+        "highlighted_nodes": 0,
+        "updated_date": None
+    }
+
+async def get_story_statistics_async(story_id: str) -> Dict[str, Any]:
+    """Get statistics for a story (total nodes, entity count, etc.) through the async Neo4j driver"""
     try:
         logger.debug(f"Fetching statistics for story: {story_id}")
-        # Try to get statistics by story_gid first, then by story_title
-        query, params = get_story_statistics_query(story_gid=story_id)
-        results = db.execute_query(query, params)
-        
-        if not results or len(results) == 0:
-            # Try by story title
-            logger.debug(f"No results for story_gid, trying story_title: {story_id}")
-            query, params = get_story_statistics_query(story_title=story_id)
-            results = db.execute_query(query, params)
-        
-        if not results or len(results) == 0:
+        # Materialized statistics (graph_statistics.py) are a property read on the story node
+        query, params = get_materialized_story_statistics_query(story_id)
+        results = await async_db.execute_query(query, params)
+        if not results:
             logger.warning(f"No statistics found for story: {story_id}")
+            return _empty_story_statistics(story_id)
+        if results[0].get("statistics", {}).get("materialized"):
+            stats = results[0]["statistics"]
             return {
                 "story_id": story_id,
-                "total_nodes": 0,
-                "entity_count": 0,
-                "highlighted_nodes": 0,
-                "updated_date": None
+                "total_nodes": stats.get("total_nodes", 0) or 0,
+                "entity_count": stats.get("entity_count", 0) or 0,
+                "highlighted_nodes": stats.get("highlighted_nodes", 0) or 0,
+                "updated_date": stats.get("updated_date", None)
             }
+
+        # Not materialized yet: compute live (the story is resolved by gid or title in the same query)
+        query, params = get_story_statistics_query(story_id)
+        results = await async_db.execute_query(query, params)
+        
+        if not results or len(results) == 0:
+            logger.warning(f"No statistics found for story: {story_id}")
+            return _empty_story_statistics(story_id)
         
         stats = results[0].get("statistics", {})
         total_nodes = stats.get("total_nodes", 0) or 0
@@ -583,12 +761,50 @@ def get_story_statistics(story_id: str) -> Dict[str, Any]:
     except Exception as e:
         # Return default values on error
         logger.error(f"Error fetching statistics for story {story_id}: {str(e)}", exc_info=True)
-        return {
+        return _empty_story_statistics(story_id)
+
+async def get_all_story_statistics_payload_async() -> Tuple[bytes, str]:
+    """
+    Serialized statistics for every story, keyed by story id (same ids as /api/stories).
+    Read from the materialized story statistics, or computed in one grouped query when those
+    are missing, and cached with the stories list until the next node write.
+    """
+    cache_key = ("stories", "statistics")
+    cached = graph_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    generation = graph_cache.generation
+    try:
+        query, params = get_materialized_story_statistics_query()
+        results = await async_db.execute_query(query, params)
+        if any(not record.get("statistics", {}).get("materialized") for record in results):
+            logger.warning("Story statistics are not materialized yet, computing live (run rebuild_graph_statistics.py)")
+            results = await async_db.execute_query(get_all_story_statistics_query())
+    except Exception as e:
+        error_msg = f"Error fetching story statistics: {str(e)}"
+        logger.error(error_msg, exc_info=True)
+        raise Exception(error_msg) from e
+
+    statistics = {}
+    for record in results:
+        stats = record.get("statistics", {})
+        story_gid = stats.get("story_gid")
+        # Same id scheme as _build_stories so the frontend can look stories up directly
+        story_id = str(story_gid) if story_gid else generate_id_from_title(stats.get("story_title", ""))
+        statistics[story_id] = {
             "story_id": story_id,
-            "total_nodes": 0,
-            "entity_count": 0
+            "total_nodes": stats.get("total_nodes", 0) or 0,
+            "entity_count": stats.get("entity_count", 0) or 0,
+            "highlighted_nodes": stats.get("highlighted_nodes", 0) or 0,
+            "updated_date": stats.get("updated_date", None)
         }
 
+    logger.info(f"Computed statistics for {len(statistics)} stories")
+    body = serialize_payload(statistics)
+    etag = graph_cache.put(cache_key, body, STORIES_TAG, generation=generation)
+    return body, etag
+
 def get_all_node_types() -> List[str]:
     """Get all distinct node types from the database"""
     try:
@@ -0,0 +1,98 @@
+"""
+In-process pub/sub for submission progress, streamed to clients over Server-Sent Events.
+
+Submission workers run in threads and call `publish()`; events are handed to the event
+loop with call_soon_threadsafe and fanned out to the asyncio queues of the SSE streams
+subscribed to that submission. The latest event per submission is kept for a while so a
+client that connects mid-way immediately sees the current stage.
+
+Events only reach clients connected to the instance running the job; clients fall back
+to GET /api/submissions/{id} for the stored status.
+"""
+import asyncio
+import logging
+import threading
+import time
+from typing import Dict, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STAGES = {"completed", "failed"}
+
+
+class ProgressBroker:
+    """Fan-out of progress events from worker threads to asyncio subscribers"""
+
+    def __init__(self, retain_seconds: float = 600, queue_size: int = 100):
+        self.retain_seconds = retain_seconds
+        self.queue_size = queue_size
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+        self._latest: Dict[str, Tuple[dict, float]] = {}
+        self._lock = threading.Lock()
+
+    def attach(self, loop: asyncio.AbstractEventLoop):
+        """Bind to the application's event loop (call on startup)"""
+        self._loop = loop
+
+    def publish(self, submission_id, stage: str, **fields):
+        """Publish a progress event; safe to call from any thread"""
+        submission_id = str(submission_id)
+        event = {
+            "submission_id": submission_id,
+            "stage": stage,
+            "status": stage if stage in TERMINAL_STAGES or stage == "pending" else "processing",
+            **fields,
+            "timestamp": time.time(),
+        }
+        now = time.monotonic()
+        with self._lock:
+            self._latest[submission_id] = (event, now)
+            expired = [key for key, (_, at) in self._latest.items() if now - at > self.retain_seconds]
+            for key in expired:
+                del self._latest[key]
+
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        try:
+            loop.call_soon_threadsafe(self._deliver, submission_id, event)
+        except RuntimeError:
+            # Loop closed between the check and the call (shutdown)
+            pass
+
+    def latest(self, submission_id) -> Optional[dict]:
+        with self._lock:
+            entry = self._latest.get(str(submission_id))
+        return entry[0] if entry else None
+
+    def subscribe(self, submission_id) -> asyncio.Queue:
+        """Queue receiving this submission's events (call from the event loop)"""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers.setdefault(str(submission_id), set()).add(queue)
+        return queue
+
+    def unsubscribe(self, submission_id, queue: asyncio.Queue):
+        subscribers = self._subscribers.get(str(submission_id))
+        if subscribers is None:
+            return
+        subscribers.discard(queue)
+        if not subscribers:
+            del self._subscribers[str(submission_id)]
+
+    def stats(self) -> dict:
+        return {
+            "streams": sum(len(queues) for queues in self._subscribers.values()),
+            "tracked_submissions": len(self._latest),
+        }
+
+    def _deliver(self, submission_id: str, event: dict):
+        # Runs on the event loop thread
+        for queue in self._subscribers.get(submission_id, ()):
+            if queue.full():
+                # A slow client only needs the most recent stages
+                queue.get_nowait()
+            queue.put_nowait(event)
+
+
+submission_progress = ProgressBroker()
@@ -0,0 +1,149 @@
+"""
+Content-addressed reuse of submission results.
+
+A submission's fingerprint identifies what it asks to process:
+- url:  SHA-256 of the normalized URL (lower-cased scheme/host, default port, fragment and
+        tracking parameters dropped, query parameters sorted)
+- text: SHA-256 of the text with whitespace collapsed
+- pdf:  SHA-256 of the uploaded file (computed while streaming the upload)
+
+Completed processing results are stored in `submission_results` under the submission's
+fingerprint and under the text fingerprint of its extracted content, so the same article
+submitted through a different URL, or pasted as text, is also reused. Results expire after
+SUBMISSION_RESULT_TTL_DAYS since the underlying page and graph change over time.
+
+Identical submissions processed at the same time on this instance wait for the first one
+(`in_flight`) instead of repeating the work. A waiting submission goes back to 'pending'
+without holding a worker thread, and is re-enqueued when the first one finishes.
+"""
+from typing import Any, Callable, Dict, Iterable, List, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+import hashlib
+import json
+import logging
+import threading
+import time
+
+from config import Config
+from neon_database import neon_db
+
+logger = logging.getLogger(__name__)
+
+TRACKING_PARAMS = {"fbclid", "gclid", "mc_cid", "mc_eid"}
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def _sha256(value: str) -> str:
+    return hashlib.sha256(value.encode('utf-8')).hexdigest()
+
+
+def normalize_url(url: str) -> str:
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    try:
+        port = parts.port
+    except ValueError:
+        # Malformed or out-of-range port: keep the authority as written
+        host, port = parts.netloc, None
+    else:
+        host = (parts.hostname or "").lower()
+    if port and port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{port}"
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith("utm_") and key.lower() not in TRACKING_PARAMS
+    )
+    return urlunsplit((scheme, host, parts.path or "/", urlencode(query), ""))
+
+
+def text_fingerprint(text: str) -> str:
+    return f"text:{_sha256(' '.join(text.split()))}"
+
+
+def submission_fingerprint(submission: Dict[str, Any]) -> Optional[str]:
+    """Fingerprint of a submission row, or None if it can't be computed"""
+    submission_type = submission.get('submission_type')
+    if submission_type == 'url' and submission.get('input_url'):
+        return f"url:{_sha256(normalize_url(submission['input_url']))}"
+    if submission_type == 'text' and submission.get('input_data'):
+        return text_fingerprint(submission['input_data'])
+    if submission_type == 'pdf' and submission.get('file_sha256'):
+        return f"pdf:{submission['file_sha256']}"
+    return None
+
+
+def get_stored_result(fingerprint: str) -> Optional[Dict[str, Any]]:
+    """Stored processing result for a fingerprint, unless expired"""
+    query = """
+    SELECT processing_result FROM submission_results
+    WHERE fingerprint = %s
+      AND created_at > CURRENT_TIMESTAMP - make_interval(days => %s)
+    """
+    try:
+        result = neon_db.execute_query(query, (fingerprint, Config.SUBMISSION_RESULT_TTL_DAYS))
+    except Exception as e:
+        logger.warning(f"Could not look up stored result {fingerprint}: {e}")
+        return None
+    return result[0]['processing_result'] if result else None
+
+
+def store_result(fingerprints: Iterable[Optional[str]], processing_result: Dict[str, Any]):
+    """Store a completed result under each fingerprint (tags are per submission and not stored)"""
+    stored = json.dumps({key: value for key, value in processing_result.items() if key not in ("tags", "reused")})
+    rows = [(fingerprint, stored) for fingerprint in dict.fromkeys(fingerprints) if fingerprint]
+    query = """
+    INSERT INTO submission_results (fingerprint, processing_result)
+    VALUES %s
+    ON CONFLICT (fingerprint) DO UPDATE
+    SET processing_result = EXCLUDED.processing_result, created_at = CURRENT_TIMESTAMP
+    """
+    try:
+        neon_db.execute_values(query, rows)
+    except Exception as e:
+        # The submission itself is already complete; only reuse is lost
+        logger.warning(f"Could not store submission result: {e}")
+
+
+class InFlightJobs:
+    """Fingerprints being processed on this instance, with the submissions waiting for each"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # fingerprint -> (time claimed, ids of waiting submissions)
+        self._jobs: Dict[str, tuple] = {}
+        # Called with each waiting submission id when its fingerprint is released (set by the worker)
+        self.on_release: Optional[Callable[[str], Any]] = None
+
+    def claim(self, fingerprint: str, waiter_id: str, patience: float) -> Optional[bool]:
+        """
+        True if the caller now owns the fingerprint; False if `waiter_id` was recorded and is
+        handed to `on_release` later; None if the owner has been at it longer than `patience` seconds
+        """
+        with self._lock:
+            job = self._jobs.get(fingerprint)
+            if job is None:
+                self._jobs[fingerprint] = (time.monotonic(), [])
+                return True
+            claimed_at, waiters = job
+            if time.monotonic() - claimed_at > patience:
+                return None
+            if waiter_id not in waiters:
+                waiters.append(waiter_id)
+            return False
+
+    def release(self, fingerprint: str) -> List[str]:
+        with self._lock:
+            _, waiters = self._jobs.pop(fingerprint, (None, []))
+        if self.on_release is not None:
+            for waiter_id in waiters:
+                try:
+                    self.on_release(waiter_id)
+                except Exception as e:
+                    logger.warning(f"Could not re-enqueue waiting submission {waiter_id}: {e}")
+        return waiters
+
+    def __len__(self) -> int:
+        return len(self._jobs)
+
+
+in_flight = InFlightJobs()
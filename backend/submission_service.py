@@ -2,20 +2,21 @@
 Submission processing service
 Handles URL, text, and PDF submissions and processes them to extract graph data
 """
-from typing import Optional, Dict, Any, Tuple
+from typing import Optional, Dict, Any, List, Tuple, Callable
+from concurrent.futures import BrokenExecutor, CancelledError, ThreadPoolExecutor, as_completed
 from datetime import datetime
+import hashlib
 import json
 import os
 import logging
-import requests
-from urllib.parse import urlparse
-from bs4 import BeautifulSoup
-import PyPDF2
-import pdfplumber
-from io import BytesIO
+import aiofiles
 
+from config import Config
 from neon_database import neon_db
-from models import SubmissionCreate, SubmissionResponse, GraphData
+from pdf_extraction import extract_text_from_pdf
+from submission_results import submission_fingerprint, text_fingerprint, get_stored_result, store_result, in_flight
+from url_fetcher import fetch_url_text
+from models import SubmissionCreate, SubmissionResponse, SubmissionSummary, GraphData
 from services import search_with_ai, extract_graph_data_from_cypher_results
 from ai_service import generate_cypher_query
 from database import db
@@ -25,97 +26,147 @@ logger = logging.getLogger(__name__)
 # Directory for storing uploaded files
 UPLOAD_DIR = os.path.join(os.path.dirname(__file__), "uploads")
 os.makedirs(UPLOAD_DIR, exist_ok=True)
+# Uploads are streamed to disk in chunks of this size
+UPLOAD_CHUNK_SIZE = 1024 * 1024
 
-def extract_text_from_url(url: str) -> Tuple[str, Optional[str]]:
+class UploadTooLargeError(Exception):
+    """Raised when an upload exceeds the configured maximum size"""
+
+async def save_upload(upload, file_path: str, max_bytes: int) -> Tuple[int, str]:
     """
-    Extract text content from a URL
-    Returns (text_content, error_message)
+    Stream an UploadFile to `file_path` chunk by chunk, hashing as it goes.
+    Returns (size in bytes, SHA-256 hex digest); the partial file is removed on any error.
+
+    By the time this runs Starlette has already spooled the upload, so `max_bytes` only caps
+    the file that is kept; oversized request bodies are rejected earlier, while being
+    received, by BodySizeLimitMiddleware (body_limits.py).
     """
+    digest = hashlib.sha256()
+    size = 0
     try:
-        response = requests.get(url, timeout=30, headers={
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        })
-        response.raise_for_status()
-        
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        # Remove script and style elements
-        for script in soup(["script", "style"]):
-            script.decompose()
-        
-        # Get text
-        text = soup.get_text()
-        
-        # Clean up whitespace
-        lines = (line.strip() for line in text.splitlines())
-        chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-        text = ' '.join(chunk for chunk in chunks if chunk)
-        
-        return text[:50000], None  # Limit to 50k characters
-    except Exception as e:
-        logger.error(f"Error extracting text from URL {url}: {e}")
-        return "", str(e)
+        async with aiofiles.open(file_path, 'wb') as f:
+            while True:
+                chunk = await upload.read(UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_bytes:
+                    raise UploadTooLargeError(f"File exceeds the maximum upload size of {max_bytes // (1024 * 1024)} MB")
+                digest.update(chunk)
+                await f.write(chunk)
+    except BaseException:
+        try:
+            os.remove(file_path)
+        except OSError:
+            pass
+        raise
+    return size, digest.hexdigest()
+
+def _no_progress(stage: str, **fields):
+    pass
 
-def extract_text_from_pdf(file_path: str) -> Tuple[str, Optional[str]]:
+# Chunk jobs of all submissions share this pool, which bounds concurrent GROK calls
+_chunk_pool = ThreadPoolExecutor(max_workers=Config.SUBMISSION_LLM_CONCURRENCY, thread_name_prefix="submission-chunk")
+
+def split_into_chunks(text: str, size: int, overlap: int) -> List[str]:
     """
-    Extract text content from a PDF file
-    Returns (text_content, error_message)
+    Split text into chunks of at most `size` characters, each starting `overlap` characters
+    before the previous one ended. Chunks end on a paragraph, sentence or word boundary
+    when one falls in their last fifth.
     """
-    try:
-        text_content = ""
-        
-        # Try pdfplumber first (better for complex PDFs)
-        try:
-            with pdfplumber.open(file_path) as pdf:
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text_content += page_text + "\n"
-        except Exception as e:
-            logger.warning(f"pdfplumber failed, trying PyPDF2: {e}")
-            # Fallback to PyPDF2
-            with open(file_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                for page in pdf_reader.pages:
-                    text_content += page.extract_text() + "\n"
-        
-        return text_content[:50000], None  # Limit to 50k characters
-    except Exception as e:
-        logger.error(f"Error extracting text from PDF {file_path}: {e}")
-        return "", str(e)
+    chunks = []
+    start = 0
+    while start < len(text):
+        end = min(start + size, len(text))
+        if end < len(text):
+            window_start = start + size * 4 // 5
+            for separator in ("\n\n", "\n", ". ", " "):
+                cut = text.rfind(separator, window_start, end)
+                if cut != -1:
+                    end = cut + len(separator)
+                    break
+        chunk = text[start:end].strip()
+        if chunk:
+            chunks.append(chunk)
+        if end >= len(text):
+            break
+        start = max(end - overlap, start + 1)
+    return chunks
+
+def merge_graph_data(parts: List[GraphData]) -> GraphData:
+    """
+    Merge graphs, deduplicating nodes and links by id.
+    Earlier parts win; their missing attributes are filled in from later ones.
+    """
+    nodes: Dict[str, Dict[str, Any]] = {}
+    links: Dict[str, Dict[str, Any]] = {}
+    for part in parts:
+        for items, merged in ((part.nodes, nodes), (part.links, links)):
+            for item in items:
+                data = {key: value for key, value in item.model_dump().items() if value is not None}
+                merged[item.id] = {**data, **merged.get(item.id, {})}
+    return GraphData(nodes=list(nodes.values()), links=list(links.values()))
+
+def _analyze_chunk(chunk: str) -> Tuple[GraphData, str]:
+    query_prompt = f"Analyze the following content and create a knowledge graph representation:\n\n{chunk}"
+    return search_with_ai(query_prompt)
 
-def process_submission_content(content: str, tags: list = None) -> Dict[str, Any]:
+def process_submission_content(content: str, tags: list = None, progress: Callable[..., None] = _no_progress) -> Dict[str, Any]:
     """
     Process submission content to generate graph data using AI
     Returns processing result with graph data
+
+    Content longer than SUBMISSION_CHUNK_CHARS is split into overlapping chunks that are
+    analyzed concurrently; their graphs are merged. Failed chunks are skipped unless all fail.
     """
     try:
-        # Use AI service to generate Cypher query from content
-        # For now, we'll use the existing search_with_ai function
-        # In the future, this could be enhanced to extract entities/relationships from the content
+        chunks = split_into_chunks(content, Config.SUBMISSION_CHUNK_CHARS, Config.SUBMISSION_CHUNK_OVERLAP) or [content]
         
-        # Generate a query from the content
-        query_prompt = f"Analyze the following content and create a knowledge graph representation:\n\n{content[:10000]}"
+        if len(chunks) == 1:
+            query_prompt = f"Analyze the following content and create a knowledge graph representation:\n\n{chunks[0]}"
+            graph_data, generated_query = search_with_ai(query_prompt, on_stage=progress)
+            results = [(graph_data, generated_query)]
+            failed_chunks = 0
+        else:
+            progress("analyzing", chunk=0, chunks=len(chunks))
+            futures = {_chunk_pool.submit(_analyze_chunk, chunk): index for index, chunk in enumerate(chunks)}
+            by_index: Dict[int, Tuple[GraphData, str]] = {}
+            errors = []
+            for done, future in enumerate(as_completed(futures), start=1):
+                try:
+                    by_index[futures[future]] = future.result()
+                except Exception as e:
+                    logger.warning(f"Chunk {futures[future] + 1}/{len(chunks)} failed: {e}")
+                    errors.append(e)
+                progress("analyzing", chunk=done, chunks=len(chunks))
+            if not by_index:
+                raise errors[0]
+            results = [by_index[index] for index in sorted(by_index)]
+            failed_chunks = len(errors)
         
-        graph_data, generated_query = search_with_ai(query_prompt)
+        graph_data = merge_graph_data([graph for graph, _ in results])
+        generated_queries = [query for _, query in results]
         
         return {
-            "graph_data": graph_data.model_dump() if hasattr(graph_data, 'model_dump') else graph_data,
-            "generated_query": generated_query,
-            "nodes_count": len(graph_data.nodes) if hasattr(graph_data, 'nodes') else 0,
-            "links_count": len(graph_data.links) if hasattr(graph_data, 'links') else 0,
+            "graph_data": graph_data.model_dump(),
+            "generated_query": generated_queries[0],
+            "generated_queries": generated_queries,
+            "chunks_count": len(chunks),
+            "failed_chunks": failed_chunks,
+            "nodes_count": len(graph_data.nodes),
+            "links_count": len(graph_data.links),
             "tags": tags or []
         }
     except Exception as e:
         logger.error(f"Error processing submission content: {e}")
         raise
 
-def create_submission(user_id: str, submission_data: SubmissionCreate, file_path: Optional[str] = None, file_name: Optional[str] = None, file_size: Optional[int] = None) -> Optional[SubmissionResponse]:
+def create_submission(user_id: str, submission_data: SubmissionCreate, file_path: Optional[str] = None, file_name: Optional[str] = None, file_size: Optional[int] = None, file_sha256: Optional[str] = None) -> Optional[SubmissionResponse]:
     """Create a new submission record"""
     try:
         query = """
-        INSERT INTO submissions (user_id, submission_type, input_data, input_url, file_path, file_name, file_size, status, tags, created_at)
-        VALUES (%s, %s, %s, %s, %s, %s, %s, 'pending', %s, CURRENT_TIMESTAMP)
+        INSERT INTO submissions (user_id, submission_type, input_data, input_url, file_path, file_name, file_size, file_sha256, status, tags, created_at)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, 'pending', %s, CURRENT_TIMESTAMP)
         RETURNING id, user_id, submission_type, input_data, input_url, file_path, file_name, file_size, status, processing_result, tags, created_at, processed_at
         """
         
@@ -129,6 +180,7 @@ def create_submission(user_id: str, submission_data: SubmissionCreate, file_path
             file_path,
             file_name,
             file_size,
+            file_sha256,
             tags_array
         )
         
@@ -155,29 +207,155 @@ def create_submission(user_id: str, submission_data: SubmissionCreate, file_path
         logger.error(f"Error creating submission: {e}")
         return None
 
-def process_submission(submission_id: str) -> Optional[SubmissionResponse]:
-    """Process a submission and update its status"""
+def claim_submission(submission_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Atomically move a submission from 'pending' to 'processing'.
+    Returns the submission row, or None if it doesn't exist or another worker already claimed it.
+    """
+    query = """
+    UPDATE submissions
+    SET status = 'processing', processing_started_at = CURRENT_TIMESTAMP
+    WHERE id = %s AND status = 'pending'
+    RETURNING id, user_id, submission_type, input_data, input_url, file_path, file_name, file_sha256, tags
+    """
+    result = neon_db.execute_write_query(query, (submission_id,))
+    return result[0] if result else None
+
+def touch_submissions(submission_ids: List[str]) -> int:
+    """Heartbeat: refresh processing_started_at of submissions this worker is still processing"""
+    if not submission_ids:
+        return 0
+    query = """
+    UPDATE submissions
+    SET processing_started_at = CURRENT_TIMESTAMP
+    WHERE id = ANY(%s::int[]) AND status = 'processing'
+    RETURNING id
+    """
+    return len(neon_db.execute_write_query(query, ([int(submission_id) for submission_id in submission_ids],)))
+
+def requeue_stale_submissions(stale_after_seconds: float) -> int:
+    """
+    Reset 'processing' submissions whose worker died: claimed, or last heartbeat
+    (see touch_submissions), more than `stale_after_seconds` ago
+    """
+    query = """
+    UPDATE submissions
+    SET status = 'pending', processing_started_at = NULL
+    WHERE status = 'processing'
+      AND (processing_started_at IS NULL
+           OR processing_started_at < CURRENT_TIMESTAMP - make_interval(secs => %s))
+    RETURNING id
+    """
+    return len(neon_db.execute_write_query(query, (stale_after_seconds,)))
+
+def get_pending_submission_ids() -> list:
+    """Ids of submissions waiting to be processed, oldest first"""
+    query = """
+    SELECT id FROM submissions
+    WHERE status = 'pending'
+    ORDER BY created_at, id
+    """
+    return [str(row['id']) for row in neon_db.execute_query(query)]
+
+def _complete_submission(submission_id: str, processing_result: Dict[str, Any], progress: Callable[..., None]) -> Optional[SubmissionResponse]:
+    """Store a completed result on the submission"""
+    update_complete_query = """
+    UPDATE submissions
+    SET status = 'completed', processing_result = %s, nodes_count = %s, links_count = %s,
+        error_message = NULL, processed_at = CURRENT_TIMESTAMP
+    WHERE id = %s
+    RETURNING id, user_id, submission_type, input_data, input_url, file_path, file_name, file_size, status, processing_result, tags, created_at, processed_at
+    """
+    
+    result_json = json.dumps(processing_result)
+    update_result = neon_db.execute_write_query(update_complete_query, (
+        result_json, processing_result.get("nodes_count"), processing_result.get("links_count"), submission_id
+    ))
+    
+    progress("completed", nodes_count=processing_result["nodes_count"], links_count=processing_result["links_count"])
+    
+    if update_result and len(update_result) > 0:
+        row = update_result[0]
+        return SubmissionResponse(
+            id=str(row['id']),
+            user_id=str(row['user_id']),
+            submission_type=row['submission_type'],
+            input_data=row.get('input_data'),
+            input_url=row.get('input_url'),
+            file_name=row.get('file_name'),
+            file_size=row.get('file_size'),
+            status=row['status'],
+            processing_result=row.get('processing_result'),
+            tags=row.get('tags', []),
+            created_at=row['created_at'],
+            processed_at=row.get('processed_at')
+        )
+    
+    return None
+
+def defer_submissions(submission_ids: List[str]) -> int:
+    """Hand claimed submissions back to the queue ('processing' -> 'pending')"""
+    if not submission_ids:
+        return 0
+    query = """
+    UPDATE submissions
+    SET status = 'pending', processing_started_at = NULL
+    WHERE id = ANY(%s::int[]) AND status = 'processing'
+    RETURNING id
+    """
+    return len(neon_db.execute_write_query(query, ([int(submission_id) for submission_id in submission_ids],)))
+
+def _stored_or_lead(submission_id: str, fingerprint: str) -> Tuple[Optional[Dict[str, Any]], Optional[bool]]:
+    """
+    A stored result for `fingerprint`, or whether this submission may process it.
+    Returns (stored result, owns): owns is True when this submission now owns the fingerprint on
+    this instance, False when it has to wait for an identical submission, and None when that one
+    looks stuck and this submission should be processed independently.
+    """
+    stored = get_stored_result(fingerprint)
+    if stored is not None:
+        return stored, False
+    # Give up waiting well before the sweeper would consider the owner abandoned
+    return None, in_flight.claim(fingerprint, submission_id, Config.SUBMISSION_STALE_AFTER / 2)
+
+def process_submission(
+    submission_id: str,
+    pdf_extractor: Callable[..., Tuple[str, Optional[str]]] = extract_text_from_pdf,
+    progress: Callable[..., None] = _no_progress
+) -> Optional[SubmissionResponse]:
+    """
+    Process a pending submission: pending -> processing -> completed/failed
+    `pdf_extractor` lets the worker run PDF parsing in a separate process;
+    `progress(stage, **fields)` is called as the submission moves through its stages.
+    A stored result for identical content (see submission_results.py) is reused as is; while an
+    identical submission is being processed, this one is returned to 'pending' (status in the result).
+    """
+    claimed = False
+    fingerprint = None
+    owns_fingerprint = False
     try:
-        # Get submission
-        query = """
-        SELECT id, user_id, submission_type, input_data, input_url, file_path, file_name, tags
-        FROM submissions
-        WHERE id = %s
-        """
-        result = neon_db.execute_query(query, (submission_id,))
-        
-        if not result or len(result) == 0:
+        submission = claim_submission(submission_id)
+        if not submission:
             return None
+        claimed = True
+        progress("processing")
+        tags = submission.get('tags', [])
         
-        submission = result[0]
-        
-        # Update status to processing
-        update_status_query = """
-        UPDATE submissions
-        SET status = 'processing'
-        WHERE id = %s
-        """
-        neon_db.execute_write_query(update_status_query, (submission_id,))
+        fingerprint = submission_fingerprint(submission)
+        if fingerprint:
+            stored, owns = _stored_or_lead(submission_id, fingerprint)
+            if stored is not None:
+                logger.info(f"Submission {submission_id} reuses the stored result for {fingerprint}")
+                return _complete_submission(submission_id, {**stored, "tags": tags, "reused": True}, progress)
+            if owns is False:
+                # Don't hold a worker thread while the identical submission runs: back to
+                # 'pending', re-enqueued by in_flight.release() (or the sweeper) when it finishes
+                defer_submissions([submission_id])
+                claimed = False
+                progress("waiting")
+                logger.info(f"Submission {submission_id} waits for an identical submission ({fingerprint})")
+                return get_submission(submission_id)
+            owns_fingerprint = bool(owns)
         
         # Extract content based on type
         content = ""
@@ -186,11 +364,17 @@ def process_submission(submission_id: str) -> Optional[SubmissionResponse]:
         if submission['submission_type'] == 'text':
             content = submission.get('input_data', '')
         elif submission['submission_type'] == 'url':
-            content, error_msg = extract_text_from_url(submission.get('input_url', ''))
+            progress("fetching", url=submission.get('input_url'))
+            content, error_msg = fetch_url_text(submission.get('input_url', ''))
         elif submission['submission_type'] == 'pdf':
             file_path = submission.get('file_path')
             if file_path and os.path.exists(file_path):
-                content, error_msg = extract_text_from_pdf(file_path)
+                progress("extracting", file_name=submission.get('file_name'))
+                content, error_msg = pdf_extractor(
+                    file_path,
+                    file_sha256_hex=submission.get('file_sha256'),
+                    on_progress=lambda page, pages: progress("extracting", page=page, pages=pages)
+                )
             else:
                 error_msg = "PDF file not found"
         
@@ -198,60 +382,59 @@ def process_submission(submission_id: str) -> Optional[SubmissionResponse]:
             # Update status to failed
             update_failed_query = """
             UPDATE submissions
-            SET status = 'failed', processing_result = %s, processed_at = CURRENT_TIMESTAMP
-            WHERE id = %s
+            SET status = 'failed', processing_result = %s, error_message = %s, processed_at = CURRENT_TIMESTAMP
+            WHERE id = %s AND status = 'processing'
             """
-            error_result = json.dumps({"error": error_msg or "No content extracted"})
-            neon_db.execute_write_query(update_failed_query, (error_result, submission_id))
+            error_msg = error_msg or "No content extracted"
+            error_result = json.dumps({"error": error_msg})
+            neon_db.execute_write_query(update_failed_query, (error_result, error_msg[:500], submission_id))
+            progress("failed", error=error_msg)
             return None
         
-        # Process content to generate graph data
-        tags = submission.get('tags', [])
-        processing_result = process_submission_content(content, tags)
+        # Same content reached another way (other URL, pasted text, re-exported PDF)
+        content_fingerprint = text_fingerprint(content)
+        if content_fingerprint != fingerprint:
+            stored = get_stored_result(content_fingerprint)
+            if stored is not None:
+                logger.info(f"Submission {submission_id} reuses the stored result for its content")
+                return _complete_submission(submission_id, {**stored, "tags": tags, "reused": True}, progress)
         
-        # Update submission with results
-        update_complete_query = """
-        UPDATE submissions
-        SET status = 'completed', processing_result = %s, processed_at = CURRENT_TIMESTAMP
-        WHERE id = %s
-        RETURNING id, user_id, submission_type, input_data, input_url, file_path, file_name, file_size, status, processing_result, tags, created_at, processed_at
-        """
-        
-        result_json = json.dumps(processing_result)
-        update_result = neon_db.execute_write_query(update_complete_query, (result_json, submission_id))
-        
-        if update_result and len(update_result) > 0:
-            row = update_result[0]
-            return SubmissionResponse(
-                id=str(row['id']),
-                user_id=str(row['user_id']),
-                submission_type=row['submission_type'],
-                input_data=row.get('input_data'),
-                input_url=row.get('input_url'),
-                file_name=row.get('file_name'),
-                file_size=row.get('file_size'),
-                status=row['status'],
-                processing_result=row.get('processing_result'),
-                tags=row.get('tags', []),
-                created_at=row['created_at'],
-                processed_at=row.get('processed_at')
-            )
+        # Process content to generate graph data
+        processing_result = process_submission_content(content, tags, progress)
+        store_result([fingerprint, content_fingerprint], processing_result)
         
-        return None
+        return _complete_submission(submission_id, processing_result, progress)
+    except (CancelledError, BrokenExecutor) as e:
+        # The worker's PDF process pool was shut down (app stopping) or died: not a problem
+        # with this submission, so it goes back to the queue instead of failing
+        logger.warning(f"Submission {submission_id} interrupted, re-queuing: {e!r}")
+        if claimed:
+            try:
+                defer_submissions([submission_id])
+            except Exception as defer_error:
+                logger.error(f"Could not re-queue submission {submission_id}: {defer_error}")
+            progress("pending")
+        return get_submission(submission_id)
     except Exception as e:
         logger.error(f"Error processing submission: {e}")
-        # Update status to failed
+        # Update status to failed (only if this worker had claimed it)
         try:
             update_failed_query = """
             UPDATE submissions
-            SET status = 'failed', processing_result = %s, processed_at = CURRENT_TIMESTAMP
-            WHERE id = %s
+            SET status = 'failed', processing_result = %s, error_message = %s, processed_at = CURRENT_TIMESTAMP
+            WHERE id = %s AND status = 'processing'
             """
             error_result = json.dumps({"error": str(e)})
-            neon_db.execute_write_query(update_failed_query, (error_result, submission_id))
+            neon_db.execute_write_query(update_failed_query, (error_result, str(e)[:500], submission_id))
         except:
             pass
+        if claimed:
+            progress("failed", error=str(e))
         return None
+    finally:
+        if owns_fingerprint:
+            # Waiting duplicates are re-enqueued: they re-check the store (or take over after a failure)
+            in_flight.release(fingerprint)
 
 def get_submission(submission_id: str) -> Optional[SubmissionResponse]:
     """Get a submission by ID"""
@@ -288,85 +471,71 @@ def get_submission(submission_id: str) -> Optional[SubmissionResponse]:
         logger.error(f"Error getting submission: {e}")
         return None
 
-def get_user_submissions(user_id: str, limit: int = 50, offset: int = 0) -> list:
-    """Get all submissions for a user"""
+SUMMARY_COLUMNS = "s.id, s.user_id, s.submission_type, s.input_url, s.file_name, s.file_size, s.status, s.nodes_count, s.links_count, s.error_message, s.tags, s.created_at, s.processed_at"
+
+def _summary_from_row(row: Dict[str, Any]) -> SubmissionSummary:
+    return SubmissionSummary(
+        id=str(row['id']),
+        user_id=str(row['user_id']),
+        submission_type=row['submission_type'],
+        input_url=row.get('input_url'),
+        file_name=row.get('file_name'),
+        file_size=row.get('file_size'),
+        status=row['status'],
+        nodes_count=row.get('nodes_count'),
+        links_count=row.get('links_count'),
+        error_message=row.get('error_message'),
+        tags=row.get('tags', []),
+        created_at=row['created_at'],
+        processed_at=row.get('processed_at')
+    )
+
+def get_user_submissions(user_id: str, limit: int = 50, offset: int = 0, after: Optional[tuple] = None) -> List[SubmissionSummary]:
+    """
+    List a user's submissions, without their processing results (see get_submission)
+    `after` = (created_at, id) of the previous page's last row
+    """
     try:
-        query = """
-        SELECT id, user_id, submission_type, input_data, input_url, file_path, file_name, file_size, status, processing_result, tags, created_at, processed_at
-        FROM submissions
-        WHERE user_id = %s
-        ORDER BY created_at DESC
+        keyset = "AND (s.created_at, s.id) < (%s, %s)" if after else ""
+        query = f"""
+        SELECT {SUMMARY_COLUMNS}
+        FROM submissions s
+        WHERE s.user_id = %s {keyset}
+        ORDER BY s.created_at DESC, s.id DESC
         LIMIT %s OFFSET %s
         """
-        result = neon_db.execute_query(query, (user_id, limit, offset))
-        
-        submissions = []
-        for row in result:
-            processing_result = row.get('processing_result')
-            if isinstance(processing_result, str):
-                try:
-                    processing_result = json.loads(processing_result)
-                except:
-                    processing_result = None
-            
-            submissions.append(SubmissionResponse(
-                id=str(row['id']),
-                user_id=str(row['user_id']),
-                submission_type=row['submission_type'],
-                input_data=row.get('input_data'),
-                input_url=row.get('input_url'),
-                file_name=row.get('file_name'),
-                file_size=row.get('file_size'),
-                status=row['status'],
-                processing_result=processing_result,
-                tags=row.get('tags', []),
-                created_at=row['created_at'],
-                processed_at=row.get('processed_at')
-            ))
-        
-        return submissions
+        params = (user_id, *after[:2], limit, 0) if after else (user_id, limit, offset)
+        result = neon_db.execute_query(query, params)
+        return [_summary_from_row(row) for row in result]
     except Exception as e:
         logger.error(f"Error getting user submissions: {e}")
         return []
 
-def get_all_submissions(limit: int = 100, offset: int = 0) -> list:
-    """Get all submissions (for admin)"""
+def get_all_submissions(limit: int = 100, offset: int = 0, after: Optional[tuple] = None) -> list:
+    """
+    List all submissions (for admin), without their processing results
+    `after` = (created_at, id) of the previous page's last row
+    """
     try:
-        query = """
-        SELECT s.id, s.user_id, s.submission_type, s.input_data, s.input_url, s.file_path, s.file_name, s.file_size, s.status, s.processing_result, s.tags, s.created_at, s.processed_at,
+        keyset = "WHERE (s.created_at, s.id) < (%s, %s)" if after else ""
+        query = f"""
+        SELECT {SUMMARY_COLUMNS},
                u.email as user_email, u.full_name as user_name
         FROM submissions s
         LEFT JOIN users u ON s.user_id = u.id
-        ORDER BY s.created_at DESC
+        {keyset}
+        ORDER BY s.created_at DESC, s.id DESC
         LIMIT %s OFFSET %s
         """
-        result = neon_db.execute_query(query, (limit, offset))
+        params = (*after[:2], limit, 0) if after else (limit, offset)
+        result = neon_db.execute_query(query, params)
         
         submissions = []
         for row in result:
-            processing_result = row.get('processing_result')
-            if isinstance(processing_result, str):
-                try:
-                    processing_result = json.loads(processing_result)
-                except:
-                    processing_result = None
-            
-            submissions.append({
-                "id": str(row['id']),
-                "user_id": str(row['user_id']),
-                "user_email": row.get('user_email'),
-                "user_name": row.get('user_name'),
-                "submission_type": row['submission_type'],
-                "input_data": row.get('input_data'),
-                "input_url": row.get('input_url'),
-                "file_name": row.get('file_name'),
-                "file_size": row.get('file_size'),
-                "status": row['status'],
-                "processing_result": processing_result,
-                "tags": row.get('tags', []),
-                "created_at": row['created_at'].isoformat() if row.get('created_at') else None,
-                "processed_at": row['processed_at'].isoformat() if row.get('processed_at') else None
-            })
+            submission = _summary_from_row(row).model_dump(mode="json")
+            submission["user_email"] = row.get('user_email')
+            submission["user_name"] = row.get('user_name')
+            submissions.append(submission)
         
         return submissions
     except Exception as e:
@@ -0,0 +1,235 @@
+"""
+Background processing of submissions.
+
+POST /api/submissions only stores the submission as 'pending' and enqueues its id.
+A pool of SUBMISSION_WORKERS threads processes jobs (URL fetches, GROK calls and
+Neo4j queries are I/O bound); PDF text extraction is CPU bound and runs in a pool of
+SUBMISSION_PDF_PROCESSES worker processes (page ranges of one PDF are parsed in parallel).
+
+Postgres is the source of truth for the queue: a worker claims a submission with an
+atomic pending -> processing update, so a job is processed once even if it is enqueued
+twice or by several app instances. A submission identical to one already running here is
+handed back to 'pending' and re-enqueued when that one finishes (see submission_results.py).
+While a job runs, its processing_started_at is refreshed on every sweep (a heartbeat). On
+startup and then every sweep, submissions without a heartbeat for longer than
+SUBMISSION_STALE_AFTER seconds (their worker died) are reset to 'pending', and all pending
+submissions are enqueued again. The sweeper also prunes the on-disk text caches hourly,
+expiring entries after SUBMISSION_RESULT_TTL_DAYS.
+"""
+import logging
+import multiprocessing
+import threading
+import time
+from concurrent.futures import BrokenExecutor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Optional, Tuple
+
+from config import Config
+from pdf_extraction import extract_text_from_pdf, prune_text_cache
+from submission_progress import submission_progress
+from submission_results import in_flight
+from submission_service import process_submission, requeue_stale_submissions, get_pending_submission_ids, touch_submissions, defer_submissions
+from url_fetcher import prune_cache as prune_url_cache
+
+logger = logging.getLogger(__name__)
+
+# Seconds between prunes of the on-disk text caches (entries expire with stored results)
+CACHE_PRUNE_INTERVAL = 3600
+
+
+class SubmissionWorker:
+    """Thread pool for submission jobs plus a process pool for PDF parsing"""
+
+    def __init__(self, workers: int, pdf_processes: int, stale_after: float):
+        self.workers = workers
+        self.pdf_processes = pdf_processes
+        self.stale_after = stale_after
+        self._threads: Optional[ThreadPoolExecutor] = None
+        self._processes: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._queued = set()
+        # Submissions whose job is executing in this instance (heartbeat targets)
+        self._running = set()
+        # Enqueued again while executing (e.g. deferred behind a duplicate): run once more afterwards
+        self._rerun = set()
+        self._stop = threading.Event()
+        self._sweeper: Optional[threading.Thread] = None
+        self._pruned_at = 0.0
+        self.completed = 0
+        self.failed = 0
+
+    @property
+    def running(self) -> bool:
+        return self._threads is not None
+
+    def start(self):
+        """Start the pools and pick up pending or interrupted submissions"""
+        if self.running:
+            return
+        self._threads = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="submission")
+        # Spawn, not fork: the parent already runs threads and holds Neo4j/Postgres sockets
+        self._processes = self._create_process_pool()
+        logger.info(f"Submission worker started ({self.workers} threads, {self.pdf_processes} PDF processes)")
+        self._stop.clear()
+        self._sweeper = threading.Thread(target=self._sweep_loop, name="submission-sweeper", daemon=True)
+        self._sweeper.start()
+        # Submissions deferred behind an identical one are re-enqueued when it finishes
+        in_flight.on_release = self.enqueue
+
+    def _create_process_pool(self) -> ProcessPoolExecutor:
+        # Spawn, not fork: the parent already runs threads and holds Neo4j/Postgres sockets
+        return ProcessPoolExecutor(max_workers=self.pdf_processes, mp_context=multiprocessing.get_context("spawn"))
+
+    def stop(self):
+        """
+        Stop accepting jobs. Queued jobs stay 'pending'; jobs still running here are reset to
+        'pending' before the pools shut down, so all of them resume on next start.
+        """
+        if not self.running:
+            return
+        self._stop.set()
+        with self._lock:
+            threads, processes = self._threads, self._processes
+            self._threads = self._processes = None
+            self._queued.clear()
+            self._rerun.clear()
+            running = list(self._running)
+        threads.shutdown(wait=False, cancel_futures=True)
+        try:
+            # Running PDF jobs see their page ranges cancelled and re-queue themselves too,
+            # but other jobs may be cut off by the process exiting
+            requeued = defer_submissions(running)
+            if requeued:
+                logger.info(f"Reset {requeued} running submission(s) to 'pending'")
+        except Exception as e:
+            logger.error(f"Could not reset running submissions: {e}")
+        processes.shutdown(wait=False, cancel_futures=True)
+        logger.info(f"Submission worker stopped ({self.completed} completed, {self.failed} failed)")
+
+    def enqueue(self, submission_id: str) -> bool:
+        """Queue a submission for processing; False if the worker is not running"""
+        submission_id = str(submission_id)
+        with self._lock:
+            if not self.running:
+                return False
+            if submission_id in self._queued:
+                if submission_id in self._running:
+                    self._rerun.add(submission_id)
+                return True
+            self._queued.add(submission_id)
+            self._threads.submit(self._run, submission_id)
+        submission_progress.publish(submission_id, "pending")
+        return True
+
+    def stats(self) -> dict:
+        return {
+            "running": self.running,
+            "workers": self.workers,
+            "pdf_processes": self.pdf_processes,
+            "queued": len(self._queued),
+            "running_jobs": len(self._running),
+            "completed": self.completed,
+            "failed": self.failed,
+        }
+
+    def _sweep_loop(self):
+        # Several heartbeats per stale period, so a live job is never taken for abandoned
+        interval = min(60.0, self.stale_after / 3)
+        while True:
+            self._recover()
+            self._prune_caches()
+            if self._stop.wait(interval):
+                return
+
+    def _recover(self):
+        with self._lock:
+            running = list(self._running)
+        try:
+            # Heartbeat first, so this instance's own long jobs are never re-queued
+            touch_submissions(running)
+        except Exception as e:
+            logger.error(f"Could not refresh running submissions: {e}")
+            return
+        try:
+            requeued = requeue_stale_submissions(self.stale_after)
+            if requeued:
+                logger.warning(f"Re-queued {requeued} submission(s) interrupted while processing")
+            pending = get_pending_submission_ids()
+        except Exception as e:
+            logger.error(f"Could not recover pending submissions: {e}")
+            return
+        for submission_id in pending:
+            self.enqueue(submission_id)
+        if pending:
+            logger.info(f"Enqueued {len(pending)} pending submission(s)")
+
+    def _prune_caches(self):
+        now = time.monotonic()
+        if self._pruned_at and now - self._pruned_at < CACHE_PRUNE_INTERVAL:
+            return
+        self._pruned_at = now
+        max_age = Config.SUBMISSION_RESULT_TTL_DAYS * 86400
+        try:
+            removed = prune_text_cache(max_age)
+            if removed:
+                logger.info(f"Pruned {removed} cached PDF text(s) older than {Config.SUBMISSION_RESULT_TTL_DAYS} days")
+        except Exception as e:
+            logger.warning(f"Could not prune the PDF text cache: {e}")
+        try:
+            removed = prune_url_cache(max_age)
+            if removed:
+                logger.info(f"Pruned {removed} URL cache file(s) older than {Config.SUBMISSION_RESULT_TTL_DAYS} days")
+        except Exception as e:
+            logger.warning(f"Could not prune the URL cache: {e}")
+
+    def _extract_pdf(self, file_path: str, **kwargs) -> Tuple[str, Optional[str]]:
+        # Runs in the job's thread; page ranges go to the process pool
+        processes = self._processes
+        try:
+            return extract_text_from_pdf(
+                file_path,
+                executor=processes,
+                max_in_flight=max(2, self.pdf_processes * 2),
+                **kwargs
+            )
+        except BrokenExecutor:
+            # A worker process died: replace the pool so re-queued jobs don't hit it again
+            with self._lock:
+                if self.running and self._processes is processes:
+                    logger.error("PDF process pool broke; starting a new one")
+                    self._processes = self._create_process_pool()
+                    processes.shutdown(wait=False, cancel_futures=True)
+            raise
+
+    def _run(self, submission_id: str):
+        with self._lock:
+            self._running.add(submission_id)
+        try:
+            result = process_submission(
+                submission_id,
+                pdf_extractor=self._extract_pdf,
+                progress=lambda stage, **fields: submission_progress.publish(submission_id, stage, **fields),
+            )
+            if result and result.status == 'completed':
+                self.completed += 1
+            elif not (result and result.status == 'pending'):
+                # 'pending' means deferred behind an identical submission, not failed
+                self.failed += 1
+        except Exception as e:
+            self.failed += 1
+            logger.exception(f"Submission {submission_id} crashed the worker: {e}")
+        finally:
+            with self._lock:
+                self._running.discard(submission_id)
+                if submission_id in self._rerun and self.running:
+                    self._rerun.discard(submission_id)
+                    self._threads.submit(self._run, submission_id)
+                else:
+                    self._rerun.discard(submission_id)
+                    self._queued.discard(submission_id)
+
+
+submission_worker = SubmissionWorker(
+    workers=Config.SUBMISSION_WORKERS,
+    pdf_processes=Config.SUBMISSION_PDF_PROCESSES,
+    stale_after=Config.SUBMISSION_STALE_AFTER,
+)
@@ -3,7 +3,7 @@ Subscription management service for PostgreSQL
 Handles subscription tiers, limits, and tracking
 """
 from typing import Optional, Dict
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from neon_database import neon_db
 from models import UserSubscriptionResponse, SubscriptionPlan
 import logging
@@ -50,6 +50,20 @@ def get_subscription_plan(tier: str) -> Optional[SubscriptionPlan]:
     """Get subscription plan details for a tier"""
     return SUBSCRIPTION_PLANS.get(tier.lower())
 
+def current_usage_month() -> date:
+    """Key of the current month in rate_limit_monthly_usage (UTC)"""
+    return datetime.utcnow().date().replace(day=1)
+
+def get_requests_this_month(user_id: str) -> int:
+    """Requests recorded for a user this month (one primary key lookup on rate_limit_monthly_usage)"""
+    query = """
+    SELECT request_count
+    FROM rate_limit_monthly_usage
+    WHERE user_id = %s AND month = %s
+    """
+    result = neon_db.execute_query(query, (user_id, current_usage_month()))
+    return result[0]['request_count'] if result else 0
+
 def get_user_subscription(user_id: str) -> Optional[UserSubscriptionResponse]:
     """Get user subscription details"""
     try:
@@ -72,17 +86,7 @@ def get_user_subscription(user_id: str) -> Optional[UserSubscriptionResponse]:
         if not plan:
             plan = get_subscription_plan('free')
         
-        # Get requests this month
-        now = datetime.utcnow()
-        month_start = datetime(now.year, now.month, 1)
-        
-        count_query = """
-        SELECT COUNT(*) as count
-        FROM rate_limit_tracking
-        WHERE user_id = %s AND request_timestamp >= %s
-        """
-        count_result = neon_db.execute_query(count_query, (user_id, month_start))
-        requests_this_month = count_result[0]['count'] if count_result else 0
+        requests_this_month = get_requests_this_month(user_id)
         
         return UserSubscriptionResponse(
             user_id=str(user['id']),
@@ -0,0 +1,251 @@
+"""
+Fetching and text extraction for URL submissions.
+
+- One pooled keep-alive requests.Session shared by the submission worker threads
+- Responses are revalidated with If-None-Match / If-Modified-Since against what was
+  stored for the URL last time; a 304 reuses the stored text without downloading or parsing
+- Extracted text is stored once per content hash (uploads/.url_cache/text/<sha256>.txt),
+  so the same article reached through different URLs is kept once
+- Cache entries not written or revalidated for SUBMISSION_RESULT_TTL_DAYS are removed by
+  the submission worker's sweeper (prune_cache)
+- HTML is fed to lxml's parser chunk by chunk as it downloads, collecting text through a
+  parser target (no tree is built); reading stops at URL_FETCH_MAX_BYTES
+"""
+from typing import Optional, Tuple
+import codecs
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+from lxml import etree
+
+from config import Config
+
+logger = logging.getLogger(__name__)
+
+# Same text budget as PDF submissions
+MAX_TEXT_CHARS = 50000
+URL_CACHE_DIR = os.path.join(os.path.dirname(__file__), "uploads", ".url_cache")
+FETCH_CHUNK_SIZE = 64 * 1024
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+
+META_CHARSET = re.compile(rb'<meta[^>]+charset=["\']?([\w-]+)', re.IGNORECASE)
+
+# Elements whose text is not page content
+SKIPPED_TAGS = {"script", "style"}
+
+
+def _create_session() -> requests.Session:
+    session = requests.Session()
+    # One connection per worker thread per host, kept alive between submissions
+    adapter = HTTPAdapter(pool_connections=16, pool_maxsize=max(Config.SUBMISSION_WORKERS, 1))
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update({'User-Agent': USER_AGENT})
+    return session
+
+
+session = _create_session()
+
+
+class _TextCollector:
+    """lxml parser target collecting text outside <script>/<style>"""
+
+    def __init__(self):
+        self.parts = []
+        self._skip_depth = 0
+
+    def start(self, tag, attrib):
+        if tag in SKIPPED_TAGS:
+            self._skip_depth += 1
+
+    def end(self, tag):
+        if tag in SKIPPED_TAGS and self._skip_depth:
+            self._skip_depth -= 1
+
+    def data(self, data):
+        if not self._skip_depth:
+            self.parts.append(data)
+
+    def comment(self, text):
+        pass
+
+    def close(self) -> str:
+        return "".join(self.parts)
+
+
+def _clean_text(text: str) -> str:
+    lines = (line.strip() for line in text.splitlines())
+    chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
+    return ' '.join(chunk for chunk in chunks if chunk)[:MAX_TEXT_CHARS]
+
+
+def _known_charset(name: str) -> Optional[str]:
+    try:
+        codecs.lookup(name)
+        return name
+    except LookupError:
+        return None
+
+
+def _detect_charset(content_type: str, head: bytes) -> str:
+    """
+    Charset from the Content-Type header, else a <meta> tag near the top, else UTF-8.
+    Names Python doesn't know (e.g. "foo", "x-user-defined") are ignored.
+    """
+    for param in content_type.split(";")[1:]:
+        key, _, value = param.strip().partition("=")
+        if key.lower() == "charset" and value:
+            charset = _known_charset(value.strip('"\' '))
+            if charset:
+                return charset
+    match = META_CHARSET.search(head[:4096])
+    if match:
+        charset = _known_charset(match.group(1).decode('ascii'))
+        if charset:
+            return charset
+    return 'utf-8'
+
+
+def _parse_streamed(response: requests.Response, max_bytes: int) -> str:
+    """Feed the body to lxml as it arrives and return its cleaned-up text"""
+    parser = None
+    received = 0
+    for chunk in response.iter_content(FETCH_CHUNK_SIZE):
+        if received + len(chunk) > max_bytes:
+            chunk = chunk[:max_bytes - received]
+            logger.warning(f"Response from {response.url} exceeds {max_bytes} bytes; using the first {max_bytes}")
+        received += len(chunk)
+        if chunk:
+            if parser is None:
+                charset = _detect_charset(response.headers.get("Content-Type", ""), chunk)
+                try:
+                    parser = etree.HTMLParser(target=_TextCollector(), encoding=charset)
+                except LookupError:
+                    # Known to Python but not to libxml2
+                    parser = etree.HTMLParser(target=_TextCollector(), encoding='utf-8')
+            parser.feed(chunk)
+        if received >= max_bytes:
+            break
+    if parser is None:
+        return ""
+    return _clean_text(parser.close())
+
+
+def _cache_path(*parts: str) -> str:
+    return os.path.join(URL_CACHE_DIR, *parts)
+
+
+def _read_file(path: str) -> Optional[str]:
+    try:
+        with open(path, 'r', encoding='utf-8') as file:
+            return file.read()
+    except OSError:
+        return None
+
+
+def _write_file(path: str, content: str):
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, 'w', encoding='utf-8') as file:
+            file.write(content)
+        os.replace(temp_path, path)
+    except OSError as e:
+        logger.warning(f"Could not write URL cache entry {path}: {e}")
+
+
+def _touch(*paths: str):
+    """Mark cache files as still in use, so prune_cache keeps them"""
+    for path in paths:
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+
+def prune_cache(max_age_seconds: float) -> int:
+    """Remove URL entries and texts not written or revalidated in `max_age_seconds`; returns the number removed"""
+    cutoff = time.time() - max_age_seconds
+    removed = 0
+    for directory in ("urls", "text"):
+        try:
+            entries = list(os.scandir(_cache_path(directory)))
+        except OSError:
+            continue
+        for entry in entries:
+            try:
+                if entry.is_file() and entry.stat().st_mtime < cutoff:
+                    os.remove(entry.path)
+                    removed += 1
+            except OSError:
+                # Removed concurrently, or still being written
+                pass
+    return removed
+
+
+def _read_entry(url_key: str) -> Optional[dict]:
+    """Stored validators and text hash for a URL, if its text is still cached"""
+    raw = _read_file(_cache_path("urls", f"{url_key}.json"))
+    if raw is None:
+        return None
+    try:
+        entry = json.loads(raw)
+    except ValueError:
+        return None
+    if not os.path.exists(_cache_path("text", f"{entry.get('text_sha256')}.txt")):
+        return None
+    return entry
+
+
+def _store(url_key: str, url: str, response: requests.Response, text: str) -> str:
+    text_sha256 = hashlib.sha256(text.encode('utf-8')).hexdigest()
+    text_path = _cache_path("text", f"{text_sha256}.txt")
+    if not os.path.exists(text_path):
+        _write_file(text_path, text)
+    else:
+        _touch(text_path)
+    _write_file(_cache_path("urls", f"{url_key}.json"), json.dumps({
+        "url": url,
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified"),
+        "text_sha256": text_sha256,
+    }))
+    return text_sha256
+
+
+def fetch_url_text(url: str) -> Tuple[str, Optional[str]]:
+    """
+    Fetch a URL and extract its text content
+    Returns (text_content, error_message)
+    """
+    try:
+        url_key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        entry = _read_entry(url_key)
+        headers = {}
+        if entry:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+        with session.get(url, timeout=Config.URL_FETCH_TIMEOUT, headers=headers, stream=True) as response:
+            if response.status_code == 304 and entry:
+                logger.info(f"{url} not modified; using cached text")
+                text_path = _cache_path("text", f"{entry['text_sha256']}.txt")
+                _touch(_cache_path("urls", f"{url_key}.json"), text_path)
+                return _read_file(text_path) or "", None
+            response.raise_for_status()
+            text = _parse_streamed(response, Config.URL_FETCH_MAX_BYTES)
+
+        _store(url_key, url, response, text)
+        return text, None
+    except Exception as e:
+        logger.error(f"Error extracting text from URL {url}: {e}")
+        return "", str(e)
@@ -1,9 +1,10 @@
 """
 User service for managing user data in PostgreSQL (Neon) database
 """
-from typing import Optional, Dict
+from typing import Optional, Dict, Tuple
 from datetime import datetime
 import logging
+import time
 from neon_database import neon_db
 from auth import get_password_hash, verify_password
 from models import UserCreate, UserResponse
@@ -333,86 +334,124 @@ def update_user_profile(user_id: str, updates: Dict) -> Optional[UserResponse]:
         logger.error(f"Error updating user profile: {e}")
         return None
 
-def get_all_users(limit: int = 100, offset: int = 0) -> list:
+# Users and admin users are listed together, newest first. Rows created in the same instant
+# are ordered by source table and then id, so (created_at, source, id) is a unique sort key.
+USER_SOURCES = {
+    "users": """
+        SELECT id, email, full_name, profile_picture, auth_provider, is_active, is_admin,
+               {subscription_columns},
+               created_at, updated_at, 'users' AS source
+        FROM users
+    """,
+    "admin_users": """
+        SELECT id, email, full_name, profile_picture, auth_provider, is_active, is_admin,
+               'free', 'active', NULL::timestamp, NULL::timestamp,
+               created_at, updated_at, 'admin_users' AS source
+        FROM admin_users
+    """,
+}
+
+# Added to users by migrate_subscriptions.py; listed as NULL (free/active) until it has run
+SUBSCRIPTION_COLUMNS = {
+    "subscription_tier": "varchar",
+    "subscription_status": "varchar",
+    "subscription_start_date": "timestamp",
+    "subscription_end_date": "timestamp",
+}
+SCHEMA_CHECK_INTERVAL = 60
+_subscription_columns_state = {"present": None, "checked_at": 0.0}
+
+def _user_subscription_columns() -> str:
+    """Select list for the users branch, with NULL for subscription columns that don't exist yet"""
+    now = time.monotonic()
+    state = _subscription_columns_state
+    if state["present"] is None or now - state["checked_at"] > SCHEMA_CHECK_INTERVAL:
+        try:
+            result = neon_db.execute_query("""
+            SELECT column_name FROM information_schema.columns
+            WHERE table_name = 'users' AND column_name = ANY(%s)
+            """, (list(SUBSCRIPTION_COLUMNS),))
+            state["present"] = {row['column_name'] for row in result}
+        except Exception as e:
+            logger.warning(f"Could not check for subscription columns on users: {e}")
+            state["present"] = set(SUBSCRIPTION_COLUMNS)
+        state["checked_at"] = now
+        missing = set(SUBSCRIPTION_COLUMNS) - state["present"]
+        if missing:
+            logger.warning(f"users lacks {', '.join(sorted(missing))}; run migrate_subscriptions.py")
+    return ", ".join(
+        column if column in state["present"] else f"NULL::{column_type} AS {column}"
+        for column, column_type in SUBSCRIPTION_COLUMNS.items()
+    )
+
+def _users_after_clause(source: str, after: Optional[tuple]) -> Tuple[str, tuple]:
+    """WHERE clause selecting the rows of one source table that sort after `after`"""
+    if not after:
+        return "", ()
+    created_at, row_id = after[0], after[1]
+    after_source = after[2] if len(after) > 2 else "users"
+    if source == after_source:
+        return "WHERE (created_at, id) < (%s, %s)", (created_at, row_id)
+    if source < after_source:
+        return "WHERE created_at <= %s", (created_at,)
+    return "WHERE created_at < %s", (created_at,)
+
+def get_all_users(limit: int = 100, offset: int = 0, after: Optional[tuple] = None) -> list:
     """
     Get all users from PostgreSQL database (for admin)
     Includes both regular users and admin users
     
     Args:
         limit: Maximum number of users to return
-        offset: Number of users to skip
+        offset: Number of users to skip (ignored when `after` is given)
+        after: (created_at, id, source) of the previous page's last user, see pagination.py
     
     Returns:
         List of user dictionaries with subscription info
     """
     try:
-        all_users = []
-        
-        # Query regular users table
-        try:
-            users_query = """
-            SELECT id, email, full_name, profile_picture, auth_provider, is_active, is_admin,
-                   subscription_tier, subscription_status, subscription_start_date, subscription_end_date,
-                   created_at, updated_at
-            FROM users
-            ORDER BY created_at DESC
-            """
-            users_result = neon_db.execute_query(users_query)
-            if users_result:
-                for row in users_result:
-                    all_users.append({
-                        "id": str(row['id']),
-                        "email": row['email'],
-                        "full_name": row.get('full_name'),
-                        "profile_picture": row.get('profile_picture'),
-                        "auth_provider": row.get('auth_provider', 'local'),
-                        "is_active": row.get('is_active', True),
-                        "is_admin": row.get('is_admin', False),
-                        "subscription_tier": row.get('subscription_tier', 'free'),
-                        "subscription_status": row.get('subscription_status', 'active'),
-                        "subscription_start_date": row.get('subscription_start_date'),
-                        "subscription_end_date": row.get('subscription_end_date'),
-                        "created_at": row.get('created_at').isoformat() if row.get('created_at') else None,
-                        "updated_at": row.get('updated_at').isoformat() if row.get('updated_at') else None
-                    })
-        except Exception as e:
-            logger.warning(f"Error querying users table: {e}")
-        
-        # Query admin users table
-        try:
-            admin_users_query = """
-            SELECT id, email, full_name, profile_picture, auth_provider, is_active, is_admin,
-                   created_at, updated_at
-            FROM admin_users
-            ORDER BY created_at DESC
-            """
-            admin_result = neon_db.execute_query(admin_users_query)
-            if admin_result:
-                for row in admin_result:
-                    all_users.append({
-                        "id": str(row['id']),
-                        "email": row['email'],
-                        "full_name": row.get('full_name'),
-                        "profile_picture": row.get('profile_picture'),
-                        "auth_provider": row.get('auth_provider', 'local'),
-                        "is_active": row.get('is_active', True),
-                        "is_admin": row.get('is_admin', False),
-                        "subscription_tier": 'free',  # Default for admin users
-                        "subscription_status": 'active',  # Default for admin users
-                        "subscription_start_date": None,
-                        "subscription_end_date": None,
-                        "created_at": row.get('created_at').isoformat() if row.get('created_at') else None,
-                        "updated_at": row.get('updated_at').isoformat() if row.get('updated_at') else None
-                    })
-        except Exception as e:
-            logger.warning(f"Error querying admin_users table: {e}")
-        
-        # Sort all users by created_at descending and apply limit/offset
-        # Handle None values by putting them at the end
-        all_users.sort(key=lambda x: x['created_at'] if x['created_at'] else '1970-01-01T00:00:00', reverse=True)
-        users = all_users[offset:offset + limit]
+        if after:
+            offset = 0
+        # Each branch is limited on its own (index range scan), then the merge is limited again
+        branches = []
+        params = []
+        subscription_columns = _user_subscription_columns()
+        for source, select in USER_SOURCES.items():
+            select = select.replace("{subscription_columns}", subscription_columns)
+            where, where_params = _users_after_clause(source, after)
+            branches.append(f"({select} {where} ORDER BY created_at DESC, id DESC LIMIT %s)")
+            params.extend([*where_params, limit + offset])
         
-        logger.info(f"Successfully retrieved {len(users)} users from database (total: {len(all_users)})")
+        query = f"""
+        SELECT * FROM (
+            {" UNION ALL ".join(branches)}
+        ) AS all_users
+        ORDER BY created_at DESC, source DESC, id DESC
+        LIMIT %s OFFSET %s
+        """
+        params.extend([limit, offset])
+        result = neon_db.execute_query(query, tuple(params))
+        
+        users = []
+        for row in result:
+            users.append({
+                "id": str(row['id']),
+                "email": row['email'],
+                "full_name": row.get('full_name'),
+                "profile_picture": row.get('profile_picture'),
+                "auth_provider": row.get('auth_provider', 'local'),
+                "is_active": row.get('is_active', True),
+                "is_admin": row.get('is_admin', False),
+                "subscription_tier": row.get('subscription_tier') or 'free',
+                "subscription_status": row.get('subscription_status') or 'active',
+                "subscription_start_date": row.get('subscription_start_date'),
+                "subscription_end_date": row.get('subscription_end_date'),
+                "created_at": row.get('created_at').isoformat() if row.get('created_at') else None,
+                "updated_at": row.get('updated_at').isoformat() if row.get('updated_at') else None,
+                "source": row['source']
+            })
+        
+        logger.info(f"Successfully retrieved {len(users)} users from database")
         return users
     except Exception as e:
         logger.error(f"Error getting all users: {e}")
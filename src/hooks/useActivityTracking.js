@@ -14,34 +14,77 @@ const getSessionId = () => {
   return sessionId;
 };
 
+// Events are coalesced in memory and sent as one batch every FLUSH_INTERVAL_MS,
+// when the buffer fills, or when the page is hidden/unloaded.
+const BATCH_ENDPOINT = `${API_BASE_URL}/api/activity/track/batch`;
+const FLUSH_INTERVAL_MS = 10000;
+const MAX_BUFFERED_EVENTS = 50;
+let eventBuffer = [];
+let flushTimer = null;
+
+const flushEvents = ({ useBeacon = false } = {}) => {
+  if (flushTimer) {
+    clearTimeout(flushTimer);
+    flushTimer = null;
+  }
+  if (eventBuffer.length === 0) return;
+
+  const events = eventBuffer;
+  eventBuffer = [];
+  // A plain string body is sent as text/plain, which sendBeacon can post cross-origin without a preflight
+  const body = JSON.stringify(events);
+
+  if (useBeacon && navigator.sendBeacon && navigator.sendBeacon(BATCH_ENDPOINT, body)) {
+    return;
+  }
+
+  fetch(BATCH_ENDPOINT, {
+    method: 'POST',
+    headers: {
+      'Content-Type': 'text/plain'
+    },
+    body,
+    keepalive: true
+  }).catch((error) => {
+    console.error('Error tracking activity:', error);
+  });
+};
+
+const queueEvent = (event) => {
+  eventBuffer.push(event);
+  if (eventBuffer.length >= MAX_BUFFERED_EVENTS) {
+    flushEvents();
+  } else if (!flushTimer) {
+    flushTimer = setTimeout(() => flushEvents(), FLUSH_INTERVAL_MS);
+  }
+};
+
+if (typeof window !== 'undefined') {
+  const flushOnHide = () => flushEvents({ useBeacon: true });
+  window.addEventListener('pagehide', flushOnHide);
+  document.addEventListener('visibilitychange', () => {
+    if (document.visibilityState === 'hidden') {
+      flushOnHide();
+    }
+  });
+}
+
 export const useActivityTracking = () => {
   const location = useLocation();
   const { user } = useAuth();
   const pageStartTime = useRef(Date.now());
   const currentSection = useRef(null);
 
-  // Track activity
-  const trackActivity = useCallback(async (activityData) => {
-    try {
-      const sessionId = getSessionId();
-      const userId = user?.id || null;
-
-      const payload = {
-        user_id: userId,
-        session_id: sessionId,
-        ...activityData
-      };
-
-      await fetch(`${API_BASE_URL}/api/activity/track`, {
-        method: 'POST',
-        headers: {
-          'Content-Type': 'application/json'
-        },
-        body: JSON.stringify(payload)
-      });
-    } catch (error) {
-      console.error('Error tracking activity:', error);
-    }
+  // Track activity (buffered; see flushEvents)
+  const trackActivity = useCallback((activityData) => {
+    const sessionId = getSessionId();
+    const userId = user?.id || null;
+
+    queueEvent({
+      user_id: userId,
+      session_id: sessionId,
+      ...activityData
+    });
   }, [user]);
 
   // Track page view
@@ -1322,31 +1322,28 @@ const HomePage = () => {
     if (!stories || stories.length === 0) return;
 
     const apiBaseUrl = import.meta.env.VITE_API_BASE_URL || 'http://localhost:8000';
+    const emptyStatistics = { total_nodes: 0, entity_count: 0, highlighted_nodes: 0, updated_date: null };
     const fetchStatistics = async () => {
-      const statsPromises = stories.map(async (story) => {
-        try {
-          const response = await fetch(`${apiBaseUrl}/api/stories/${encodeURIComponent(story.id)}/statistics`, {
-            method: 'GET',
-            headers: {
-              'Content-Type': 'application/json',
-            },
-          });
-          
-          if (response.ok) {
-            const data = await response.json();
-            return { storyId: story.id, statistics: data };
-          }
-          return { storyId: story.id, statistics: { total_nodes: 0, entity_count: 0, highlighted_nodes: 0, updated_date: null } };
-        } catch (err) {
-          console.debug(`Failed to fetch statistics for story ${story.id}:`, err);
-          return { storyId: story.id, statistics: { total_nodes: 0, entity_count: 0, highlighted_nodes: 0, updated_date: null } };
+      // One request for every story (keyed by story id) instead of one request per story
+      let statsById = {};
+      try {
+        const response = await fetch(`${apiBaseUrl}/api/stories/statistics`, {
+          method: 'GET',
+          headers: {
+            'Content-Type': 'application/json',
+          },
+        });
+
+        if (response.ok) {
+          statsById = await response.json();
         }
-      });
+      } catch (err) {
+        console.debug('Failed to fetch story statistics:', err);
+      }
 
-      const results = await Promise.all(statsPromises);
       const statsMap = {};
-      results.forEach(({ storyId, statistics }) => {
-        statsMap[storyId] = statistics;
+      stories.forEach((story) => {
+        statsMap[story.id] = statsById[story.id] || emptyStatistics;
       });
       setStoryStatistics(statsMap);
     };
@@ -9,6 +9,29 @@ import Loader from '../components/common/Loader';
 
 const API_BASE_URL = import.meta.env.VITE_API_BASE_URL || 'http://localhost:8000';
 
+const PROGRESS_LABELS = {
+  pending: 'Waiting to be processed...',
+  processing: 'Processing...',
+  waiting: 'Waiting for an identical submission to finish...',
+  fetching: 'Fetching URL...',
+  extracting: 'Extracting text from PDF...',
+  generating_query: 'Generating graph query...',
+  executing: 'Running graph query...',
+};
+
+const formatProgress = (event) => {
+  if (!event) {
+    return null;
+  }
+  if (event.stage === 'extracting' && event.pages) {
+    return `Extracting text from PDF (page ${event.page} of ${event.pages})...`;
+  }
+  if (event.stage === 'analyzing') {
+    return `Analyzing content (${event.chunk} of ${event.chunks} parts done)...`;
+  }
+  return PROGRESS_LABELS[event.stage] || null;
+};
+
 const SubmissionPage = () => {
   const { user } = useAuth();
   const { showSuccess, showError } = useToast();
@@ -32,6 +55,138 @@ const SubmissionPage = () => {
     fetchSubmissions();
   }, []);
 
+  // Submissions are processed in the background: follow the selected one over Server-Sent
+  // Events while it runs, then load the stored result once it completes or fails
+  const selectedId = selectedSubmission?.id;
+  const selectedStatus = selectedSubmission?.status;
+  const isRunning = selectedStatus === 'pending' || selectedStatus === 'processing';
+  const [progress, setProgress] = useState(null);
+
+  useEffect(() => {
+    setProgress(null);
+    if (!selectedId || !isRunning) {
+      return undefined;
+    }
+    const token = localStorage.getItem('token');
+    let cancelled = false;
+    let source = null;
+    let pollTimer = null;
+
+    const loadSubmission = async () => {
+      try {
+        const response = await fetch(`${API_BASE_URL}/api/submissions/${selectedId}`, {
+          headers: {
+            'Authorization': `Bearer ${token}`
+          }
+        });
+        if (!response.ok || cancelled) {
+          return null;
+        }
+        const data = await response.json();
+        setSelectedSubmission((current) => (current?.id === data.id ? data : current));
+        setSubmissions((current) => current.map((s) => (s.id === data.id ? data : s)));
+        return data;
+      } catch (error) {
+        console.error('Error loading submission:', error);
+        return null;
+      }
+    };
+
+    // Fallback when the event stream is unavailable
+    const poll = async () => {
+      const data = await loadSubmission();
+      if (!cancelled && (!data || data.status === 'pending' || data.status === 'processing')) {
+        pollTimer = setTimeout(poll, 3000);
+      }
+    };
+
+    // The stream URL carries a short-lived token scoped to this submission, never the login token
+    const openStream = async () => {
+      try {
+        const response = await fetch(`${API_BASE_URL}/api/submissions/${selectedId}/events/token`, {
+          method: 'POST',
+          headers: {
+            'Authorization': `Bearer ${token}`
+          }
+        });
+        if (!response.ok) {
+          throw new Error(`Failed to get stream token: ${response.status}`);
+        }
+        const { token: streamToken } = await response.json();
+        if (cancelled) {
+          return;
+        }
+        source = new EventSource(`${API_BASE_URL}/api/submissions/${selectedId}/events?token=${encodeURIComponent(streamToken)}`);
+        source.onmessage = (message) => {
+          const event = JSON.parse(message.data);
+          setProgress(event);
+          if (event.status === 'completed' || event.status === 'failed') {
+            source.close();
+            loadSubmission();
+          }
+        };
+        source.onerror = () => {
+          source.close();
+          if (!cancelled) {
+            poll();
+          }
+        };
+      } catch (error) {
+        console.error('Error opening progress stream:', error);
+        if (!cancelled) {
+          poll();
+        }
+      }
+    };
+
+    if (typeof EventSource === 'undefined') {
+      poll();
+    } else {
+      openStream();
+    }
+
+    return () => {
+      cancelled = true;
+      if (source) {
+        source.close();
+      }
+      clearTimeout(pollTimer);
+    };
+  }, [selectedId, isRunning]);
+
+  // Listings carry no processing_result; load it when a completed submission is selected
+  const needsResult = selectedStatus === 'completed' && !selectedSubmission?.processing_result;
+
+  useEffect(() => {
+    if (!selectedId || !needsResult) {
+      return undefined;
+    }
+    const token = localStorage.getItem('token');
+    let cancelled = false;
+
+    const loadResult = async () => {
+      try {
+        const response = await fetch(`${API_BASE_URL}/api/submissions/${selectedId}`, {
+          headers: {
+            'Authorization': `Bearer ${token}`
+          }
+        });
+        if (!response.ok || cancelled) {
+          return;
+        }
+        const data = await response.json();
+        setSelectedSubmission((current) => (current?.id === data.id ? data : current));
+      } catch (error) {
+        console.error('Error loading submission:', error);
+      }
+    };
+
+    loadResult();
+    return () => {
+      cancelled = true;
+    };
+  }, [selectedId, needsResult]);
+
   const fetchSubscriptions = async () => {
     setLoadingSubscription(true);
     try {
@@ -172,6 +327,7 @@ const SubmissionPage = () => {
     switch (status) {
       case 'completed':
         return <FaCheck className="text-green-400" />;
+      case 'pending':
       case 'processing':
         return <div className="inline-block"><Loader size={16} color="#facc15" /></div>;
       case 'failed':
@@ -398,6 +554,11 @@ const SubmissionPage = () => {
                               ))}
                             </div>
                           )}
+                          {submission.status === 'completed' && submission.nodes_count != null && (
+                            <div className="text-xs text-gray-400 mt-1">
+                              {submission.nodes_count} nodes, {submission.links_count ?? 0} links
+                            </div>
+                          )}
                           <div className="text-xs text-gray-500 mt-1">
                             {new Date(submission.created_at).toLocaleString()}
                           </div>
@@ -413,6 +574,16 @@ const SubmissionPage = () => {
             </div>
           </div>
 
+          {/* Live progress of the selected submission */}
+          {isRunning && (
+            <div className="mt-6 bg-[#18181B] border border-[#3F3F46] rounded-lg p-4 flex items-center gap-3">
+              <Loader size={16} color="#facc15" />
+              <span className="text-sm text-gray-300">
+                {formatProgress(progress) || 'Waiting to be processed...'}
+              </span>
+            </div>
+          )}
+
           {/* Graph Visualization */}
           {selectedSubmission && selectedSubmission.status === 'completed' && graphData && (
             <div className="mt-6 bg-[#18181B] border border-[#3F3F46] rounded-lg p-6">